@@ -7,8 +7,66 @@ This module provides functionality for tracking expenses, managing budgets,
 and generating reports.
 """
 
+from .alerts import ThresholdAlert, ThresholdMonitor
+from .batch import generate_reports
 from .budget import Budget
+from .categorizer import Categorizer
+from .concurrent import ConcurrentBudget
+from .events import EventLog
 from .expense import Expense
-from .reports import generate_report
+from .hierarchy import BudgetNode, BudgetTree
+from .mapped import MappedStorage, open_ledger, save_ledger
+from .money import Money
+from .paged import PagedStorage
+from .portfolio import BudgetPortfolio, PortfolioBudget
+from .reconcile import Reconciliation, reconcile
+from .recurring import RecurringExpense
+from .reports import generate_category_report, generate_report, iter_report, write_report
+from .rolling import RollingSpend
+from .sketches import AmountSummary, merge_summaries
+from .sqlite_storage import SQLiteStorage
+from .storage import (
+    ColumnarStorage,
+    ExpenseSequence,
+    ExpenseStorage,
+    ExpenseView,
+    ForkStorage,
+    ListStorage,
+)
 
-__all__ = ["Budget", "Expense", "generate_report"]
+__all__ = [
+    "AmountSummary",
+    "Budget",
+    "BudgetNode",
+    "BudgetPortfolio",
+    "BudgetTree",
+    "Categorizer",
+    "ColumnarStorage",
+    "ConcurrentBudget",
+    "EventLog",
+    "Expense",
+    "ExpenseSequence",
+    "ExpenseStorage",
+    "ExpenseView",
+    "ForkStorage",
+    "ListStorage",
+    "MappedStorage",
+    "Money",
+    "PagedStorage",
+    "PortfolioBudget",
+    "Reconciliation",
+    "RecurringExpense",
+    "RollingSpend",
+    "SQLiteStorage",
+    "ThresholdAlert",
+    "ThresholdMonitor",
+    "generate_category_report",
+    "generate_report",
+    "generate_reports",
+    "iter_report",
+    "merge_summaries",
+    "open_ledger",
+    "reconcile",
+    "save_ledger",
+    "write_report",
+]
@@ -0,0 +1,298 @@
+# pybudget/alerts.py
+
+"""
+Utilization threshold alerts for budgets.
+
+Each watched scope, the whole budget or one category, keeps the spend
+levels at which its subscribers want to hear about it as a sorted list
+of trigger amounts in minor units, with a pointer to the next pending
+one. After an expense is added only that next trigger is compared with
+the scope's total, so an insert that crosses nothing costs O(1) per
+watched scope it touches. When spend goes down or the limit changes, the
+pointer is re-placed with a binary search so crossed thresholds re-arm.
+
+Alerts are not delivered by the thread adding expenses. They go onto a
+bounded queue drained by a worker thread, so a slow callback delays only
+other alerts; if the queue is full the alert is counted as dropped
+rather than blocking ingestion.
+"""
+
+import math
+import queue
+import threading
+from bisect import bisect_right
+
+from .money import to_minor
+
+DEFAULT_THRESHOLDS = (0.5, 0.8, 1.0)
+
+DEFAULT_QUEUE_SIZE = 1024
+
+
+class ThresholdAlert:
+    """
+    A notice that a budget or category crossed a utilization threshold.
+
+    Attributes:
+        budget (str): The name of the budget.
+        category (str): The category, or None for the whole budget.
+        threshold (float): The utilization fraction that was reached.
+        spent_minor (int): The scope's spend when it was reached, in minor units.
+        limit_minor (int): The scope's limit, in minor units.
+    """
+
+    __slots__ = ("budget", "category", "threshold", "spent_minor", "limit_minor")
+
+    def __init__(self, budget, category, threshold, spent_minor, limit_minor):
+        """
+        Initialize a ThresholdAlert.
+
+        Args:
+            budget (str): The name of the budget.
+            category (str): The category, or None for the whole budget.
+            threshold (float): The utilization fraction that was reached.
+            spent_minor (int): The scope's spend, in minor units.
+            limit_minor (int): The scope's limit, in minor units.
+        """
+        self.budget = budget
+        self.category = category
+        self.threshold = threshold
+        self.spent_minor = spent_minor
+        self.limit_minor = limit_minor
+
+    @property
+    def utilization(self) -> float:
+        """
+        The scope's spend as a fraction of its limit.
+        """
+        return self.spent_minor / self.limit_minor if self.limit_minor else math.inf
+
+    def __repr__(self):
+        scope = "budget" if self.category is None else f"category {self.category!r}"
+        return f"ThresholdAlert({self.budget!r}, {scope}, threshold={self.threshold!r})"
+
+
+class _Scope:
+    __slots__ = ("category", "limit", "subscriptions", "triggers", "pending", "_next_id")
+
+    def __init__(self, category, limit):
+        self.category = category
+        self.limit = limit
+        self.subscriptions = []
+        self.triggers = []
+        self.pending = 0
+        self._next_id = 0
+
+    def add(self, callback, thresholds) -> tuple:
+        subscription = (self._next_id, callback, thresholds)
+        self._next_id += 1
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def rebuild(self, spent: int) -> list:
+        # Re-sort the trigger amounts, e.g. for a new limit, keeping the ones
+        # already reached behind the pending pointer. Returns the triggers
+        # that are reached only under the new amounts.
+        reached = {(trigger[1], trigger[2]) for trigger in self.triggers[: self.pending]}
+        self.triggers = sorted(
+            (math.ceil(threshold * self.limit), number, threshold, callback)
+            for number, callback, thresholds in self.subscriptions
+            for threshold in thresholds
+        )
+        self.pending = self._position(spent)
+        return [
+            trigger
+            for trigger in self.triggers[: self.pending]
+            if (trigger[1], trigger[2]) not in reached
+        ]
+
+    def _position(self, spent: int) -> int:
+        return bisect_right(self.triggers, (spent, math.inf))
+
+    def update(self, spent: int) -> list:
+        # Advance past the triggers the spend has reached and return them;
+        # if the spend went down instead, re-arm the ones it fell below.
+        triggers = self.triggers
+        first = self.pending
+        if first < len(triggers) and triggers[first][0] <= spent:
+            last = first + 1
+            while last < len(triggers) and triggers[last][0] <= spent:
+                last += 1
+            self.pending = last
+            return triggers[first:last]
+        if first and triggers[first - 1][0] > spent:
+            self.pending = self._position(spent)
+        return []
+
+
+class ThresholdMonitor:
+    """
+    Watch a budget's spend and queue alerts as thresholds are crossed.
+
+    The monitor follows the budget through its listeners. Alerts fire once
+    per crossing: a threshold fires again only after spend has fallen back
+    below it.
+
+    Attributes:
+        budget: The Budget being watched.
+        dropped (int): The number of alerts discarded because the queue was full.
+        failed (int): The number of callbacks that raised an exception.
+    """
+
+    def __init__(self, budget, maxsize: int = DEFAULT_QUEUE_SIZE):
+        """
+        Initialize a ThresholdMonitor and start following a budget.
+
+        Args:
+            budget: The Budget to watch.
+            maxsize (int): The most alerts waiting for delivery at once.
+        """
+        self.budget = budget
+        self.dropped = 0
+        self.failed = 0
+        self._scopes = {}
+        self._queue = queue.Queue(maxsize)
+        self._worker = None
+        self._lock = threading.Lock()
+        budget.add_listener(self._on_change)
+
+    def _spent(self, category) -> int:
+        if category is None:
+            return self.budget.get_total_minor()
+        return self.budget.get_category_total_minor(category)
+
+    def subscribe(self, callback, thresholds=DEFAULT_THRESHOLDS, category: str = None, limit=None):
+        """
+        Call a function whenever the budget or a category crosses a threshold.
+
+        Thresholds the scope has already reached do not fire on subscribing.
+
+        Args:
+            callback (callable): Called with a ThresholdAlert on the worker thread.
+            thresholds (iterable): Utilization fractions, e.g. 0.8 for 80%.
+            category (str, optional): Watch one category instead of the whole budget.
+            limit (optional): The category's spending limit, in major units;
+                required the first time a category is watched, and replacing
+                its limit for every subscriber when given again. The whole
+                budget's limit is always the budget amount.
+
+        Returns:
+            tuple: A handle for unsubscribe().
+
+        Raises:
+            ValueError: If a threshold is not positive, or a category is
+                given without a limit.
+        """
+        thresholds = tuple(sorted(set(thresholds)))
+        if not thresholds or thresholds[0] <= 0:
+            raise ValueError(f"Thresholds must be positive fractions: {thresholds!r}")
+        scope = self._scopes.get(category)
+        if category is not None and limit is None and scope is None:
+            raise ValueError(f"A limit is required to watch category {category!r}")
+        if scope is None:
+            scope = self._scopes[category] = _Scope(category, self.budget.amount_minor)
+        if category is not None and limit is not None:
+            scope.limit = to_minor(limit, self.budget.scale)
+        subscription = scope.add(callback, thresholds)
+        scope.rebuild(self._spent(category))
+        return category, subscription
+
+    def unsubscribe(self, handle):
+        """
+        Stop a subscription made with subscribe().
+
+        Args:
+            handle (tuple): The handle returned by subscribe().
+
+        Raises:
+            ValueError: If the subscription is not active.
+        """
+        category, subscription = handle
+        scope = self._scopes.get(category)
+        if scope is None or subscription not in scope.subscriptions:
+            raise ValueError("The subscription is not active")
+        scope.subscriptions.remove(subscription)
+        if scope.subscriptions:
+            scope.rebuild(self._spent(category))
+        else:
+            del self._scopes[category]
+
+    def _set_limit(self, scope: _Scope, limit: int):
+        # A lower limit can put thresholds behind the current spend; those
+        # count as crossed now.
+        scope.limit = limit
+        spent = self._spent(scope.category)
+        self._alert(scope, scope.rebuild(spent), spent)
+
+    def _on_change(self, budget, event: str, data: dict):
+        scopes = self._scopes
+        if not scopes:
+            return
+        if event == "add":
+            overall = scopes.get(None)
+            if overall is not None:
+                self._check(overall)
+            if len(scopes) > (overall is not None):
+                for category in set(data["categories"]).intersection(scopes):
+                    self._check(scopes[category])
+        elif event == "amount":
+            if None in scopes:
+                self._set_limit(scopes[None], data["amount"])
+        elif event in ("remove", "recategorize"):
+            for scope in list(scopes.values()):
+                spent = self._spent(scope.category)
+                self._alert(scope, scope.update(spent), spent)
+
+    def _check(self, scope: _Scope):
+        # Only the next pending trigger is compared with the spend.
+        if scope.pending == len(scope.triggers):
+            return
+        spent = self._spent(scope.category)
+        if scope.triggers[scope.pending][0] <= spent:
+            self._alert(scope, scope.update(spent), spent)
+
+    def _alert(self, scope: _Scope, triggers, spent: int):
+        for _, _, threshold, callback in triggers:
+            alert = ThresholdAlert(self.budget.name, scope.category, threshold, spent, scope.limit)
+            self._deliver(callback, alert)
+
+    def _deliver(self, callback, alert):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+        try:
+            self._queue.put_nowait((callback, alert))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                callback, alert = item
+                callback(alert)
+            except Exception:
+                # A failing callback must not stop delivery to the others.
+                self.failed += 1
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """
+        Wait until every queued alert has been delivered.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Stop following the budget, deliver the queued alerts and stop the worker.
+        """
+        self.budget.remove_listener(self._on_change)
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
@@ -0,0 +1,188 @@
+# pybudget/batch.py
+
+"""
+Batch report generation for many budgets across a process pool.
+
+Budgets are shipped to workers as their encoded columns and report
+figures rather than as pickled object graphs, grouped into chunks of
+roughly equal row counts so one large budget does not leave the other
+workers idle. Each chunk is packed only when it is submitted. Every worker
+streams its reports straight to disk, and outputs are named and collected
+in input order, so the result does not depend on scheduling.
+"""
+
+import heapq
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .money import factor
+from .reports import REPORT_FORMATS, write_report
+from .storage import ColumnarStorage, as_storage
+
+EXTENSIONS = {"text": "txt", "csv": "csv", "jsonl": "jsonl"}
+
+
+def report_filename(position: int, name: str, fmt: str = "text") -> str:
+    """
+    Return the file name used for one budget's report in a batch.
+
+    Args:
+        position (int): The budget's position in the batch input.
+        name (str): The budget name.
+        fmt (str): The report format.
+
+    Returns:
+        str: A file name that is unique within the batch and safe on disk.
+    """
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "budget"
+    return f"{position:04d}-{slug}.{EXTENSIONS[fmt]}"
+
+
+def _pack(budget):
+    # The report's figures are taken from the source object as it computes
+    # them, so views such as tree nodes keep their own remaining amount.
+    storage = as_storage(budget.expenses)
+    if not isinstance(storage, ColumnarStorage):
+        storage = ColumnarStorage(storage, scale=budget.scale)
+    return (
+        budget.name,
+        budget.amount_minor,
+        budget.get_remaining_minor(),
+        budget.scale,
+        storage.amounts,
+        storage.category_codes,
+        storage.description_codes,
+        storage.dates,
+        storage.categories,
+        storage.descriptions,
+    )
+
+
+class _PackedBudget:
+    # The budget-like object a worker renders: the shipped figures and the
+    # expenses decoded from the shipped columns.
+
+    def __init__(self, name, amount_minor, remaining_minor, scale, expenses):
+        self.name = name
+        self.amount_minor = amount_minor
+        self.remaining_minor = remaining_minor
+        self.scale = scale
+        self.expenses = expenses
+
+    @property
+    def amount(self) -> float:
+        return self.amount_minor / factor(self.scale)
+
+    def get_remaining_minor(self) -> int:
+        return self.remaining_minor
+
+    def get_remaining_amount(self) -> float:
+        return self.remaining_minor / factor(self.scale)
+
+
+def _unpack(payload) -> _PackedBudget:
+    name, amount, remaining, scale, *columns = payload
+    expenses = ColumnarStorage.from_columns(*columns, scale=scale)
+    return _PackedBudget(name, amount, remaining, scale, expenses)
+
+
+def _write(path, budget, fmt):
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        write_report(budget, fp, fmt)
+
+
+def _render_chunk(jobs, fmt):
+    for path, payload in jobs:
+        _write(path, _unpack(payload), fmt)
+    return len(jobs)
+
+
+def balanced_chunks(sizes, chunks: int) -> list:
+    """
+    Split work items into chunks of roughly equal total size.
+
+    Uses the longest-processing-time rule: items are taken largest first and
+    each goes to the chunk with the smallest total so far.
+
+    Args:
+        sizes (sequence): The size of each item.
+        chunks (int): The number of chunks to produce.
+
+    Returns:
+        list: Lists of item positions, one per non-empty chunk.
+    """
+    heap = [(0, i, []) for i in range(max(1, chunks))]
+    for position in sorted(range(len(sizes)), key=lambda i: -sizes[i]):
+        load, i, items = heapq.heappop(heap)
+        items.append(position)
+        heapq.heappush(heap, (load + sizes[position] + 1, i, items))
+    return [sorted(items) for _, _, items in sorted(heap, key=lambda entry: entry[1]) if items]
+
+
+def generate_reports(budgets, output_dir=None, archive=None, fmt="text", workers=None) -> list:
+    """
+    Generate reports for many budgets in parallel.
+
+    Reports are written either as one file per budget in ``output_dir`` or
+    into a single zip ``archive``. At most ``workers`` processes run at a
+    time; with one worker the reports are rendered in this process.
+
+    Args:
+        budgets (sequence): The budgets (or budget-like views) to report on.
+        output_dir (str, optional): The directory for per-budget report files.
+        archive (str, optional): The path of a zip archive to write instead.
+        fmt (str): The report format: "text", "csv" or "jsonl".
+        workers (int, optional): The number of worker processes; defaults to
+            the number of CPUs.
+
+    Returns:
+        list: The written file paths, or the archive member names, in input order.
+
+    Raises:
+        ValueError: If the format is unknown or not exactly one of
+            ``output_dir`` and ``archive`` is given.
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format: {fmt!r}")
+    if (output_dir is None) == (archive is None):
+        raise ValueError("Specify exactly one of output_dir or archive")
+    budgets = list(budgets)
+    workers = max(1, workers or os.cpu_count() or 1)
+    names = [report_filename(i, budget.name, fmt) for i, budget in enumerate(budgets)]
+
+    target = output_dir if archive is None else tempfile.mkdtemp(prefix="pybudget-reports-")
+    try:
+        os.makedirs(target, exist_ok=True)
+        paths = [os.path.join(target, name) for name in names]
+        if workers == 1 or len(budgets) <= 1:
+            for path, budget in zip(paths, budgets):
+                _write(path, budget, fmt)
+        else:
+            sizes = [len(budget.expenses) for budget in budgets]
+            chunks = balanced_chunks(sizes, min(len(budgets), workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Chunks are packed only as they are submitted, with at most
+                # one in flight per worker, so few columnar copies exist at once.
+                running = set()
+                for chunk in chunks:
+                    if len(running) >= workers:
+                        done, running = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    jobs = [(paths[i], _pack(budgets[i])) for i in chunk]
+                    running.add(executor.submit(_render_chunk, jobs, fmt))
+                for future in running:
+                    future.result()
+        if archive is None:
+            return paths
+        with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name, path in zip(names, paths):
+                zf.write(path, arcname=name)
+        return names
+    finally:
+        if archive is not None:
+            shutil.rmtree(target, ignore_errors=True)
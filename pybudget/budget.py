@@ -4,28 +4,207 @@
 Budget module for managing budgets and tracking expenses.
 """
 
+import calendar
+import copy
+import datetime
+import heapq
+import pickle
+import sys
+import weakref
+from array import array
+
+from .alerts import DEFAULT_QUEUE_SIZE, DEFAULT_THRESHOLDS, ThresholdMonitor
+from .indexes import CategoryIndex, DescriptionIndex, TimeIndex, intersect_rows, tokenize
+from .ledger import decode_ledger, encode_ledger
+from .loaders import DEFAULT_CHUNK_SIZE, read_csv_chunks, read_jsonl_chunks
+from .money import Money, factor, to_minor
+from .paged import DEFAULT_CACHE_PAGES, DEFAULT_PAGE_SIZE, PagedStorage
+from .sketches import QUANTILES, AmountSummary, group_summaries
+from .sqlite_storage import DEFAULT_BATCH_SIZE, SQLiteStorage
+from .storage import (
+    ColumnarStorage,
+    ExpenseSequence,
+    ForkStorage,
+    ListStorage,
+    make_storage,
+)
+from .totals import AGGREGATES, GroupStats, RunningTotal, group_stats
+from .utils import (
+    date_to_key,
+    first_invalid_amount,
+    key_to_date,
+    month_of,
+    validate_amounts,
+)
+
+
+def _to_major(name, value, f):
+    if value is None or name == "count":
+        return value
+    return value / f
+
+
+def _month_lookup():
+    months = {}
+
+    def month(key):
+        value = months.get(key)
+        if value is None:
+            value = months[key] = month_of(key_to_date(key))
+        return value
+
+    return month
+
+
+def _restore(
+    cls, name, amount, scale, exact, byte_order, columns, categories, descriptions, kind="columnar"
+):
+    arrays = []
+    for column, typecode in zip(columns, "qIIi"):
+        if not isinstance(column, array) or column.typecode != typecode:
+            data = memoryview(column).cast("B")
+            column = array(typecode)
+            column.frombytes(data)
+            if byte_order != sys.byteorder:
+                column.byteswap()
+        arrays.append(column)
+    storage = ColumnarStorage.from_columns(*arrays, categories, descriptions, scale=scale)
+    if kind == "list":
+        rows = [view.to_expense() for view in storage]
+        storage = make_storage(kind, scale)
+        storage.extend(rows)
+    return cls(name, Money.from_minor(amount, scale), storage=storage, exact=exact)
+
+
+def _own_rows(storage):
+    # The storage a fork appends to is of the same kind as the one it shares.
+    return storage.added if isinstance(storage, ForkStorage) else storage
+
 
 class Budget:
     """
     A class to represent a budget.
 
+    Amounts are kept and aggregated as integer minor units at the budget's
+    currency scale, so every total is exact; the float-returning methods
+    convert only the final figure.
+
     Attributes:
         name (str): The name of the budget.
         amount (float): The total amount allocated for the budget.
-        expenses (list): A list of expenses associated with the budget.
+        amount_minor (int): The allocated amount in minor units.
+        scale (int): The number of decimal places of the currency.
+        expenses (ExpenseStorage): The expenses associated with the budget.
+        version (int): A counter bumped by every change to the budget.
+        rows_version (int): A counter bumped only when existing expenses
+            change; appending expenses leaves it alone.
     """
 
-    def __init__(self, name: str, amount: float):
+    def __init__(self, name: str, amount, storage=None, exact: bool = False, scale: int = None):
         """
         Initialize a Budget instance.
 
         Args:
             name (str): The name of the budget.
-            amount (float): The total amount allocated for the budget.
+            amount: The total amount allocated for the budget, as a float,
+                int, Decimal or Money.
+            storage (optional): How expenses are stored: None or "list" for
+                a plain list of Expense objects, "columnar" for compact
+                array-backed columns, or an ExpenseStorage instance.
+            exact (bool): Reject amounts given to the budget that are not a
+                whole number of minor units instead of rounding them.
+            scale (int, optional): The number of decimal places of the
+                currency; defaults to the storage's scale, which is 2 for
+                new storages.
         """
-        self.name = name
-        self.amount = amount
-        self.expenses = []
+        self.version = 0
+        self.rows_version = 0
+        self._name = name
+        self.exact = exact
+        self._storage = make_storage(storage, scale)
+        self.scale = self._storage.scale
+        self._amount_minor = to_minor(amount, self.scale, exact)
+        self._total = RunningTotal()
+        self._category_stats = {}
+        self._shared = False
+        self._forks = weakref.WeakSet()
+        self._listeners = []
+        self._rename_checks = []
+        self._alerts = None
+        self._recurring = []
+        self._summary = None
+        self._category_summaries = None
+        self._description_index = None
+        self._time_index = self._storage.time_index()
+        self._category_index = self._storage.category_index()
+        if len(self._storage):
+            # Seed the totals from the storage's own aggregates; indexes and
+            # monthly stats are built from a scan the first time they are used.
+            self._total.merge(self._storage.total(), len(self._storage))
+            for category, (total, count) in self._storage.category_summaries().items():
+                self._category_stats[category] = GroupStats()
+                self._category_stats[category].merge(total, count)
+            self._month_stats = None
+        else:
+            self._month_stats = {}
+            if self._category_index is None:
+                self._category_index = CategoryIndex()
+            if self._time_index is None:
+                self._time_index = TimeIndex()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        for check in list(self._rename_checks):
+            check(self, value)
+        self._name = value
+        self._storage.set_meta("name", value)
+        self.version += 1
+        if self._listeners:
+            self._emit("name", name=value)
+
+    @property
+    def amount(self) -> float:
+        return self._amount_minor / factor(self.scale)
+
+    @amount.setter
+    def amount(self, value):
+        self._amount_minor = to_minor(value, self.scale, self.exact)
+        self._storage.set_meta("amount", self._amount_minor)
+        self.version += 1
+        if self._listeners:
+            self._emit("amount", amount=self._amount_minor)
+
+    @property
+    def amount_minor(self) -> int:
+        return self._amount_minor
+
+    @property
+    def money(self) -> Money:
+        """
+        The total amount allocated for the budget as a Money value.
+        """
+        return Money.from_minor(self.amount_minor, self.scale)
+
+    @property
+    def versions(self) -> tuple:
+        """
+        The budget's ``(version, rows_version)`` counters, read together.
+        """
+        return self.version, self.rows_version
+
+    @property
+    def expenses(self):
+        """
+        The expenses associated with the budget, as an ExpenseSequence view.
+
+        Appending through the view adds the expenses to the budget; the
+        underlying storage is the view's ``storage``.
+        """
+        return ExpenseSequence(self)
 
     def add_expense(self, expense):
         """
@@ -33,8 +212,1119 @@ class Budget:
 
         Args:
             expense: An Expense object to add to the budget.
+
+        Raises:
+            ValueError: If the expense uses a different currency scale.
+        """
+        self._check_scale(expense)
+        row = len(self._storage)
+        self._storage.append(expense)
+        self._track(row, expense.amount_minor, expense.category, expense.date)
+        if self._description_index is not None:
+            self._description_index.add(row, expense.description)
+        if self._listeners:
+            self._emit(
+                "add",
+                descriptions=[expense.description],
+                amounts=[expense.amount_minor],
+                categories=[expense.category],
+                dates=[expense.date],
+            )
+
+    def add_expenses(self, expenses):
+        """
+        Add several expenses to the budget in one batch.
+
+        Every amount is validated before anything is added, so an invalid
+        batch leaves the budget unchanged.
+
+        Args:
+            expenses: An iterable of Expense objects.
+
+        Raises:
+            ValueError: If any expense amount is not positive or uses a
+                different currency scale.
+        """
+        expenses = list(expenses)
+        for expense in expenses:
+            self._check_scale(expense)
+        amounts = [expense.amount_minor for expense in expenses]
+        categories = [expense.category for expense in expenses]
+        dates = [expense.date for expense in expenses]
+        self._check_amounts(amounts)
+        first_row = len(self._storage)
+        self._storage.extend(expenses)
+        self._track_columns(first_row, amounts, categories, dates)
+        if self._description_index is not None:
+            self._description_index.extend(first_row, (e.description for e in expenses))
+        if self._listeners:
+            descriptions = [expense.description for expense in expenses]
+            self._emit(
+                "add",
+                descriptions=descriptions,
+                amounts=amounts,
+                categories=categories,
+                dates=dates,
+            )
+
+    def add_columns(self, descriptions, amounts, categories, dates=None, minor_units=False):
+        """
+        Add several expenses given as parallel columns.
+
+        This is the fastest way to populate a budget, since no Expense
+        objects are created for columnar storage.
+
+        Args:
+            descriptions (sequence): The expense descriptions.
+            amounts (sequence): The expense amounts.
+            categories (sequence): The expense categories.
+            dates (sequence, optional): The expense dates, None for undated.
+            minor_units (bool): Whether the amounts are already integer
+                minor units, as produced by the chunked loaders.
+
+        Raises:
+            ValueError: If the columns differ in length or any amount is not positive.
+        """
+        if not len(descriptions) == len(amounts) == len(categories):
+            raise ValueError("Expense columns must have the same length")
+        if dates is not None and len(dates) != len(amounts):
+            raise ValueError("Expense columns must have the same length")
+        given = amounts
+        if not minor_units:
+            scale, exact = self.scale, self.exact
+            amounts = [to_minor(amount, scale, exact) for amount in amounts]
+        self._check_amounts(amounts, given)
+        first_row = len(self._storage)
+        self._storage.extend_columns(descriptions, amounts, categories, dates)
+        self._track_columns(first_row, amounts, categories, dates)
+        if self._description_index is not None:
+            self._description_index.extend(first_row, descriptions)
+        if self._listeners:
+            self._emit(
+                "add",
+                descriptions=descriptions,
+                amounts=amounts,
+                categories=categories,
+                dates=dates,
+            )
+
+    def remove_expense(self, index: int):
+        """
+        Remove an expense from the budget.
+
+        The totals are adjusted in place; row-based indexes are rebuilt the
+        next time they are used. Removing from a budget that has forks
+        first gives the forks a private copy of the rows they share, so
+        they keep seeing the rows they were created from.
+
+        Args:
+            index (int): The position of the expense in ``expenses``.
+
+        Returns:
+            Expense: The removed expense.
+
+        Raises:
+            IndexError: If the position is out of range.
+            ValueError: If the budget's storage does not support removal.
+        """
+        self._unshare()
+        if index < 0:
+            index += len(self._storage)
+        expense = self._storage.remove(index)
+        amount = expense.amount_minor
+        self._total.remove(amount)
+        self._ungroup(self._category_stats, expense.category, amount)
+        if expense.date is not None and self._month_stats is not None:
+            self._ungroup(self._month_stats, month_of(expense.date), amount)
+        self._category_index = self._storage.category_index()
+        self._description_index = None
+        self._summary = self._category_summaries = None
+        self._time_index = self._storage.time_index()
+        self.version += 1
+        self.rows_version += 1
+        if self._listeners:
+            self._emit("remove", index=index)
+        return expense
+
+    def recategorize(self, index: int, category: str):
+        """
+        Move an expense to another category.
+
+        Args:
+            index (int): The position of the expense in ``expenses``.
+            category (str): The new category.
+
+        Raises:
+            IndexError: If the position is out of range.
+            ValueError: If the budget's storage does not support changes.
+        """
+        self._unshare()
+        if index < 0:
+            index += len(self._storage)
+        expense = self._storage[index]
+        old, amount = expense.category, expense.amount_minor
+        self._storage.set_category(index, category)
+        self._ungroup(self._category_stats, old, amount)
+        self._group(self._category_stats, category).add(amount)
+        self._category_index = self._storage.category_index()
+        self._category_summaries = None
+        self.version += 1
+        self.rows_version += 1
+        if self._listeners:
+            self._emit("recategorize", index=index, category=category)
+
+    def add_listener(self, callback):
+        """
+        Register a callback invoked after every change to the budget.
+
+        The callback is called as ``callback(budget, event, data)``. The
+        event is "add", "amount", "name", "remove" or "recategorize", and
+        data is a dict of the change's fields with amounts in minor units:
+        "add" carries "descriptions", "amounts", "categories" and "dates"
+        columns (dates may be None), "amount" the new "amount", "name" the
+        new "name", "remove" the "index" and "recategorize" the "index" and
+        new "category".
+
+        Args:
+            callback (callable): The function to call.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Unregister a callback added with add_listener.
+
+        Args:
+            callback (callable): The function to remove.
+
+        Raises:
+            ValueError: If the callback is not registered.
+        """
+        self._listeners.remove(callback)
+
+    def add_threshold_alert(
+        self,
+        callback,
+        thresholds=DEFAULT_THRESHOLDS,
+        category: str = None,
+        limit=None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+    ):
+        """
+        Call a function when spending crosses a fraction of its limit.
+
+        Each threshold fires once as spend reaches it, and again only after
+        spend has fallen back below it. Adding an expense compares the new
+        total with just the next pending threshold of the budget and of the
+        expense's category. Callbacks run on a worker thread fed by a bounded
+        queue, so a slow callback never holds up adding expenses.
+
+        Args:
+            callback (callable): Called with a ThresholdAlert.
+            thresholds (iterable): Utilization fractions, e.g. 0.8 for 80%;
+                defaults to 50%, 80% and 100%.
+            category (str, optional): Watch one category instead of the
+                whole budget.
+            limit (optional): The category's spending limit, as a float,
+                int, Decimal or Money; the whole budget's limit is its amount.
+            maxsize (int): The size of the delivery queue, fixed by the
+                first subscription; alerts beyond it are dropped.
+
+        Returns:
+            tuple: A handle for remove_threshold_alert.
+
+        Raises:
+            ValueError: If a threshold is not positive, or a category is
+                watched for the first time without a limit.
+        """
+        if self._alerts is None:
+            self._alerts = ThresholdMonitor(self, maxsize)
+        return self._alerts.subscribe(callback, thresholds, category, limit)
+
+    def remove_threshold_alert(self, handle):
+        """
+        Stop a subscription made with add_threshold_alert.
+
+        Args:
+            handle (tuple): The handle returned by add_threshold_alert.
+
+        Raises:
+            ValueError: If the subscription is not active.
+        """
+        if self._alerts is None:
+            raise ValueError("The subscription is not active")
+        self._alerts.unsubscribe(handle)
+
+    @property
+    def alerts(self):
+        """
+        The ThresholdMonitor delivering this budget's alerts, or None.
+        """
+        return self._alerts
+
+    def add_rename_check(self, callback):
+        """
+        Register a callback that may veto renaming the budget.
+
+        The callback is called as ``callback(budget, name)`` before the name
+        changes and rejects the new name by raising ValueError.
+
+        Args:
+            callback (callable): The function to call.
+        """
+        self._rename_checks.append(callback)
+
+    def remove_rename_check(self, callback):
+        """
+        Unregister a callback added with add_rename_check.
+
+        Args:
+            callback (callable): The function to remove.
+
+        Raises:
+            ValueError: If the callback is not registered.
+        """
+        self._rename_checks.remove(callback)
+
+    def _emit(self, event: str, **data):
+        for callback in list(self._listeners):
+            callback(self, event, data)
+
+    def _unshare(self):
+        # Existing rows are about to change. The forks sharing them take a
+        # private copy; this budget's storage, which may be a database or
+        # file, is always changed in place.
+        if self._shared:
+            for fork in self._forks:
+                fork._storage.detach()
+            self._forks.clear()
+            self._shared = False
+
+    def fork(self, name: str = None):
+        """
+        Create a copy-on-write snapshot of the budget for what-if scenarios.
+
+        The fork shares this budget's expenses instead of copying them and
+        keeps only its own added, removed and recategorized rows. Its
+        totals start as a copy of this budget's running totals, so forking
+        costs time and memory in proportion to the number of categories,
+        not expenses.
+        Later changes to either budget are not visible in the other: if
+        this budget removes or recategorizes expenses while forks share
+        them, each live fork first copies the shared rows into memory.
+
+        Args:
+            name (str, optional): The name of the fork; defaults to this
+                budget's name.
+
+        Returns:
+            Budget: The new budget.
+        """
+        fork = type(self).__new__(type(self))
+        fork.version = 0
+        fork.rows_version = 0
+        fork._name = self._name if name is None else name
+        fork.exact = self.exact
+        fork.scale = self.scale
+        fork._amount_minor = self._amount_minor
+        fork._storage = ForkStorage(self._storage)
+        fork._total = self._total.copy()
+        fork._category_stats = {
+            category: stats.copy() for category, stats in self._category_stats.items()
+        }
+        fork._month_stats = (
+            None
+            if self._month_stats is None
+            else {month: stats.copy() for month, stats in self._month_stats.items()}
+        )
+        fork._category_index = None
+        fork._description_index = None
+        fork._time_index = None
+        fork._summary = None if self._summary is None else self._summary.copy()
+        fork._category_summaries = (
+            None
+            if self._category_summaries is None
+            else {
+                category: summary.copy()
+                for category, summary in self._category_summaries.items()
+            }
+        )
+        fork._shared = False
+        fork._forks = weakref.WeakSet()
+        fork._listeners = []
+        fork._rename_checks = []
+        fork._alerts = None
+        fork._recurring = list(self._recurring)
+        self._shared = True
+        self._forks.add(fork)
+        return fork
+
+    def _get_time_index(self):
+        if self._time_index is None:
+            self._time_index = TimeIndex(self._storage.dated_rows())
+        return self._time_index
+
+    def get_total_between(self, start=None, end=None) -> float:
+        """
+        Sum the expenses dated within a range of days.
+
+        Undated expenses are never included. Uses binary search over the
+        budget's time index rather than a scan.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Returns:
+            float: The total amount spent in the range.
+        """
+        return self._get_time_index().sum_between(start, end) / factor(self.scale)
+
+    def get_count_between(self, start=None, end=None) -> int:
+        """
+        Count the expenses dated within a range of days.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Returns:
+            int: The number of expenses in the range.
+        """
+        return self._get_time_index().count_between(start, end)
+
+    def get_expenses_between(self, start=None, end=None) -> list:
+        """
+        Return the expenses dated within a range of days, in date order.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Returns:
+            list: The expenses in the range.
+        """
+        storage = self._storage
+        return [storage[row] for row in self._get_time_index().rows_between(start, end)]
+
+    def add_recurring(self, recurring):
+        """
+        Add a recurring expense schedule to the budget's forecasts.
+
+        The schedule is kept as a definition: its occurrences are not added
+        to ``expenses`` and do not count towards the budget's totals.
+
+        Args:
+            recurring (RecurringExpense): The schedule to add.
+
+        Raises:
+            ValueError: If the schedule's currency scale does not match the budget's.
+        """
+        if recurring.scale != self.scale:
+            raise ValueError(
+                f"Schedule scale {recurring.scale} does not match budget scale {self.scale}"
+            )
+        self._recurring.append(recurring)
+
+    def remove_recurring(self, recurring):
+        """
+        Remove a recurring expense schedule from the budget.
+
+        Args:
+            recurring (RecurringExpense): The schedule to remove.
+
+        Raises:
+            ValueError: If the schedule was not added to the budget.
+        """
+        self._recurring.remove(recurring)
+
+    @property
+    def recurring(self) -> tuple:
+        """
+        The budget's recurring expense schedules, in the order they were added.
+        """
+        return tuple(self._recurring)
+
+    def _recurring_minor(self, start, end, category) -> int:
+        return sum(
+            recurring.get_total_minor_between(start, end)
+            for recurring in self._recurring
+            if category is None or recurring.category == category
+        )
+
+    def get_recurring_total(self, start=None, end=None, category: str = None) -> float:
+        """
+        Sum the occurrences of the recurring expenses within a range of days.
+
+        Each schedule is totalled in closed form, so this costs time in
+        proportion to the number of schedules, not occurrences.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+            category (str, optional): Only include schedules in this category.
+
+        Returns:
+            float: The total amount of the occurrences.
+
+        Raises:
+            ValueError: If no end is given and a schedule has none.
+        """
+        return self._recurring_minor(start, end, category) / factor(self.scale)
+
+    def get_forecast_total(self, start=None, end=None) -> float:
+        """
+        Sum the dated expenses and the recurring occurrences within a range of days.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Returns:
+            float: The forecast amount spent in the range.
+
+        Raises:
+            ValueError: If no end is given and a schedule has none.
+        """
+        spent = self._get_time_index().sum_between(start, end)
+        return (spent + self._recurring_minor(start, end, None)) / factor(self.scale)
+
+    def get_forecast_remaining(self, end) -> float:
+        """
+        Calculate the amount that will be left once the recurring expenses
+        up to a day have occurred.
+
+        Args:
+            end (datetime.date): The last day of the forecast.
+
+        Returns:
+            float: The remaining amount after every expense and every
+                recurring occurrence up to the end day.
+        """
+        spent = self._total.value + self._recurring_minor(None, end, None)
+        return (self.amount_minor - spent) / factor(self.scale)
+
+    def iter_forecast(self, start=None, end=None):
         """
-        self.expenses.append(expense)
+        Iterate over the dated expenses and the recurring occurrences
+        within a range of days, merged in date order.
+
+        The dated expenses are looked up when this is called; occurrences
+        are generated lazily as the iteration reaches them. Without an end
+        for the range, the iterator does not stop while an open-ended
+        schedule remains.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Returns:
+            iterator: The expenses, in date order.
+        """
+        streams = [self.get_expenses_between(start, end)]
+        streams.extend(recurring.iter_expenses(start, end) for recurring in self._recurring)
+        return heapq.merge(*streams, key=lambda expense: expense.date)
+
+    @classmethod
+    def from_csv(
+        cls,
+        source,
+        name: str,
+        amount: float,
+        storage="columnar",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        categorizer=None,
+        **kwargs,
+    ):
+        """
+        Create a budget populated from a CSV file of expenses.
+
+        Args:
+            source: A file path or an open text file with a header row.
+            name (str): The name of the budget.
+            amount (float): The total amount allocated for the budget.
+            storage (optional): The storage for the new budget.
+            chunk_size (int): The number of rows parsed and added per batch.
+            categorizer (Categorizer, optional): Categorizes each batch by
+                its descriptions before it is added; rows no rule matches
+                keep the category from the file.
+            **kwargs: Further keyword arguments for the Budget constructor.
+
+        Returns:
+            Budget: The populated budget.
+        """
+        budget = cls(name, amount, storage=storage, **kwargs)
+        for descriptions, amounts, categories, dates in read_csv_chunks(
+            source, chunk_size, scale=budget.scale
+        ):
+            if categorizer is not None:
+                categories = categorizer.categorize_many(descriptions, categories)
+            budget.add_columns(descriptions, amounts, categories, dates, minor_units=True)
+        return budget
+
+    @classmethod
+    def from_jsonl(
+        cls,
+        source,
+        name: str,
+        amount: float,
+        storage="columnar",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        categorizer=None,
+        **kwargs,
+    ):
+        """
+        Create a budget populated from a JSON Lines file of expenses.
+
+        Args:
+            source: A file path or an open text file.
+            name (str): The name of the budget.
+            amount (float): The total amount allocated for the budget.
+            storage (optional): The storage for the new budget.
+            chunk_size (int): The number of rows parsed and added per batch.
+            categorizer (Categorizer, optional): Categorizes each batch by
+                its descriptions before it is added; rows no rule matches
+                keep the category from the file.
+            **kwargs: Further keyword arguments for the Budget constructor.
+
+        Returns:
+            Budget: The populated budget.
+        """
+        budget = cls(name, amount, storage=storage, **kwargs)
+        for descriptions, amounts, categories, dates in read_jsonl_chunks(
+            source, chunk_size, scale=budget.scale
+        ):
+            if categorizer is not None:
+                categories = categorizer.categorize_many(descriptions, categories)
+            budget.add_columns(descriptions, amounts, categories, dates, minor_units=True)
+        return budget
+
+    @classmethod
+    def open_sqlite(
+        cls,
+        path: str,
+        name: str = None,
+        amount: float = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        scale: int = None,
+        **kwargs,
+    ):
+        """
+        Open a budget persisted in an SQLite database, creating it if needed.
+
+        The name, amount and currency scale are stored in the database when
+        it is created, updated whenever the name or amount changes, and read
+        back when it is reopened. Totals are read from
+        a summary table, so opening does not load any expenses.
+
+        Args:
+            path (str): The database file path.
+            name (str, optional): The name of a new budget.
+            amount (float, optional): The total amount allocated for a new budget.
+            batch_size (int): The number of expenses written per transaction.
+            scale (int, optional): The currency scale of a new budget.
+            **kwargs: Further keyword arguments for the Budget constructor.
+
+        Returns:
+            Budget: The opened budget.
+
+        Raises:
+            ValueError: If the database is new and no name or amount is given.
+        """
+        storage = SQLiteStorage(path, batch_size, scale)
+        stored_name = storage.get_meta("name")
+        if stored_name is None:
+            if name is None or amount is None:
+                storage.close()
+                raise ValueError("A name and amount are required to create a new budget")
+            budget = cls(name, amount, storage=storage, **kwargs)
+            storage.set_meta("name", name)
+            storage.set_meta("amount", budget.amount_minor)
+            return budget
+        amount = Money.from_minor(storage.get_meta("amount"), storage.scale)
+        return cls(stored_name, amount, storage=storage, **kwargs)
+
+    @classmethod
+    def open_paged(
+        cls,
+        path: str,
+        name: str = None,
+        amount: float = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cache_pages: int = DEFAULT_CACHE_PAGES,
+        scale: int = None,
+        **kwargs,
+    ):
+        """
+        Open a budget kept in a paged ledger file, creating it if needed.
+
+        Expenses are read a page at a time through a bounded LRU cache, and
+        the totals are seeded from the file's page directory, so neither
+        opening nor the running totals load any expenses.
+        The name and amount are kept with the page directory and written
+        with it, so changes to them survive closing and reopening.
+
+        Args:
+            path (str): The ledger file path.
+            name (str, optional): The name of a new budget.
+            amount (float, optional): The total amount allocated for a new budget.
+            page_size (int): The number of expenses per page of a new file.
+            cache_pages (int): The maximum number of pages held in memory.
+            scale (int, optional): The currency scale of a new budget.
+            **kwargs: Further keyword arguments for the Budget constructor.
+
+        Returns:
+            Budget: The opened budget; close it to write the last page.
+
+        Raises:
+            ValueError: If the file is new and no name or amount is given.
+        """
+        storage = PagedStorage(path, page_size, cache_pages, scale)
+        stored_name = storage.get_meta("name")
+        if stored_name is None:
+            if name is None or amount is None:
+                storage.close()
+                raise ValueError("A name and amount are required to create a new budget")
+            budget = cls(name, amount, storage=storage, **kwargs)
+            storage.set_meta("name", name)
+            storage.set_meta("amount", budget.amount_minor)
+            return budget
+        amount = Money.from_minor(storage.get_meta("amount"), storage.scale)
+        return cls(stored_name, amount, storage=storage, **kwargs)
+
+    def flush(self):
+        """
+        Write any buffered expenses through to the budget's storage.
+        """
+        self._storage.flush()
+
+    def close(self):
+        """
+        Flush buffered expenses and release the budget's storage.
+
+        Pending threshold alerts are delivered before the storage closes,
+        and live forks copy the rows they share, so they outlive it.
+        """
+        if self._alerts is not None:
+            self._alerts.close()
+            self._alerts = None
+        self._unshare()
+        self._storage.close()
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode the budget in the binary ledger layout.
+
+        Columnar budgets are copied out column by column, without encoding
+        individual rows.
+
+        Returns:
+            bytes: The encoded budget, readable with from_bytes or open_ledger.
+        """
+        return b"".join(encode_ledger(self))
+
+    @classmethod
+    def from_bytes(cls, data, **kwargs):
+        """
+        Decode a budget encoded with to_bytes.
+
+        Args:
+            data: A bytes-like object holding the encoded budget.
+            **kwargs: Further keyword arguments for the Budget constructor.
+
+        Returns:
+            Budget: A new columnar budget holding the decoded expenses.
+
+        Raises:
+            ValueError: If the data is not an encoded budget from this platform.
+        """
+        name, amount, storage = decode_ledger(data)
+        return cls(name, Money.from_minor(amount, storage.scale), storage=storage, **kwargs)
+
+    def __reduce_ex__(self, protocol):
+        # Pickle the budget as its encoded columns rather than an object graph.
+        # With protocol 5 the columns are PickleBuffers, which a pickler with
+        # a buffer_callback can ship out of band without copying them. List
+        # budgets are restored as list budgets and every other budget as an
+        # in-memory columnar one. The version counters and recurring
+        # expenses are carried; listeners, alerts and forks are not.
+        storage = self._storage
+        kind = "list" if isinstance(_own_rows(storage), ListStorage) else "columnar"
+        if not isinstance(storage, ColumnarStorage):
+            storage = ColumnarStorage(storage, scale=self.scale)
+        columns = (
+            storage.amounts,
+            storage.category_codes,
+            storage.description_codes,
+            storage.dates,
+        )
+        if protocol >= 5:
+            columns = tuple(map(pickle.PickleBuffer, columns))
+        state = {"version": self.version, "rows_version": self.rows_version}
+        if self._recurring:
+            state["_recurring"] = list(self._recurring)
+        return (
+            _restore,
+            (
+                type(self),
+                self.name,
+                self.amount_minor,
+                self.scale,
+                self.exact,
+                sys.byteorder,
+                columns,
+                storage.categories,
+                storage.descriptions,
+                kind,
+            ),
+            state,
+        )
+
+    def __copy__(self):
+        # A budget owns its rows, so even a shallow copy is independent;
+        # fork() is the explicit way to share rows copy-on-write.
+        return copy.deepcopy(self)
+
+    @staticmethod
+    def _check_amounts(amounts, given=None):
+        if not validate_amounts(amounts):
+            index = first_invalid_amount(amounts)
+            given = amounts if given is None else given
+            raise ValueError(f"Invalid expense amount at position {index}: {given[index]!r}")
+
+    def _check_scale(self, expense):
+        if expense.scale != self.scale:
+            raise ValueError(
+                f"Expense scale {expense.scale} does not match budget scale {self.scale}"
+            )
+
+    @staticmethod
+    def _ungroup(groups, key, amount: int):
+        stats = groups[key]
+        stats.remove(amount)
+        if not stats.count:
+            del groups[key]
+
+    @staticmethod
+    def _group(groups, key):
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = GroupStats()
+        return stats
+
+    def _track(self, row: int, amount: int, category: str, date):
+        self.version += 1
+        self._total.add(amount)
+        self._group(self._category_stats, category).add(amount)
+        if self._category_index is not None:
+            self._category_index.add(row, category)
+        if self._summary is not None:
+            self._summary.add(amount)
+        if self._category_summaries is not None:
+            summary = self._category_summaries.get(category)
+            if summary is None:
+                summary = self._category_summaries[category] = AmountSummary()
+            summary.add(amount)
+        if date is not None:
+            if self._month_stats is not None:
+                self._group(self._month_stats, month_of(date)).add(amount)
+            if self._time_index is not None:
+                self._time_index.add(row, date_to_key(date), amount)
+
+    def _track_columns(self, first_row: int, amounts, categories, dates):
+        self.version += 1
+        self._total.extend(amounts)
+        group_stats(zip(categories, amounts), self._category_stats)
+        if self._category_index is not None:
+            self._category_index.extend(first_row, categories)
+        if self._summary is not None:
+            self._summary.extend(amounts)
+        if self._category_summaries is not None:
+            group_summaries(zip(categories, amounts), self._category_summaries)
+        if dates is None:
+            return
+        if self._month_stats is not None:
+            dated = ((month_of(d), a) for d, a in zip(dates, amounts) if d is not None)
+            group_stats(dated, self._month_stats)
+        if self._time_index is not None:
+            self._time_index.extend(
+                (row, date_to_key(date), amount)
+                for row, (date, amount) in enumerate(zip(dates, amounts), start=first_row)
+                if date is not None
+            )
+
+    def get_total_expenses(self) -> float:
+        """
+        Return the sum of all expenses in the budget.
+
+        The total is maintained as expenses are added, so this is O(1).
+
+        Returns:
+            float: The total amount of all expenses.
+        """
+        return self._total.value / factor(self.scale)
+
+    def get_total_minor(self) -> int:
+        """
+        Return the exact sum of all expenses in minor units.
+
+        Returns:
+            int: The total amount of all expenses, in minor units.
+        """
+        return self._total.value
+
+    def get_category_total(self, category: str) -> float:
+        """
+        Return the sum of the expenses in a category.
+
+        Args:
+            category (str): The category to total.
+
+        Returns:
+            float: The total amount spent in the category.
+        """
+        stats = self._category_stats.get(category)
+        return stats.total.value / factor(self.scale) if stats is not None else 0.0
+
+    def get_category_total_minor(self, category: str) -> int:
+        """
+        Return the exact sum of the expenses in a category.
+
+        Args:
+            category (str): The category to total.
+
+        Returns:
+            int: The total amount spent in the category, in minor units.
+        """
+        stats = self._category_stats.get(category)
+        return stats.total.value if stats is not None else 0
+
+    def get_category_totals(self) -> dict:
+        """
+        Return the sum of the expenses in every category.
+
+        Returns:
+            dict: A mapping of category name to total amount.
+        """
+        f = factor(self.scale)
+        return {
+            category: stats.total.value / f for category, stats in self._category_stats.items()
+        }
+
+    def get_category_rows(self, category: str):
+        """
+        Return the row numbers of the expenses in a category.
+
+        Args:
+            category (str): The category to look up.
+
+        Returns:
+            array: The row numbers in insertion order.
+        """
+        return self._get_category_index().rows(category)
+
+    def get_category_expenses(self, category: str) -> list:
+        """
+        Return the expenses in a category without scanning the budget.
+
+        Args:
+            category (str): The category to look up.
+
+        Returns:
+            list: The expenses in the category, in insertion order.
+        """
+        storage = self._storage
+        return [storage[row] for row in self.get_category_rows(category)]
+
+    def _get_description_index(self):
+        if self._description_index is None:
+            self._description_index = DescriptionIndex(self._storage.iter_descriptions())
+        return self._description_index
+
+    def search_rows(self, query: str = "", category: str = None, start=None, end=None):
+        """
+        Find expenses by description words, optionally within a category and dates.
+
+        Descriptions are matched through a token index built the first time
+        a search runs and maintained as expenses are added. Every term must
+        match a whole word, case-insensitively; a term ending in ``*``
+        matches any word starting with it, e.g. ``"star* coffee"``.
+
+        Args:
+            query (str): The search terms; empty to filter only by category and dates.
+            category (str, optional): Only return expenses in this category.
+            start (datetime.date, optional): The first day included.
+            end (datetime.date, optional): The last day included.
+
+        Returns:
+            array: The matching row numbers in insertion order.
+        """
+        row_lists = []
+        if tokenize(query):
+            row_lists.append(self._get_description_index().search(query))
+        if category is not None:
+            row_lists.append(self.get_category_rows(category))
+        if start is not None or end is not None:
+            row_lists.append(sorted(self._get_time_index().rows_between(start, end)))
+        if not row_lists:
+            return array("L", range(len(self._storage)))
+        return intersect_rows(*row_lists)
+
+    def search_expenses(self, query: str = "", category: str = None, start=None, end=None):
+        """
+        Return the expenses found by search_rows.
+
+        Args:
+            query (str): The search terms; empty to filter only by category and dates.
+            category (str, optional): Only return expenses in this category.
+            start (datetime.date, optional): The first day included.
+            end (datetime.date, optional): The last day included.
+
+        Returns:
+            list: The matching expenses in insertion order.
+        """
+        storage = self._storage
+        return [storage[row] for row in self.search_rows(query, category, start, end)]
+
+    def aggregate(self, by="category", aggregates=AGGREGATES) -> dict:
+        """
+        Compute grouped aggregates over the budget's expenses.
+
+        Per-category and per-month aggregates are maintained incrementally
+        as expenses are added; grouping by both is computed in one batched
+        pass over the stored columns. Monthly groups only include dated
+        expenses.
+
+        Args:
+            by: "category", "month", or ("category", "month").
+            aggregates (sequence): Any of "sum", "count", "mean", "min", "max".
+
+        Returns:
+            dict: A mapping of group key to a dict of aggregate values, with
+            amounts in major units. Months are keyed as (year, month) tuples.
+
+        Raises:
+            ValueError: If the grouping or an aggregate is not supported.
+        """
+        for name in aggregates:
+            if name not in AGGREGATES:
+                raise ValueError(f"Unsupported aggregate: {name!r}")
+        if by == "category":
+            groups = self._category_stats
+            if ("min" in aggregates or "max" in aggregates) and not all(
+                stats.bounded for stats in groups.values()
+            ):
+                for category, (_, _, low, high) in self._storage.category_stats().items():
+                    groups[category].set_bounds(low, high)
+        elif by == "month":
+            groups = self._get_month_stats()
+            if "min" in aggregates or "max" in aggregates:
+                for month, stats in groups.items():
+                    if not stats.bounded:
+                        stats.set_bounds(*self._month_bounds(month))
+        elif tuple(by) == ("category", "month"):
+            month = _month_lookup()
+            groups = group_stats(
+                ((category, month(key)), amount)
+                for category, key, amount in self._storage.iter_columns()
+                if key
+            )
+        else:
+            raise ValueError(f"Unsupported grouping: {by!r}")
+        f = factor(self.scale)
+        return {
+            key: {name: _to_major(name, stats.get(name), f) for name in aggregates}
+            for key, stats in groups.items()
+        }
+
+    def _get_category_index(self):
+        if self._category_index is None:
+            self._category_index = CategoryIndex(
+                category for category, _, _ in self._storage.iter_columns()
+            )
+        return self._category_index
+
+    def _get_month_stats(self):
+        if self._month_stats is None:
+            month = _month_lookup()
+            self._month_stats = group_stats(
+                (month(key), amount) for _, key, amount in self._storage.iter_columns() if key
+            )
+        return self._month_stats
+
+    def _month_bounds(self, month: tuple) -> tuple:
+        # Rescan one month's rows for the amount bounds a removal made stale.
+        year, number = month
+        first = datetime.date(year, number, 1)
+        last = first.replace(day=calendar.monthrange(year, number)[1])
+        storage = self._storage
+        amounts = [
+            storage[row].amount_minor
+            for row in self._get_time_index().rows_between(first, last)
+        ]
+        return min(amounts), max(amounts)
+
+    def _get_summaries(self):
+        if self._summary is None:
+            self._summary = AmountSummary()
+            self._summary.extend(amount for _, _, amount in self._storage.iter_columns())
+        if self._category_summaries is None:
+            self._category_summaries = group_summaries(
+                (category, amount) for category, _, amount in self._storage.iter_columns()
+            )
+        return self._summary, self._category_summaries
+
+    def get_amount_summary(self, category: str = None) -> AmountSummary:
+        """
+        Return the streaming summary of expense amounts, in minor units.
+
+        Summaries are built from one scan the first time they are used and
+        then maintained as expenses are added; they merge with summaries of
+        other budgets for portfolio-wide statistics.
+
+        Args:
+            category (str, optional): Summarize only this category.
+
+        Returns:
+            AmountSummary: The summary; treat it as read-only.
+        """
+        summary, categories = self._get_summaries()
+        if category is None:
+            return summary
+        return categories.get(category) or AmountSummary()
+
+    def get_quantiles(self, quantiles=QUANTILES, category: str = None) -> dict:
+        """
+        Estimate quantiles of the expense amounts without sorting them.
+
+        Args:
+            quantiles (sequence): The quantiles to estimate, between 0 and 1.
+            category (str, optional): Only consider this category.
+
+        Returns:
+            dict: A mapping of quantile to estimated amount, None if there
+            are no expenses.
+        """
+        summary = self.get_amount_summary(category)
+        f = factor(self.scale)
+        return {q: _to_major("quantile", summary.quantile(q), f) for q in quantiles}
+
+    def get_category_quantiles(self, quantiles=QUANTILES) -> dict:
+        """
+        Estimate quantiles of the expense amounts in every category.
+
+        Args:
+            quantiles (sequence): The quantiles to estimate, between 0 and 1.
+
+        Returns:
+            dict: A mapping of category name to a dict of quantile to amount.
+        """
+        f = factor(self.scale)
+        _, categories = self._get_summaries()
+        return {
+            category: {q: summary.quantile(q) / f for q in quantiles}
+            for category, summary in categories.items()
+        }
 
     def get_remaining_amount(self) -> float:
         """
@@ -43,8 +1333,35 @@ class Budget:
         Returns:
             float: The remaining amount in the budget.
         """
-        total_expenses = sum(expense.amount for expense in self.expenses)
-        return self.amount - total_expenses
+        return (self.amount_minor - self._total.value) / factor(self.scale)
+
+    def get_remaining_minor(self) -> int:
+        """
+        Calculate the exact remaining amount in the budget.
+
+        Returns:
+            int: The remaining amount in minor units.
+        """
+        return self.amount_minor - self._total.value
+
+    def verify_totals(self) -> bool:
+        """
+        Recompute the totals from the stored expenses and compare them with
+        the running totals.
+
+        This is a full O(n) scan intended for tests and consistency checks.
+
+        Returns:
+            bool: True if the running totals match a fresh recomputation.
+        """
+        total = 0
+        category_totals = {}
+        for category, _, amount in self._storage.iter_columns():
+            total += amount
+            category_totals[category] = category_totals.get(category, 0) + amount
+        return total == self._total.value and category_totals == {
+            category: stats.total.value for category, stats in self._category_stats.items()
+        }
 
     def __str__(self):
         """
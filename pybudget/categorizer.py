@@ -0,0 +1,189 @@
+# pybudget/categorizer.py
+
+"""
+Rule-based categorization of expense descriptions.
+
+Keyword rules are compiled into one Aho-Corasick automaton, so a
+description is scanned once, character by character, however many rules
+there are. Each automaton state records the best rule ending there,
+including rules reachable through its failure links, so the scan only
+compares one precomputed rank per character. Results are cached per
+distinct description, since bulk imports repeat the same merchant strings.
+"""
+
+from collections import deque
+
+DEFAULT_CATEGORY = "Uncategorized"
+
+DEFAULT_CACHE_SIZE = 100000
+
+
+class Categorizer:
+    """
+    Assign categories to descriptions from prioritized keyword rules.
+
+    A rule matches when its keyword occurs anywhere in a description,
+    ignoring case. When several rules match, the one with the highest
+    priority wins, then the one with the longest keyword, then the one
+    added first.
+
+    Attributes:
+        default (str): The category for descriptions no rule matches and
+            that have no category of their own.
+    """
+
+    def __init__(self, rules=(), default: str = DEFAULT_CATEGORY, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Initialize a Categorizer instance.
+
+        Args:
+            rules (iterable, optional): (keyword, category) or
+                (keyword, category, priority) tuples.
+            default (str): The category for unmatched, uncategorized descriptions.
+            cache_size (int): The number of distinct descriptions whose
+                result is remembered.
+        """
+        self.default = default
+        self.cache_size = cache_size
+        self._rules = []
+        self._compiled = None
+        self._cache = {}
+        self.add_rules(rules)
+
+    def __len__(self):
+        return len(self._rules)
+
+    def add_rule(self, keyword: str, category: str, priority: int = 0):
+        """
+        Add a keyword rule.
+
+        Args:
+            keyword (str): The text to look for, matched case-insensitively.
+            category (str): The category assigned when the keyword occurs.
+            priority (int): Rules with a higher priority win over other matches.
+
+        Raises:
+            ValueError: If the keyword is empty.
+        """
+        if not keyword:
+            raise ValueError("Categorization keywords must not be empty")
+        self._rules.append((keyword.casefold(), category, int(priority)))
+        self._compiled = None
+        self._cache.clear()
+
+    def add_rules(self, rules):
+        """
+        Add several keyword rules.
+
+        Args:
+            rules (iterable): (keyword, category) or (keyword, category,
+                priority) tuples.
+        """
+        for rule in rules:
+            self.add_rule(*rule)
+
+    def _compile(self):
+        # Rank rules so that a higher rank is a better match.
+        order = sorted(
+            range(len(self._rules)),
+            key=lambda i: (self._rules[i][2], len(self._rules[i][0]), -i),
+        )
+        categories = [self._rules[i][1] for i in order]
+        goto = [{}]
+        best = [-1]
+        for rank, i in enumerate(order):
+            state = 0
+            for char in self._rules[i][0]:
+                following = goto[state].get(char)
+                if following is None:
+                    following = goto[state][char] = len(goto)
+                    goto.append({})
+                    best.append(-1)
+                state = following
+            best[state] = max(best[state], rank)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[following] = target if target != following else 0
+                best[following] = max(best[following], best[fail[following]])
+        self._compiled = (goto, fail, best, categories)
+        return self._compiled
+
+    def match(self, description: str):
+        """
+        Return the category of the best rule matching a description.
+
+        Args:
+            description (str): The description to categorize.
+
+        Returns:
+            str: The matched category, or None if no rule matches.
+        """
+        goto, fail, best, categories = self._compiled or self._compile()
+        state = 0
+        found = -1
+        for char in description.casefold():
+            following = goto[state].get(char)
+            while following is None and state:
+                state = fail[state]
+                following = goto[state].get(char)
+            if following is None:
+                state = 0
+                continue
+            state = following
+            if best[state] > found:
+                found = best[state]
+        return categories[found] if found >= 0 else None
+
+    def categorize(self, description: str, category: str = None) -> str:
+        """
+        Categorize one description.
+
+        Args:
+            description (str): The description to categorize.
+            category (str, optional): The category to keep if no rule matches.
+
+        Returns:
+            str: The matched category, else ``category``, else the default.
+        """
+        return self.match(description) or category or self.default
+
+    def categorize_many(self, descriptions, categories=None) -> list:
+        """
+        Categorize a batch of descriptions, as read by the bulk loaders.
+
+        Each distinct description is scanned once; repeated descriptions
+        reuse the cached result.
+
+        Args:
+            descriptions (sequence): The descriptions to categorize.
+            categories (sequence, optional): The existing category of each
+                description, kept where no rule matches; empty for none.
+
+        Returns:
+            list: The category of each description.
+        """
+        cache = self._cache
+        match = self.match
+        matched = []
+        for description in descriptions:
+            category = cache.get(description, cache)
+            if category is cache:
+                if len(cache) >= self.cache_size:
+                    cache.clear()
+                category = cache[description] = match(description)
+            matched.append(category)
+        default = self.default
+        if categories is None:
+            return [category or default for category in matched]
+        return [
+            category or given or default for category, given in zip(matched, categories)
+        ]
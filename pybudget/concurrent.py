@@ -0,0 +1,280 @@
+# pybudget/concurrent.py
+
+"""
+A budget that many threads can add expenses to at once.
+
+Writers never touch the shared storage or totals: each thread appends to
+its own buffer, guarded by a lock only that thread and the merger use, so
+concurrent writers do not contend with each other. Every read first
+merges all buffers into the budget under the budget lock and answers
+from the merged state while still holding it, so readers always see a
+consistent snapshot in which totals, categories and rows agree.
+"""
+
+import functools
+import threading
+
+from .budget import Budget
+from .money import to_minor
+
+DEFAULT_MERGE_EVERY = 4096
+
+
+class _AppendBuffer:
+    """
+    The expenses one thread has added but not yet merged.
+    """
+
+    __slots__ = ("lock", "thread", "descriptions", "amounts", "categories", "dates", "dated")
+
+    def __init__(self, thread):
+        self.lock = threading.Lock()
+        self.thread = thread
+        self._reset()
+
+    def _reset(self):
+        self.descriptions = []
+        self.amounts = []
+        self.categories = []
+        self.dates = []
+        self.dated = False
+
+    def take(self):
+        with self.lock:
+            columns = (
+                self.descriptions,
+                self.amounts,
+                self.categories,
+                self.dates if self.dated else None,
+            )
+            self._reset()
+        return columns
+
+
+def _merged(method):
+    # Run a Budget method on the merged state while holding the budget lock.
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            self._merge()
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class ConcurrentBudget(Budget):
+    """
+    A Budget that is safe to share between threads.
+
+    Expenses added from different threads are buffered per thread and
+    merged in batches, so the order of rows added by different threads is
+    only fixed when they are merged. Rows added by one thread keep their
+    relative order. Listeners are called when rows are merged.
+
+    Attributes:
+        merge_every (int): The buffered row count at which a writer tries
+            to merge its own buffer without waiting for a read.
+    """
+
+    def __init__(self, *args, merge_every: int = DEFAULT_MERGE_EVERY, **kwargs):
+        """
+        Initialize a ConcurrentBudget instance.
+
+        Args:
+            *args: Positional arguments for the Budget constructor.
+            merge_every (int): The buffered row count at which a writer tries
+                to merge its own buffer.
+            **kwargs: Keyword arguments for the Budget constructor.
+        """
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._buffers = []
+        self.merge_every = merge_every
+        super().__init__(*args, **kwargs)
+
+    def _buffer(self) -> _AppendBuffer:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = _AppendBuffer(threading.current_thread())
+            with self._lock:
+                self._buffers.append(buffer)
+        return buffer
+
+    def _merge(self):
+        # Called with the budget lock held.
+        for buffer in self._buffers:
+            descriptions, amounts, categories, dates = buffer.take()
+            if amounts:
+                Budget.add_columns(
+                    self, descriptions, amounts, categories, dates, minor_units=True
+                )
+        self._buffers = [
+            buffer for buffer in self._buffers if buffer.thread.is_alive() or buffer.amounts
+        ]
+
+    def _maybe_merge(self, buffer):
+        if len(buffer.amounts) >= self.merge_every and self._lock.acquire(blocking=False):
+            try:
+                self._merge()
+            finally:
+                self._lock.release()
+
+    def add_expense(self, expense):
+        """
+        Add an expense to the budget from any thread.
+
+        Args:
+            expense (Expense): The expense to add.
+
+        Raises:
+            ValueError: If the expense uses a different currency scale.
+        """
+        self._check_scale(expense)
+        buffer = self._buffer()
+        with buffer.lock:
+            buffer.descriptions.append(expense.description)
+            buffer.amounts.append(expense.amount_minor)
+            buffer.categories.append(expense.category)
+            buffer.dates.append(expense.date)
+            if expense.date is not None:
+                buffer.dated = True
+        self._maybe_merge(buffer)
+
+    def add_expenses(self, expenses):
+        """
+        Add several expenses to the budget in one batch from any thread.
+
+        Args:
+            expenses: An iterable of Expense objects.
+
+        Raises:
+            ValueError: If any expense amount is not positive or uses a
+                different currency scale.
+        """
+        expenses = list(expenses)
+        for expense in expenses:
+            self._check_scale(expense)
+        self.add_columns(
+            [expense.description for expense in expenses],
+            [expense.amount_minor for expense in expenses],
+            [expense.category for expense in expenses],
+            [expense.date for expense in expenses],
+            minor_units=True,
+        )
+
+    def add_columns(self, descriptions, amounts, categories, dates=None, minor_units=False):
+        """
+        Add several expenses given as parallel columns from any thread.
+
+        Amounts are converted and validated in the calling thread, before
+        anything is buffered.
+
+        Args:
+            descriptions (sequence): The expense descriptions.
+            amounts (sequence): The expense amounts.
+            categories (sequence): The expense categories.
+            dates (sequence, optional): The expense dates, None for undated.
+            minor_units (bool): Whether the amounts are already integer
+                minor units.
+
+        Raises:
+            ValueError: If the columns differ in length or any amount is not positive.
+        """
+        if not len(descriptions) == len(amounts) == len(categories):
+            raise ValueError("Expense columns must have the same length")
+        if dates is not None and len(dates) != len(amounts):
+            raise ValueError("Expense columns must have the same length")
+        given = amounts
+        if minor_units:
+            amounts = list(amounts)
+        else:
+            amounts = [to_minor(amount, self.scale, self.exact) for amount in amounts]
+        self._check_amounts(amounts, given)
+        buffer = self._buffer()
+        with buffer.lock:
+            buffer.descriptions.extend(descriptions)
+            buffer.amounts.extend(amounts)
+            buffer.categories.extend(categories)
+            if dates is None:
+                buffer.dates.extend([None] * len(amounts))
+            else:
+                buffer.dates.extend(dates)
+                buffer.dated = buffer.dated or any(date is not None for date in dates)
+        self._maybe_merge(buffer)
+
+    def fork(self, name: str = None):
+        """
+        Create a copy-on-write snapshot of the merged budget.
+
+        Args:
+            name (str, optional): The name of the fork; defaults to this
+                budget's name.
+
+        Returns:
+            ConcurrentBudget: The new budget, safe to share between threads.
+        """
+        with self._lock:
+            self._merge()
+            fork = super().fork(name)
+        fork._lock = threading.RLock()
+        fork._local = threading.local()
+        fork._buffers = []
+        fork.merge_every = self.merge_every
+        return fork
+
+    def snapshot(self) -> dict:
+        """
+        Return the budget's totals as one consistent snapshot.
+
+        Returns:
+            dict: The "count", "total" and "remaining" amounts and a
+            "categories" mapping of category name to total, all in minor
+            units and all as of the same moment.
+        """
+        with self._lock:
+            self._merge()
+            return {
+                "count": self._total.count,
+                "total": self._total.value,
+                "remaining": self.amount_minor - self._total.value,
+                "categories": {
+                    category: stats.total.value
+                    for category, stats in self._category_stats.items()
+                },
+            }
+
+    expenses = property(_merged(Budget.expenses.fget), doc=Budget.expenses.__doc__)
+    versions = property(_merged(Budget.versions.fget), doc=Budget.versions.__doc__)
+    name = property(Budget.name.fget, _merged(Budget.name.fset))
+    amount = property(Budget.amount.fget, _merged(Budget.amount.fset))
+
+    remove_expense = _merged(Budget.remove_expense)
+    recategorize = _merged(Budget.recategorize)
+    flush = _merged(Budget.flush)
+    close = _merged(Budget.close)
+    to_bytes = _merged(Budget.to_bytes)
+    __reduce_ex__ = _merged(Budget.__reduce_ex__)
+    get_total_between = _merged(Budget.get_total_between)
+    get_count_between = _merged(Budget.get_count_between)
+    get_expenses_between = _merged(Budget.get_expenses_between)
+    get_total_expenses = _merged(Budget.get_total_expenses)
+    get_total_minor = _merged(Budget.get_total_minor)
+    get_category_total = _merged(Budget.get_category_total)
+    get_category_total_minor = _merged(Budget.get_category_total_minor)
+    get_category_totals = _merged(Budget.get_category_totals)
+    get_category_rows = _merged(Budget.get_category_rows)
+    get_category_expenses = _merged(Budget.get_category_expenses)
+    aggregate = _merged(Budget.aggregate)
+    search_rows = _merged(Budget.search_rows)
+    search_expenses = _merged(Budget.search_expenses)
+    get_amount_summary = _merged(Budget.get_amount_summary)
+    get_quantiles = _merged(Budget.get_quantiles)
+    get_category_quantiles = _merged(Budget.get_category_quantiles)
+    get_remaining_amount = _merged(Budget.get_remaining_amount)
+    get_remaining_minor = _merged(Budget.get_remaining_minor)
+    get_recurring_total = _merged(Budget.get_recurring_total)
+    get_forecast_total = _merged(Budget.get_forecast_total)
+    get_forecast_remaining = _merged(Budget.get_forecast_remaining)
+    iter_forecast = _merged(Budget.iter_forecast)
+    verify_totals = _merged(Budget.verify_totals)
+    __str__ = _merged(Budget.__str__)
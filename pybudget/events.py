@@ -0,0 +1,341 @@
+# pybudget/events.py
+
+"""
+Event-sourced history for budgets.
+
+An EventLog records every change to an attached budget as one JSON line in
+an append-only segment file. Every ``checkpoint_every`` events it writes a
+compact binary checkpoint of the whole budget, in the mapped ledger
+format, and starts a new segment::
+
+    checkpoints.jsonl                 one line per checkpoint: seq, time, file
+    checkpoint-000000001000.ledger    the budget after event 1000
+    events-000000000000.jsonl         events 1 to 1000
+    events-000000001000.jsonl         events 1001 onwards
+
+Loading maps the latest checkpoint and replays only the segment after it;
+replaying up to an earlier sequence number or time rebuilds the budget as
+it was then. Segments are never rewritten, so together they form a
+complete audit trail.
+"""
+
+import datetime
+import json
+import os
+
+from .mapped import open_ledger, save_ledger
+from .money import Money
+from .utils import date_to_key, key_to_date
+
+DEFAULT_CHECKPOINT_EVERY = 10000
+
+MANIFEST = "checkpoints.jsonl"
+
+_SEGMENT = "events-{:012d}.jsonl"
+_CHECKPOINT = "checkpoint-{:012d}.ledger"
+
+
+def _utcnow():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _encode(event: str, data: dict) -> dict:
+    if event != "add":
+        return dict(data)
+    record = {
+        "descriptions": list(data["descriptions"]),
+        "amounts": list(data["amounts"]),
+        "categories": list(data["categories"]),
+    }
+    dates = data["dates"]
+    if dates is not None and any(date is not None for date in dates):
+        record["dates"] = [date_to_key(date) for date in dates]
+    return record
+
+
+def apply_event(budget, record: dict):
+    """
+    Apply one recorded event to a budget.
+
+    Args:
+        budget: The Budget to change.
+        record (dict): An event as stored in the log.
+
+    Raises:
+        ValueError: If the event type is unknown.
+    """
+    event = record["event"]
+    if event == "add":
+        dates = record.get("dates")
+        if dates is not None:
+            dates = [key_to_date(key) for key in dates]
+        budget.add_columns(
+            record["descriptions"],
+            record["amounts"],
+            record["categories"],
+            dates,
+            minor_units=True,
+        )
+    elif event == "amount":
+        budget.amount = Money.from_minor(record["amount"], budget.scale)
+    elif event == "name":
+        budget.name = record["name"]
+    elif event == "remove":
+        budget.remove_expense(record["index"])
+    elif event == "recategorize":
+        budget.recategorize(record["index"], record["category"])
+    else:
+        raise ValueError(f"Unknown budget event: {event!r}")
+
+
+class EventLog:
+    """
+    An append-only log of budget changes with periodic checkpoints.
+
+    Attributes:
+        directory (str): The directory holding the log files.
+        checkpoint_every (int): The number of events between checkpoints.
+        seq (int): The sequence number of the last recorded event.
+    """
+
+    def __init__(
+        self, directory: str, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY, clock=None
+    ):
+        """
+        Initialize an EventLog over a directory, creating it if needed.
+
+        Args:
+            directory (str): The directory holding the log files.
+            checkpoint_every (int): The number of events between checkpoints.
+            clock (callable, optional): Returns the timezone-aware time
+                stamped on events; defaults to the current UTC time.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self._clock = clock or _utcnow
+        self._budget = None
+        self._segment = None
+        self._checkpoints = self._read_manifest()
+        self.seq = self._checkpoints[-1]["seq"] if self._checkpoints else 0
+        segments = self._segments()
+        if segments:
+            for record in self._read_segment(segments[-1]):
+                self.seq = max(self.seq, record["seq"])
+        self._since_checkpoint = self.seq - (
+            self._checkpoints[-1]["seq"] if self._checkpoints else 0
+        )
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read_manifest(self) -> list:
+        try:
+            with open(self._path(MANIFEST), "r", encoding="utf-8") as fp:
+                return [json.loads(line) for line in fp if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _segments(self) -> list:
+        names = sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.startswith("events-") and name.endswith(".jsonl")
+        )
+        return [self._path(name) for name in names]
+
+    @staticmethod
+    def _read_segment(path: str):
+        with open(path, "r", encoding="utf-8") as fp:
+            lines = fp.readlines()
+        for number, line in enumerate(lines, start=1):
+            if not line.endswith("\n"):
+                # A write torn by a crash; the event was never acknowledged.
+                return
+            try:
+                yield json.loads(line)
+            except ValueError:
+                raise ValueError(f"Invalid event on line {number} of {path}") from None
+
+    @property
+    def checkpoints(self) -> list:
+        """
+        The checkpoints written so far, oldest first.
+
+        Returns:
+            list: Dicts with the "seq", "time" and "file" of each checkpoint.
+        """
+        return list(self._checkpoints)
+
+    def attach(self, budget):
+        """
+        Start recording the changes made to a budget.
+
+        The budget's current state becomes the log's first checkpoint.
+
+        Args:
+            budget: The Budget to record.
+
+        Raises:
+            ValueError: If the log already holds a history; use load() to
+                continue it.
+        """
+        if self._checkpoints:
+            raise ValueError(f"{self.directory} already holds a budget history")
+        self._attach(budget)
+        self.checkpoint()
+
+    def _attach(self, budget):
+        self.detach()
+        self._budget = budget
+        budget.add_listener(self._record)
+
+    def detach(self):
+        """
+        Stop recording changes and close the current segment.
+        """
+        if self._budget is not None:
+            self._budget.remove_listener(self._record)
+            self._budget = None
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    close = detach
+
+    def _open_segment(self, start: int):
+        if self._segment is not None:
+            self._segment.close()
+        path = self._path(_SEGMENT.format(start))
+        if os.path.exists(path):
+            with open(path, "rb+") as fp:
+                data = fp.read()
+                if data and not data.endswith(b"\n"):
+                    fp.truncate(data.rfind(b"\n") + 1)
+        self._segment = open(path, "a", encoding="utf-8")
+
+    def _record(self, budget, event: str, data: dict):
+        self.seq += 1
+        record = {"seq": self.seq, "time": self._clock().isoformat(), "event": event}
+        record.update(_encode(event, data))
+        self._segment.write(json.dumps(record) + "\n")
+        self._segment.flush()
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """
+        Write a checkpoint of the attached budget and start a new segment.
+
+        Raises:
+            ValueError: If no budget is attached.
+        """
+        if self._budget is None:
+            raise ValueError("No budget is attached to the event log")
+        name = _CHECKPOINT.format(self.seq)
+        temporary = self._path(name + ".tmp")
+        save_ledger(self._budget, temporary)
+        os.replace(temporary, self._path(name))
+        entry = {"seq": self.seq, "time": self._clock().isoformat(), "file": name}
+        with open(self._path(MANIFEST), "a", encoding="utf-8") as fp:
+            fp.write(json.dumps(entry) + "\n")
+        self._checkpoints.append(entry)
+        self._open_segment(self.seq)
+        self._since_checkpoint = 0
+
+    def events(self, start: int = 0):
+        """
+        Iterate over the recorded events, oldest first.
+
+        Args:
+            start (int): Only events with a higher sequence number are returned.
+
+        Yields:
+            dict: The recorded events.
+        """
+        if self._segment is not None:
+            self._segment.flush()
+        for path in self._segments():
+            for record in self._read_segment(path):
+                if record["seq"] > start:
+                    yield record
+
+    def replay(self, seq: int = None, until=None, **kwargs):
+        """
+        Rebuild the budget as it was after an event, without attaching it.
+
+        The newest checkpoint at or before the requested point is mapped
+        and only the events after it are replayed. The budget owns the
+        mapping: closing it releases the checkpoint file.
+
+        Args:
+            seq (int, optional): The last event to include; defaults to all.
+            until (datetime.datetime, optional): Only include events recorded
+                at or before this timezone-aware time.
+            **kwargs: Further keyword arguments for the Budget constructor.
+
+        Returns:
+            Budget: The rebuilt budget.
+
+        Raises:
+            ValueError: If the log is empty or has no checkpoint that early.
+        """
+        candidates = [
+            entry
+            for entry in self._checkpoints
+            if (seq is None or entry["seq"] <= seq)
+            and (until is None or datetime.datetime.fromisoformat(entry["time"]) <= until)
+        ]
+        if not candidates:
+            raise ValueError(f"{self.directory} has no budget history at that point")
+        entry = candidates[-1]
+        budget = open_ledger(self._path(entry["file"]), **kwargs).fork()
+        budget.expenses.storage.owns_base = True
+        try:
+            self._apply_after(budget, entry["seq"], seq, until)
+        except BaseException:
+            budget.close()
+            raise
+        return budget
+
+    def _apply_after(self, budget, start: int, seq: int, until):
+        # Apply the events after seq number start, up to seq and until.
+        if self._segment is not None:
+            self._segment.flush()
+        segments = self._segments()
+        first = 0
+        for position, path in enumerate(segments):
+            if int(os.path.basename(path)[7:19]) <= start:
+                first = position
+        for path in segments[first:]:
+            for record in self._read_segment(path):
+                if record["seq"] <= start:
+                    continue
+                if (seq is not None and record["seq"] > seq) or (
+                    until is not None and datetime.datetime.fromisoformat(record["time"]) > until
+                ):
+                    return
+                apply_event(budget, record)
+
+    def load(self, exact: bool = False):
+        """
+        Rebuild the latest budget and continue recording its changes.
+
+        Only the latest state can be loaded, since new events are appended
+        after the whole history; use replay for an earlier point in time.
+
+        Args:
+            exact (bool): Whether the budget rejects amounts that are not a
+                whole number of minor units, as for the Budget constructor.
+
+        Returns:
+            Budget: The rebuilt budget, attached to this log.
+
+        Raises:
+            ValueError: If the log is empty.
+        """
+        budget = self.replay(exact=exact)
+        self._attach(budget)
+        self._open_segment(self._checkpoints[-1]["seq"])
+        return budget
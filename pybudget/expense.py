@@ -4,29 +4,155 @@
 Expense module for tracking individual expenses.
 """
 
+import struct
+
+from .money import DEFAULT_SCALE, Money, factor, to_minor
+from .utils import date_to_key, key_to_date
+
+_RECORD = struct.Struct("<qiHII")
+
 
 class Expense:
     """
     A class to represent an expense.
 
+    The amount is held as a whole number of minor units; ``amount`` reads
+    and writes it as a float in major units. Once the expense is stored in
+    a list-backed budget, which keeps the object itself and running totals
+    of its amount, the amount can no longer change.
+
     Attributes:
         description (str): A description of the expense.
         amount (float): The amount of the expense.
+        amount_minor (int): The amount of the expense in minor units.
+        scale (int): The number of decimal places of the currency.
         category (str): The category of the expense.
+        date (datetime.date): The day the expense was incurred, or None.
     """
 
-    def __init__(self, description: str, amount: float, category: str):
+    def __init__(self, description: str, amount, category: str, date=None, scale: int = None):
         """
         Initialize an Expense instance.
 
         Args:
             description (str): A description of the expense.
-            amount (float): The amount of the expense.
+            amount: The amount of the expense, as a float, int, Decimal or Money.
             category (str): The category of the expense.
+            date (datetime.date, optional): The day the expense was incurred.
+            scale (int, optional): The number of decimal places of the
+                currency; defaults to the scale of a Money amount, else 2.
         """
+        if scale is None:
+            scale = amount.scale if isinstance(amount, Money) else DEFAULT_SCALE
+        self._stored = False
         self.description = description
-        self.amount = amount
+        self.scale = scale
+        self.amount_minor = to_minor(amount, scale)
         self.category = category
+        self.date = date
+
+    @classmethod
+    def from_minor(
+        cls, description: str, amount_minor: int, category: str, date=None, scale=DEFAULT_SCALE
+    ):
+        """
+        Create an expense from an amount already in minor units.
+
+        Args:
+            description (str): A description of the expense.
+            amount_minor (int): The amount of the expense in minor units.
+            category (str): The category of the expense.
+            date (datetime.date, optional): The day the expense was incurred.
+            scale (int): The number of decimal places of the currency.
+
+        Returns:
+            Expense: The new expense.
+        """
+        expense = cls.__new__(cls)
+        expense._stored = False
+        expense.description = description
+        expense.scale = scale
+        expense.amount_minor = amount_minor
+        expense.category = category
+        expense.date = date
+        return expense
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode the expense as a compact binary record.
+
+        Returns:
+            bytes: The amount, date, scale and the UTF-8 description and category.
+        """
+        description = self.description.encode("utf-8")
+        category = self.category.encode("utf-8")
+        header = _RECORD.pack(
+            self.amount_minor, date_to_key(self.date), self.scale, len(description), len(category)
+        )
+        return header + description + category
+
+    @classmethod
+    def from_bytes(cls, data) -> "Expense":
+        """
+        Decode an expense encoded with to_bytes.
+
+        Args:
+            data: A bytes-like object holding the record.
+
+        Returns:
+            Expense: The decoded expense.
+
+        Raises:
+            ValueError: If the data is not a complete expense record.
+        """
+        try:
+            amount, key, scale, description_size, category_size = _RECORD.unpack_from(data)
+        except struct.error:
+            raise ValueError("Truncated expense record") from None
+        data = bytes(data[_RECORD.size :])
+        if len(data) != description_size + category_size:
+            raise ValueError("Truncated expense record")
+        return cls.from_minor(
+            data[:description_size].decode("utf-8"),
+            amount,
+            data[description_size:].decode("utf-8"),
+            key_to_date(key),
+            scale,
+        )
+
+    @property
+    def amount(self) -> float:
+        return self.amount_minor / factor(self.scale)
+
+    @amount.setter
+    def amount(self, value):
+        self.amount_minor = to_minor(value, self.scale)
+
+    @property
+    def amount_minor(self) -> int:
+        return self._amount_minor
+
+    @amount_minor.setter
+    def amount_minor(self, value: int):
+        if self._stored:
+            raise ValueError(
+                "Cannot change the amount of an expense stored in a budget; "
+                "remove it and add a corrected expense"
+            )
+        self._amount_minor = value
+
+    def __getstate__(self):
+        # Copies and unpickled expenses are not stored in any budget yet.
+        state = self.__dict__.copy()
+        state["_stored"] = False
+        return state
+
+    @property
+    def money(self) -> Money:
+        """
+        The amount of the expense as a Money value.
+        """
+        return Money.from_minor(self.amount_minor, self.scale)
 
     def __str__(self):
         """
@@ -35,4 +161,12 @@ class Expense:
         Returns:
             str: A string representation of the expense.
         """
-        return f"Expense(description='{self.description}', amount={self.amount}, category='{self.category}')"
+        if self.date is None:
+            return (
+                f"Expense(description='{self.description}', amount={self.amount}, "
+                f"category='{self.category}')"
+            )
+        return (
+            f"Expense(description='{self.description}', amount={self.amount}, "
+            f"category='{self.category}', date='{self.date.isoformat()}')"
+        )
@@ -0,0 +1,405 @@
+# pybudget/hierarchy.py
+
+"""
+Hierarchy module for nesting budgets into a tree of departments, teams and
+projects.
+
+Every node keeps the total of its whole subtree cached. A change to one
+budget's expenses is applied as a delta to that node and each of its
+ancestors, so it costs O(depth), and subtree totals and remaining amounts
+are read in O(1) without visiting the children. Moving a subtree
+subtracts its total from the old ancestors and adds it to the new ones.
+"""
+
+from .budget import Budget
+from .money import DEFAULT_SCALE, Money, factor
+
+
+class BudgetTree:
+    """
+    A tree of budgets with incrementally maintained subtree totals.
+
+    Each node wraps a Budget holding the node's own expenses; its
+    allocation covers its whole subtree, so a node's remaining amount is
+    its allocation less the expenses of the node and all its descendants.
+    Node names are unique within the tree.
+
+    Attributes:
+        scale (int): The number of decimal places of the currency.
+    """
+
+    def __init__(self, scale: int = DEFAULT_SCALE):
+        """
+        Initialize an empty BudgetTree.
+
+        Args:
+            scale (int): The number of decimal places of the currency.
+        """
+        self.scale = scale
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, name):
+        return name in self._nodes
+
+    def __iter__(self):
+        for root in self.roots:
+            yield from root.walk()
+
+    def __getitem__(self, name):
+        """
+        Return the node of a budget.
+
+        Args:
+            name (str): The name of the budget.
+
+        Returns:
+            BudgetNode: The node.
+
+        Raises:
+            KeyError: If no budget has that name.
+        """
+        try:
+            return self._nodes[name]
+        except KeyError:
+            raise KeyError(f"No budget named {name!r} in the tree") from None
+
+    @property
+    def roots(self) -> list:
+        """
+        The nodes without a parent, in the order they were added.
+        """
+        return [node for node in self._nodes.values() if node.parent is None]
+
+    def add_budget(self, name: str, amount, parent: str = None, **kwargs):
+        """
+        Add a new, empty budget to the tree.
+
+        Args:
+            name (str): The name of the budget.
+            amount: The amount allocated to the budget and its descendants,
+                as a float, int, Decimal or Money.
+            parent (str, optional): The name of the parent budget; None for
+                a root.
+            **kwargs: Further keyword arguments for the Budget constructor.
+
+        Returns:
+            BudgetNode: The new node.
+
+        Raises:
+            KeyError: If the parent does not exist.
+            ValueError: If a budget with the same name already exists.
+        """
+        kwargs.setdefault("scale", self.scale)
+        return self.add(Budget(name, amount, **kwargs), parent)
+
+    def add(self, budget: Budget, parent: str = None):
+        """
+        Add an existing budget, with its expenses, to the tree.
+
+        Args:
+            budget (Budget): The budget to add.
+            parent (str, optional): The name of the parent budget; None for
+                a root.
+
+        Returns:
+            BudgetNode: The new node.
+
+        Raises:
+            KeyError: If the parent does not exist.
+            ValueError: If a budget with the same name already exists, or
+                the budget uses a different currency scale.
+        """
+        if budget.name in self._nodes:
+            raise ValueError(f"A budget named {budget.name!r} already exists")
+        if budget.scale != self.scale:
+            raise ValueError(f"Budget scale {budget.scale} does not match tree scale {self.scale}")
+        parent_node = None if parent is None else self[parent]
+        node = self._nodes[budget.name] = BudgetNode(self, budget)
+        if parent_node is not None:
+            node.parent = parent_node
+            parent_node.children.append(node)
+            parent_node._propagate(node.subtree_total_minor)
+        budget.add_rename_check(node._check_rename)
+        budget.add_listener(node._on_change)
+        return node
+
+    def rename(self, name: str, new_name: str):
+        """
+        Rename a budget in the tree.
+
+        Renaming the budget itself, through its ``name`` attribute, has the
+        same effect.
+
+        Args:
+            name (str): The current name of the budget.
+            new_name (str): The new name.
+
+        Raises:
+            KeyError: If the budget does not exist.
+            ValueError: If another budget already has the new name.
+        """
+        self[name].budget.name = new_name
+
+    def reparent(self, name: str, parent: str = None):
+        """
+        Move a budget and its whole subtree under another parent.
+
+        Only the old and new ancestors' totals change.
+
+        Args:
+            name (str): The name of the budget to move.
+            parent (str, optional): The name of the new parent; None to make
+                the budget a root.
+
+        Raises:
+            KeyError: If either budget does not exist.
+            ValueError: If the new parent is the budget itself or one of its
+                descendants.
+        """
+        node = self[name]
+        new_parent = None if parent is None else self[parent]
+        ancestor = new_parent
+        while ancestor is not None:
+            if ancestor is node:
+                raise ValueError(f"Cannot move {name!r} under its own subtree")
+            ancestor = ancestor.parent
+        if node.parent is new_parent:
+            return
+        if node.parent is not None:
+            node.parent.children.remove(node)
+            node.parent._propagate(-node.subtree_total_minor)
+        node.parent = new_parent
+        if new_parent is not None:
+            new_parent.children.append(node)
+            new_parent._propagate(node.subtree_total_minor)
+
+    def remove(self, name: str) -> Budget:
+        """
+        Remove a leaf budget from the tree.
+
+        Args:
+            name (str): The name of the budget to remove.
+
+        Returns:
+            Budget: The removed budget, which keeps its expenses.
+
+        Raises:
+            KeyError: If the budget does not exist.
+            ValueError: If the budget still has children.
+        """
+        node = self[name]
+        if node.children:
+            raise ValueError(f"Budget {name!r} still has sub-budgets")
+        self.reparent(name, None)
+        node.budget.remove_listener(node._on_change)
+        node.budget.remove_rename_check(node._check_rename)
+        del self._nodes[name]
+        return node.budget
+
+    def verify_totals(self) -> bool:
+        """
+        Check every cached subtree total against a fresh bottom-up sum.
+
+        Returns:
+            bool: True if every cached total is consistent.
+        """
+        for root in self.roots:
+            for node in root.walk():
+                expected = node.own_total_minor + sum(
+                    child.subtree_total_minor for child in node.children
+                )
+                if node.subtree_total_minor != expected:
+                    return False
+                if node.own_total_minor != node.budget.get_total_minor():
+                    return False
+        return True
+
+
+class BudgetNode:
+    """
+    One budget inside a BudgetTree.
+
+    Provides the attributes generate_report relies on, reporting the
+    subtree figures: ``name``, ``amount``, ``amount_minor``, ``scale``,
+    ``expenses`` (the node's own) and the remaining-amount getters.
+
+    Attributes:
+        budget (Budget): The budget holding the node's own expenses.
+        parent (BudgetNode): The parent node, or None for a root.
+        children (list): The child nodes, in the order they were added.
+        own_total_minor (int): The total of the node's own expenses.
+        subtree_total_minor (int): The total of the node's and all its
+            descendants' expenses.
+    """
+
+    __slots__ = (
+        "_tree",
+        "_key",
+        "budget",
+        "parent",
+        "children",
+        "own_total_minor",
+        "subtree_total_minor",
+    )
+
+    def __init__(self, tree: BudgetTree, budget: Budget):
+        """
+        Initialize a BudgetNode with no parent or children.
+
+        Args:
+            tree (BudgetTree): The tree holding the node.
+            budget (Budget): The budget holding the node's own expenses.
+        """
+        self._tree = tree
+        self._key = budget.name
+        self.budget = budget
+        self.parent = None
+        self.children = []
+        self.own_total_minor = budget.get_total_minor()
+        self.subtree_total_minor = self.own_total_minor
+
+    @property
+    def name(self) -> str:
+        return self.budget.name
+
+    @property
+    def scale(self) -> int:
+        return self.budget.scale
+
+    @property
+    def amount_minor(self) -> int:
+        return self.budget.amount_minor
+
+    @property
+    def amount(self) -> float:
+        return self.budget.amount
+
+    @amount.setter
+    def amount(self, value):
+        self.budget.amount = value
+
+    @property
+    def money(self) -> Money:
+        return self.budget.money
+
+    @property
+    def expenses(self):
+        return self.budget.expenses
+
+    @property
+    def depth(self) -> int:
+        """
+        The number of ancestors of the node.
+        """
+        depth = 0
+        node = self.parent
+        while node is not None:
+            depth += 1
+            node = node.parent
+        return depth
+
+    def path(self) -> list:
+        """
+        Return the names from the root down to this node.
+
+        Returns:
+            list: The budget names, root first.
+        """
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return names[::-1]
+
+    def walk(self):
+        """
+        Iterate over the node and its descendants, parents before children.
+
+        Yields:
+            BudgetNode: The nodes of the subtree.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def add_expense(self, expense):
+        """
+        Add an expense to the node's own budget.
+
+        Args:
+            expense: An Expense object to add.
+        """
+        self.budget.add_expense(expense)
+
+    def add_expenses(self, expenses):
+        """
+        Add several expenses to the node's own budget in one batch.
+
+        Args:
+            expenses (iterable): The Expense objects to add.
+        """
+        self.budget.add_expenses(expenses)
+
+    def _propagate(self, delta: int):
+        node = self
+        while node is not None:
+            node.subtree_total_minor += delta
+            node = node.parent
+
+    def _check_rename(self, budget, name: str):
+        if name != self._key and name in self._tree._nodes:
+            raise ValueError(f"A budget named {name!r} already exists")
+
+    def _on_change(self, budget, event: str, data: dict):
+        if event == "name":
+            nodes = self._tree._nodes
+            nodes[data["name"]] = nodes.pop(self._key)
+            self._key = data["name"]
+            return
+        total = budget.get_total_minor()
+        if total != self.own_total_minor:
+            delta = total - self.own_total_minor
+            self.own_total_minor = total
+            self._propagate(delta)
+
+    def get_total_expenses(self) -> float:
+        """
+        Return the sum of the expenses of the node and all its descendants.
+
+        Returns:
+            float: The subtree total.
+        """
+        return self.subtree_total_minor / factor(self.scale)
+
+    def get_remaining_amount(self) -> float:
+        """
+        Calculate the amount left of the node's allocation after its subtree's expenses.
+
+        Returns:
+            float: The remaining amount.
+        """
+        return self.get_remaining_minor() / factor(self.scale)
+
+    def get_remaining_minor(self) -> int:
+        """
+        Calculate the exact amount left of the node's allocation.
+
+        Returns:
+            int: The remaining amount in minor units.
+        """
+        return self.budget.amount_minor - self.subtree_total_minor
+
+    def __repr__(self):
+        return f"BudgetNode({self.name!r}, children={len(self.children)})"
+
+    def __str__(self):
+        return (
+            f"Budget(name='{self.name}', amount={self.amount}, "
+            f"remaining={self.get_remaining_amount()})"
+        )
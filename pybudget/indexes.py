@@ -0,0 +1,412 @@
+# pybudget/indexes.py
+
+"""
+Secondary indexes maintained by a budget over its expenses.
+"""
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+from operator import itemgetter
+
+from .utils import date_to_key
+
+
+class TimeIndex:
+    """
+    A sorted index of dated expenses supporting range queries.
+
+    Entries are kept sorted by date key together with their row number and
+    a prefix sum of minor-unit amounts, so range sums and counts take two binary
+    searches. Appending expenses in date order is O(1). Out-of-order
+    entries wait in an unsorted buffer that sums and counts scan directly;
+    once it grows past a fixed size, or rows are requested, the buffer is
+    sorted and merged into the arrays in one pass, so loading a ledger in
+    any order costs O(n log n) overall.
+    """
+
+    PENDING_LIMIT = 256
+
+    def __init__(self, entries=()):
+        """
+        Initialize a TimeIndex instance.
+
+        Args:
+            entries (iterable, optional): (row, date key, amount in minor units)
+                tuples to index.
+        """
+        self.keys = array("i")
+        self.rows = array("L")
+        self._amounts = []
+        self._prefix = [0]
+        self._pending = []
+        for row, key, amount in sorted(entries, key=lambda entry: (entry[1], entry[0])):
+            self.keys.append(key)
+            self.rows.append(row)
+            self._amounts.append(amount)
+        self._prefix_valid = False
+
+    def __len__(self):
+        return len(self.keys) + len(self._pending)
+
+    def add(self, row: int, key: int, amount: int):
+        """
+        Add a dated expense to the index.
+
+        Args:
+            row (int): The row number of the expense in the budget.
+            key (int): The date key of the expense.
+            amount (int): The amount of the expense in minor units.
+        """
+        if not self._pending and (not self.keys or key >= self.keys[-1]):
+            self.keys.append(key)
+            self.rows.append(row)
+            self._amounts.append(amount)
+            if self._prefix_valid:
+                self._prefix.append(self._prefix[-1] + amount)
+            return
+        self._pending.append((key, row, amount))
+
+    def extend(self, entries):
+        """
+        Add several dated expenses to the index.
+
+        Args:
+            entries (iterable): (row, date key, amount in minor units) tuples.
+        """
+        add = self.add
+        for row, key, amount in entries:
+            add(row, key, amount)
+
+    def _merge(self):
+        # Sort the buffer (stably, so ties keep insertion order) and merge it
+        # into the sorted arrays from the first position it reaches.
+        pending = self._pending
+        if not pending:
+            return
+        pending.sort(key=itemgetter(0))
+        position = bisect_right(self.keys, pending[0][0])
+        tail = zip(self.keys[position:], self.rows[position:], self._amounts[position:])
+        merged = list(heapq.merge(tail, pending, key=itemgetter(0)))
+        del self.keys[position:], self.rows[position:], self._amounts[position:]
+        self.keys.extend(entry[0] for entry in merged)
+        self.rows.extend(entry[1] for entry in merged)
+        self._amounts.extend(entry[2] for entry in merged)
+        self._pending = []
+        self._prefix_valid = False
+
+    def _bounds(self, start, end):
+        if len(self._pending) > self.PENDING_LIMIT:
+            self._merge()
+        lo = 0 if start is None else bisect_left(self.keys, date_to_key(start))
+        hi = len(self.keys) if end is None else bisect_right(self.keys, date_to_key(end))
+        return lo, max(lo, hi)
+
+    def _pending_between(self, start, end):
+        lo = None if start is None else date_to_key(start)
+        hi = None if end is None else date_to_key(end)
+        for entry in self._pending:
+            if (lo is None or entry[0] >= lo) and (hi is None or entry[0] <= hi):
+                yield entry
+
+    def _prefix_sums(self):
+        if not self._prefix_valid:
+            self._prefix = [0]
+            self._prefix.extend(accumulate(self._amounts))
+            self._prefix_valid = True
+        return self._prefix
+
+    def sum_between(self, start=None, end=None) -> int:
+        """
+        Sum the amounts of expenses dated within a range.
+
+        Args:
+            start (datetime.date, optional): The first day included, or None.
+            end (datetime.date, optional): The last day included, or None.
+
+        Returns:
+            int: The total amount in the range, in minor units.
+        """
+        lo, hi = self._bounds(start, end)
+        prefix = self._prefix_sums()
+        total = prefix[hi] - prefix[lo]
+        if self._pending:
+            total += sum(entry[2] for entry in self._pending_between(start, end))
+        return total
+
+    def count_between(self, start=None, end=None) -> int:
+        """
+        Count the expenses dated within a range.
+
+        Args:
+            start (datetime.date, optional): The first day included, or None.
+            end (datetime.date, optional): The last day included, or None.
+
+        Returns:
+            int: The number of expenses in the range.
+        """
+        lo, hi = self._bounds(start, end)
+        count = hi - lo
+        if self._pending:
+            count += sum(1 for _ in self._pending_between(start, end))
+        return count
+
+    def rows_between(self, start=None, end=None):
+        """
+        Return the row numbers of expenses dated within a range.
+
+        Args:
+            start (datetime.date, optional): The first day included, or None.
+            end (datetime.date, optional): The last day included, or None.
+
+        Returns:
+            array: Row numbers in date order; ties keep insertion order.
+        """
+        self._merge()
+        lo, hi = self._bounds(start, end)
+        return self.rows[lo:hi]
+
+
+class CategoryIndex:
+    """
+    An index from category name to the row numbers of its expenses.
+
+    Row lists are kept in insertion order, so they are always sorted and
+    can be intersected with other row-id results.
+    """
+
+    def __init__(self, categories=()):
+        """
+        Initialize a CategoryIndex instance.
+
+        Args:
+            categories (iterable, optional): The category of each existing row, in row order.
+        """
+        self._rows = {}
+        self.extend(0, categories)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, category):
+        return category in self._rows
+
+    def add(self, row: int, category: str):
+        """
+        Add an expense to the index.
+
+        Args:
+            row (int): The row number of the expense in the budget.
+            category (str): The category of the expense.
+        """
+        rows = self._rows.get(category)
+        if rows is None:
+            rows = self._rows[category] = array("L")
+        rows.append(row)
+
+    def extend(self, first_row: int, categories):
+        """
+        Add consecutive expenses to the index.
+
+        Args:
+            first_row (int): The row number of the first expense.
+            categories (iterable): The category of each expense, in row order.
+        """
+        index = self._rows
+        for row, category in enumerate(categories, start=first_row):
+            rows = index.get(category)
+            if rows is None:
+                rows = index[category] = array("L")
+            rows.append(row)
+
+    def rows(self, category: str):
+        """
+        Return the row numbers of the expenses in a category.
+
+        Args:
+            category (str): The category to look up.
+
+        Returns:
+            array: A copy of the row numbers in insertion order; empty if the
+                category is unknown.
+        """
+        return array("L", self._rows.get(category, ()))
+
+    def categories(self) -> list:
+        """
+        Return the indexed categories.
+
+        Returns:
+            list: The category names, in order of first appearance.
+        """
+        return list(self._rows)
+
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list:
+    """
+    Split text into the lower-case word tokens used by DescriptionIndex.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        list: The tokens, in order of appearance.
+    """
+    return _TOKEN.findall(text.casefold())
+
+
+def intersect_rows(*row_lists):
+    """
+    Intersect sorted row-number sequences.
+
+    The shortest sequence drives the intersection. When it is much shorter
+    than another, each of its rows is looked up there by binary search, so a
+    rare term or a small category costs little however large the other
+    sequences are; sequences of similar size are intersected as sets.
+
+    Args:
+        *row_lists: Sorted sequences of row numbers.
+
+    Returns:
+        array: The row numbers present in every sequence, in order.
+    """
+    if not row_lists:
+        return array("L")
+    ordered = sorted(row_lists, key=len)
+    result = array("L", ordered[0])
+    for rows in ordered[1:]:
+        if not result:
+            break
+        size = len(rows)
+        if len(result) * 16 > size:
+            result = array("L", sorted(set(result).intersection(rows)))
+            continue
+        kept = array("L")
+        lo = 0
+        for row in result:
+            lo = bisect_left(rows, row, lo)
+            if lo == size:
+                break
+            if rows[lo] == row:
+                kept.append(row)
+        result = kept
+    return result
+
+
+class DescriptionIndex:
+    """
+    An inverted index from description tokens to row numbers.
+
+    Each token maps to the sorted rows whose description contains it. A sorted vocabulary answers
+    prefix queries with two binary searches.
+    """
+
+    def __init__(self, descriptions=()):
+        """
+        Initialize a DescriptionIndex instance.
+
+        Args:
+            descriptions (iterable, optional): The description of each
+                existing row, in row order.
+        """
+        self._postings = {}
+        self._terms = []
+        self.extend(0, descriptions)
+
+    def __len__(self):
+        return len(self._postings)
+
+    def add(self, row: int, description: str):
+        """
+        Add an expense to the index.
+
+        Args:
+            row (int): The row number of the expense in the budget.
+            description (str): The description of the expense.
+        """
+        self.extend(row, (description,))
+
+    def extend(self, first_row: int, descriptions):
+        """
+        Add consecutive expenses to the index.
+
+        Args:
+            first_row (int): The row number of the first expense.
+            descriptions (iterable): The description of each expense, in row order.
+        """
+        postings = self._postings
+        for row, description in enumerate(descriptions, start=first_row):
+            for token in dict.fromkeys(tokenize(description)):
+                rows = postings.get(token)
+                if rows is None:
+                    rows = postings[token] = array("L")
+                    insort(self._terms, token)
+                rows.append(row)
+
+    def rows(self, token: str):
+        """
+        Return the rows whose description contains a token.
+
+        Args:
+            token (str): A token, as produced by tokenize.
+
+        Returns:
+            array: A copy of the row numbers in insertion order.
+        """
+        return array("L", self._postings.get(token, ()))
+
+    def prefix_rows(self, prefix: str):
+        """
+        Return the rows whose description has a token starting with a prefix.
+
+        Args:
+            prefix (str): The token prefix, as produced by tokenize.
+
+        Returns:
+            array: A copy of the row numbers in insertion order.
+        """
+        return array("L", self._prefix_postings(prefix))
+
+    def _prefix_postings(self, prefix: str):
+        # The postings of the tokens starting with prefix, merged; the
+        # posting itself, not a copy, when a single token matches.
+        terms = self._terms
+        lo = bisect_left(terms, prefix)
+        hi = bisect_left(terms, prefix + "\U0010ffff", lo)
+        if hi - lo == 1:
+            return self._postings[terms[lo]]
+        rows = set()
+        for term in terms[lo:hi]:
+            rows.update(self._postings[term])
+        return array("L", sorted(rows))
+
+    def search(self, query: str):
+        """
+        Return the rows whose description matches every term of a query.
+
+        Terms are matched as whole tokens, case-insensitively; a term ending
+        in ``*`` matches any token starting with it, e.g. ``"star* coffee"``.
+
+        Args:
+            query (str): The search terms.
+
+        Returns:
+            array: The matching row numbers in insertion order.
+        """
+        row_lists = []
+        for word in query.split():
+            tokens = tokenize(word)
+            if not tokens:
+                continue
+            prefix = word.endswith("*")
+            for position, token in enumerate(tokens):
+                if prefix and position == len(tokens) - 1:
+                    row_lists.append(self._prefix_postings(token))
+                else:
+                    row_lists.append(self._postings.get(token, ()))
+        return intersect_rows(*row_lists)
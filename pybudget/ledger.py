@@ -0,0 +1,229 @@
+# pybudget/ledger.py
+
+"""
+The binary ledger layout shared by ledger files and budget byte strings.
+
+A ledger is a fixed header followed by fixed-width columns and a string
+heap::
+
+    header            magic, version, byte order, currency scale, counts,
+                      budget amount, total
+    amounts           int64 x rows (minor units)
+    category codes    uint32 x rows
+    description codes uint32 x rows
+    dates             int32 x rows (day ordinals, 0 for undated)
+    category sums     int64 x categories
+    category counts   uint64 x categories
+    string offsets    uint64 x (strings + 1)
+    string heap       UTF-8 bytes: budget name, categories, descriptions
+
+Every section starts on an 8-byte boundary, so a reader can cast each
+column section of a buffer straight to a typed memoryview.
+"""
+
+import struct
+import sys
+from array import array
+
+from .storage import ColumnarStorage, as_storage
+
+MAGIC = b"PYBLEDGR"
+VERSION = 3
+
+_HEADER = struct.Struct("<8sHHH2xQQQqq")
+_BYTE_ORDERS = {"little": 0, "big": 1}
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def layout(rows: int, categories: int, descriptions: int) -> dict:
+    """
+    Compute the offset of every section of a ledger.
+
+    Args:
+        rows (int): The number of expenses.
+        categories (int): The number of distinct categories.
+        descriptions (int): The number of distinct descriptions.
+
+    Returns:
+        dict: A mapping of section name to byte offset.
+    """
+    strings = 1 + categories + descriptions
+    sizes = [
+        ("amounts", rows * 8),
+        ("category_codes", rows * 4),
+        ("description_codes", rows * 4),
+        ("dates", rows * 4),
+        ("category_sums", categories * 8),
+        ("category_counts", categories * 8),
+        ("string_offsets", (strings + 1) * 8),
+    ]
+    offsets = {}
+    position = _HEADER.size
+    for section, size in sizes:
+        offsets[section] = position
+        position += size + (-size % 8)
+    offsets["string_heap"] = position
+    return offsets
+
+
+def encode_ledger(budget) -> list:
+    """
+    Encode a budget in the ledger layout.
+
+    Columnar budgets are encoded without touching individual rows; other
+    storages are converted to columns first.
+
+    Args:
+        budget: The Budget to encode.
+
+    Returns:
+        list: Consecutive bytes-like pieces of the ledger.
+    """
+    storage = as_storage(budget.expenses)
+    if not isinstance(storage, ColumnarStorage):
+        storage = ColumnarStorage(storage, scale=budget.scale)
+    summaries = storage.category_summaries()
+    category_sums = array("q", (summaries.get(c, (0, 0))[0] for c in storage.categories))
+    category_counts = array("Q", (summaries.get(c, (0, 0))[1] for c in storage.categories))
+
+    encoded = [budget.name.encode("utf-8")]
+    encoded.extend(c.encode("utf-8") for c in storage.categories)
+    encoded.extend(d.encode("utf-8") for d in storage.descriptions)
+    string_offsets = array("Q", [0])
+    for item in encoded:
+        string_offsets.append(string_offsets[-1] + len(item))
+
+    pieces = [
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            _BYTE_ORDERS[sys.byteorder],
+            storage.scale,
+            len(storage),
+            len(storage.categories),
+            len(storage.descriptions),
+            budget.amount_minor,
+            storage.total(),
+        )
+    ]
+    for column in (
+        storage.amounts,
+        storage.category_codes,
+        storage.description_codes,
+        storage.dates,
+        category_sums,
+        category_counts,
+        string_offsets,
+    ):
+        pieces.append(memoryview(column).cast("B"))
+        pieces.append(_padding(len(column) * column.itemsize))
+    pieces.extend(encoded)
+    return pieces
+
+
+def read_header(buffer, source: str = "data") -> tuple:
+    """
+    Read and check the header of a ledger.
+
+    Args:
+        buffer: A bytes-like object holding the ledger.
+        source (str): How to name the ledger in error messages.
+
+    Returns:
+        tuple: (scale, rows, categories, descriptions, budget amount, total),
+            with amounts in minor units.
+
+    Raises:
+        ValueError: If the buffer is not a ledger written on this platform.
+    """
+    try:
+        magic, version, byte_order, *fields = _HEADER.unpack_from(buffer)
+    except struct.error:
+        raise ValueError(f"{source} is not a ledger file") from None
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{source} is not a version {VERSION} ledger file")
+    if byte_order != _BYTE_ORDERS[sys.byteorder]:
+        raise ValueError(f"{source} was written with a different byte order")
+    return tuple(fields)
+
+
+def section(buffer: memoryview, offset: int, count: int, typecode: str) -> memoryview:
+    """
+    Return one column section of a ledger as a typed memoryview.
+
+    Args:
+        buffer (memoryview): The ledger.
+        offset (int): The byte offset of the section.
+        count (int): The number of items in the section.
+        typecode (str): The array typecode of the items.
+
+    Returns:
+        memoryview: A view of the section, sharing the buffer's memory.
+    """
+    size = count * array(typecode).itemsize
+    return buffer[offset : offset + size].cast(typecode)
+
+
+def _check_size(buffer: memoryview, size: int, source: str):
+    if buffer.nbytes < size:
+        raise ValueError(
+            f"{source} is truncated: expected at least {size} bytes, got {buffer.nbytes}"
+        )
+
+
+def decode_ledger(data, source: str = "data") -> tuple:
+    """
+    Decode a ledger into a new ColumnarStorage.
+
+    Each column is copied out of the buffer in one block; only the string
+    tables are decoded.
+
+    Args:
+        data: A bytes-like object holding the ledger.
+        source (str): How to name the ledger in error messages.
+
+    Returns:
+        tuple: (budget name, budget amount in minor units, ColumnarStorage).
+
+    Raises:
+        ValueError: If the data is not a ledger written on this platform,
+            or is shorter than its header says.
+    """
+    with memoryview(data) as buffer:
+        scale, rows, n_categories, n_descriptions, amount, _ = read_header(buffer, source)
+        offsets = layout(rows, n_categories, n_descriptions)
+        heap = offsets["string_heap"]
+        _check_size(buffer, heap, source)
+        columns = []
+        for name, typecode in (
+            ("amounts", "q"),
+            ("category_codes", "I"),
+            ("description_codes", "I"),
+            ("dates", "i"),
+        ):
+            column = array(typecode)
+            start = offsets[name]
+            column.frombytes(buffer[start : start + rows * column.itemsize])
+            columns.append(column)
+        count = n_categories + n_descriptions + 2
+        string_offsets = section(buffer, offsets["string_offsets"], count, "Q")
+        try:
+            if any(start > end for start, end in zip(string_offsets, string_offsets[1:])):
+                raise ValueError(f"{source} has a corrupt string table")
+            _check_size(buffer, heap + string_offsets[-1], source)
+            strings = [
+                str(buffer[heap + start : heap + end], "utf-8")
+                for start, end in zip(string_offsets, string_offsets[1:])
+            ]
+        finally:
+            string_offsets.release()
+    storage = ColumnarStorage.from_columns(
+        *columns,
+        strings[1 : 1 + n_categories],
+        strings[1 + n_categories :],
+        scale=scale,
+    )
+    return strings[0], amount, storage
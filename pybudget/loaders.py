@@ -0,0 +1,147 @@
+# pybudget/loaders.py
+
+"""
+Chunked readers for bulk expense files.
+
+Each reader yields ``(descriptions, amounts, categories, dates)`` column
+tuples of at most ``chunk_size`` rows, ready for Budget.add_columns with
+``minor_units=True``: amounts are parsed straight into integer minor units
+without a float round trip. The dates column is None when the input has
+no dates.
+"""
+
+import csv
+import json
+
+from .money import DEFAULT_SCALE, parse_minor, to_minor
+from .utils import parse_date
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def _open(source, newline=None):
+    if hasattr(source, "read"):
+        return source, False
+    return open(source, "r", encoding="utf-8", newline=newline), True
+
+
+def read_csv_chunks(
+    source,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    delimiter: str = ",",
+    scale: int = DEFAULT_SCALE,
+):
+    """
+    Read expenses from a CSV file in column chunks.
+
+    The file must have a header row with "description" and "amount"
+    columns, as written by the CSV report format. An optional "category"
+    column holds categories, empty for uncategorized expenses, and an
+    optional "date" column holds ISO 8601 dates.
+
+    Args:
+        source: A file path or an open text file.
+        chunk_size (int): The maximum number of rows per chunk.
+        delimiter (str): The CSV field delimiter.
+        scale (int): The number of decimal places of the amounts.
+
+    Yields:
+        tuple: Lists of descriptions, amounts, categories and dates.
+
+    Raises:
+        ValueError: If a required column is missing or a value cannot be parsed.
+    """
+    fp, owned = _open(source, newline="")
+    try:
+        reader = csv.reader(fp, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            d_col = header.index("description")
+            a_col = header.index("amount")
+        except ValueError:
+            raise ValueError(
+                "CSV header must contain 'description' and 'amount' columns"
+            ) from None
+        c_col = header.index("category") if "category" in header else None
+        t_col = header.index("date") if "date" in header else None
+
+        descriptions, amounts, categories = [], [], []
+        dates = [] if t_col is not None else None
+        for line_number, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            try:
+                amounts.append(parse_minor(row[a_col], scale))
+            except (ValueError, IndexError):
+                raise ValueError(f"Invalid amount on line {line_number}") from None
+            descriptions.append(row[d_col])
+            categories.append(row[c_col] if c_col is not None else "")
+            if dates is not None:
+                try:
+                    dates.append(parse_date(row[t_col]))
+                except (ValueError, IndexError):
+                    raise ValueError(f"Invalid date on line {line_number}") from None
+            if len(amounts) >= chunk_size:
+                yield descriptions, amounts, categories, dates
+                descriptions, amounts, categories = [], [], []
+                dates = [] if t_col is not None else None
+        if amounts:
+            yield descriptions, amounts, categories, dates
+    finally:
+        if owned:
+            fp.close()
+
+
+def read_jsonl_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE, scale: int = DEFAULT_SCALE):
+    """
+    Read expenses from a JSON Lines file in column chunks.
+
+    Each line is an object with "description" and "amount" keys, an
+    optional "category" (empty for uncategorized expenses) and an optional
+    ISO 8601 "date". A leading budget summary line, as
+    written by the JSON Lines report format, is skipped.
+
+    Args:
+        source: A file path or an open text file.
+        chunk_size (int): The maximum number of rows per chunk.
+        scale (int): The number of decimal places of the amounts.
+
+    Yields:
+        tuple: Lists of descriptions, amounts, categories and dates.
+
+    Raises:
+        ValueError: If a line is not a valid JSON object or lacks an expense
+            field.
+    """
+    fp, owned = _open(source)
+    try:
+        descriptions, amounts, categories, dates = [], [], [], []
+        loads = json.loads
+        for line_number, line in enumerate(fp, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+            except ValueError:
+                raise ValueError(f"Invalid JSON on line {line_number}") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"Expected a JSON object on line {line_number}")
+            if "budget" in record:
+                continue
+            try:
+                amounts.append(to_minor(record["amount"], scale))
+                descriptions.append(record["description"])
+                categories.append(record.get("category", ""))
+                dates.append(parse_date(record.get("date")))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Invalid expense on line {line_number}") from None
+            if len(amounts) >= chunk_size:
+                yield descriptions, amounts, categories, dates
+                descriptions, amounts, categories, dates = [], [], [], []
+        if amounts:
+            yield descriptions, amounts, categories, dates
+    finally:
+        if owned:
+            fp.close()
@@ -0,0 +1,178 @@
+# pybudget/mapped.py
+
+"""
+Memory-mapped binary ledger files for zero-copy budget loading.
+
+A ledger file holds a budget in the binary ledger layout described in
+``pybudget.ledger``: fixed-width columns and a string heap, each section
+on an 8-byte boundary. Opening a ledger maps the file and casts the column
+sections to typed memoryviews, so no rows are decoded until they are
+accessed and several processes reading the same ledger share the page
+cache.
+"""
+
+import mmap
+
+from .budget import Budget
+from .ledger import encode_ledger, layout, read_header, section
+from .money import Money
+from .storage import ColumnarStorage, ExpenseStorage
+
+_VIEWS = (
+    "amounts",
+    "category_codes",
+    "description_codes",
+    "dates",
+    "_category_sums",
+    "_category_counts",
+    "_string_offsets",
+)
+
+
+def save_ledger(budget, path: str):
+    """
+    Save a budget to a binary ledger file.
+
+    Args:
+        budget: The Budget to save.
+        path (str): The path of the ledger file to write.
+    """
+    with open(path, "wb") as fp:
+        fp.writelines(encode_ledger(budget))
+
+
+class MappedStorage(ExpenseStorage):
+    """
+    Read-only storage backend over a memory-mapped ledger file.
+
+    The column attributes are memoryviews into the mapped file, so sums and
+    scans run directly over the mapped pages. Rows are exposed as
+    ExpenseView objects, like ColumnarStorage.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a MappedStorage instance.
+
+        Args:
+            path (str): The path of the ledger file to map.
+
+        Raises:
+            ValueError: If the file is not a ledger written on this platform.
+        """
+        self.path = path
+        with open(path, "rb") as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        try:
+            scale, rows, n_categories, n_descriptions, amount, total = read_header(
+                self._buffer, path
+            )
+        except ValueError:
+            self.close()
+            raise
+
+        self.scale = scale
+        self.budget_amount = Money.from_minor(amount, scale)
+        self._total = total
+        offsets = layout(rows, n_categories, n_descriptions)
+        self.amounts = self._section(offsets["amounts"], rows, "q")
+        self.category_codes = self._section(offsets["category_codes"], rows, "I")
+        self.description_codes = self._section(offsets["description_codes"], rows, "I")
+        self.dates = self._section(offsets["dates"], rows, "i")
+        self._category_sums = self._section(offsets["category_sums"], n_categories, "q")
+        self._category_counts = self._section(offsets["category_counts"], n_categories, "Q")
+        strings = 1 + n_categories + n_descriptions
+        self._string_offsets = self._section(offsets["string_offsets"], strings + 1, "Q")
+        self._heap = offsets["string_heap"]
+        self._description_base = 1 + n_categories
+        self.budget_name = self._string(0)
+        self.categories = [self._string(1 + code) for code in range(n_categories)]
+
+    def _section(self, offset: int, count: int, typecode: str):
+        return section(self._buffer, offset, count, typecode)
+
+    def _string(self, index: int) -> str:
+        start = self._heap + self._string_offsets[index]
+        end = self._heap + self._string_offsets[index + 1]
+        return str(self._buffer[start:end], "utf-8")
+
+    def __len__(self):
+        return len(self.amounts)
+
+    __getitem__ = ColumnarStorage.__getitem__
+
+    __iter__ = ColumnarStorage.__iter__
+
+    def __repr__(self):
+        return f"MappedStorage({self.path!r}, rows={len(self)})"
+
+    def append(self, expense):
+        raise ValueError("Mapped ledgers are read-only")
+
+    def extend_columns(self, descriptions, amounts, categories, dates=None):
+        raise ValueError("Mapped ledgers are read-only")
+
+    def description_at(self, row: int) -> str:
+        """
+        Return the description stored at a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            str: The description of the expense.
+        """
+        return self._string(self._description_base + self.description_codes[row])
+
+    amount_at = ColumnarStorage.amount_at
+
+    category_at = ColumnarStorage.category_at
+
+    date_at = ColumnarStorage.date_at
+
+    dated_rows = ColumnarStorage.dated_rows
+
+    iter_columns = ColumnarStorage.iter_columns
+
+    def iter_descriptions(self):
+        # Decode each distinct description once rather than once per row.
+        base = self._description_base
+        count = len(self._string_offsets) - 1 - base
+        descriptions = [self._string(base + code) for code in range(count)]
+        return map(descriptions.__getitem__, self.description_codes)
+
+    def total(self) -> int:
+        return self._total
+
+    def category_summaries(self) -> dict:
+        return {
+            category: (self._category_sums[code], self._category_counts[code])
+            for code, category in enumerate(self.categories)
+            if self._category_counts[code]
+        }
+
+    def close(self):
+        for view in _VIEWS:
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self._buffer.release()
+        self._mmap.close()
+
+
+def open_ledger(path: str, **kwargs) -> Budget:
+    """
+    Open a binary ledger file as a read-only budget backed by ``mmap``.
+
+    The totals are read from the file header, so opening is independent of
+    the number of rows.
+
+    Args:
+        path (str): The path of the ledger file.
+        **kwargs: Further keyword arguments for the Budget constructor.
+
+    Returns:
+        Budget: A budget whose expenses are served from the mapped file.
+    """
+    storage = MappedStorage(path)
+    return Budget(storage.budget_name, storage.budget_amount, storage=storage, **kwargs)
@@ -0,0 +1,314 @@
+# pybudget/money.py
+
+"""
+Fixed-point money representation based on integer minor units.
+
+Amounts are held as a whole number of minor units (cents for a currency
+with two decimal places) together with the currency scale, so sums and
+comparisons are exact integer operations. Floats are only produced at the
+edges, for display and for backwards-compatible ``amount`` attributes.
+"""
+
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+
+DEFAULT_SCALE = 2
+
+_FACTORS = [10**scale for scale in range(19)]
+
+
+def factor(scale: int = DEFAULT_SCALE) -> int:
+    """
+    Return the number of minor units in one major unit.
+
+    Args:
+        scale (int): The number of decimal places of the currency.
+
+    Returns:
+        int: ``10 ** scale``.
+    """
+    return _FACTORS[scale]
+
+
+def to_minor(amount, scale: int = DEFAULT_SCALE, exact: bool = False) -> int:
+    """
+    Convert an amount in major units to integer minor units.
+
+    Floats are rounded to the nearest minor unit; Decimal and string amounts
+    are rounded half to even.
+
+    Args:
+        amount: A Money, int, float, Decimal or numeric string.
+        scale (int): The number of decimal places of the currency.
+        exact (bool): Raise instead of rounding amounts with more decimal
+            places than the scale allows.
+
+    Returns:
+        int: The amount in minor units.
+
+    Raises:
+        ValueError: If the amount is not a number, or is not exact when
+            ``exact`` is set.
+    """
+    if isinstance(amount, Money):
+        return amount.rescale(scale).minor
+    f = _FACTORS[scale]
+    if isinstance(amount, int):
+        return amount * f
+    if isinstance(amount, float):
+        try:
+            minor = round(amount * f)
+        except (OverflowError, ValueError):
+            raise ValueError(f"Invalid amount: {amount!r}") from None
+        if exact and minor / f != amount:
+            raise ValueError(f"Amount {amount!r} is not a whole number of minor units")
+        return minor
+    try:
+        value = Decimal(amount).scaleb(scale)
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError(f"Invalid amount: {amount!r}") from None
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {amount!r}")
+    minor = int(value.to_integral_value(ROUND_HALF_EVEN))
+    if exact and minor != value:
+        raise ValueError(f"Amount {amount!r} is not a whole number of minor units")
+    return minor
+
+
+def from_minor(minor: int, scale: int = DEFAULT_SCALE) -> float:
+    """
+    Convert integer minor units to a float amount in major units.
+
+    Args:
+        minor (int): The amount in minor units.
+        scale (int): The number of decimal places of the currency.
+
+    Returns:
+        float: The amount in major units.
+    """
+    return minor / _FACTORS[scale]
+
+
+def minor_to_str(minor: int, scale: int = DEFAULT_SCALE) -> str:
+    """
+    Format integer minor units as an exact decimal string.
+
+    Args:
+        minor (int): The amount in minor units.
+        scale (int): The number of decimal places of the currency.
+
+    Returns:
+        str: The amount with exactly ``scale`` decimal places, e.g. "-12.05".
+    """
+    sign = "-" if minor < 0 else ""
+    whole, fraction = divmod(abs(minor), _FACTORS[scale])
+    if not scale:
+        return f"{sign}{whole}"
+    return f"{sign}{whole}.{fraction:0{scale}d}"
+
+
+def format_minor(minor: int, scale: int = DEFAULT_SCALE) -> str:
+    """
+    Format integer minor units as a currency string.
+
+    Matches format_currency for amounts with two decimal places.
+
+    Args:
+        minor (int): The amount in minor units.
+        scale (int): The number of decimal places of the currency.
+
+    Returns:
+        str: The formatted currency string, e.g. "$12.05".
+    """
+    return f"${minor_to_str(minor, scale)}"
+
+
+def parse_minor(text: str, scale: int = DEFAULT_SCALE) -> int:
+    """
+    Parse a plain decimal string straight into integer minor units.
+
+    This avoids the float round trip for amounts read from files. Extra
+    decimal places are rounded half to even.
+
+    Args:
+        text (str): The amount, e.g. "12.5" or "-3".
+        scale (int): The number of decimal places of the currency.
+
+    Returns:
+        int: The amount in minor units.
+
+    Raises:
+        ValueError: If the text is not a decimal number.
+    """
+    body = text.strip()
+    sign = 1
+    if body.startswith(("-", "+")):
+        sign = -1 if body[0] == "-" else 1
+        body = body[1:]
+    whole, _, fraction = body.partition(".")
+    if (
+        whole.isascii()
+        and whole.isdigit()
+        and len(fraction) <= scale
+        and (not fraction or (fraction.isascii() and fraction.isdigit()))
+    ):
+        return sign * (int(whole) * _FACTORS[scale] + int(fraction.ljust(scale, "0") or 0))
+    return to_minor(text, scale)
+
+
+class Money:
+    """
+    An immutable amount of money in integer minor units.
+
+    Attributes:
+        minor (int): The amount in minor units.
+        scale (int): The number of decimal places of the currency.
+    """
+
+    __slots__ = ("minor", "scale")
+
+    def __init__(self, amount=0, scale: int = DEFAULT_SCALE):
+        """
+        Initialize a Money instance from an amount in major units.
+
+        Args:
+            amount: An int, float, Decimal, numeric string or Money.
+            scale (int): The number of decimal places of the currency.
+        """
+        object.__setattr__(self, "minor", to_minor(amount, scale))
+        object.__setattr__(self, "scale", scale)
+
+    @classmethod
+    def from_minor(cls, minor: int, scale: int = DEFAULT_SCALE) -> "Money":
+        """
+        Create a Money instance from integer minor units.
+
+        Args:
+            minor (int): The amount in minor units.
+            scale (int): The number of decimal places of the currency.
+
+        Returns:
+            Money: The amount.
+        """
+        money = cls.__new__(cls)
+        object.__setattr__(money, "minor", int(minor))
+        object.__setattr__(money, "scale", scale)
+        return money
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money objects are immutable")
+
+    def rescale(self, scale: int) -> "Money":
+        """
+        Return the same amount at another scale, rounding half to even if needed.
+
+        Args:
+            scale (int): The new number of decimal places.
+
+        Returns:
+            Money: The rescaled amount.
+        """
+        if scale == self.scale:
+            return self
+        if scale > self.scale:
+            return Money.from_minor(self.minor * _FACTORS[scale - self.scale], scale)
+        return Money(self.to_decimal(), scale)
+
+    def to_decimal(self) -> Decimal:
+        """
+        Return the amount as an exact Decimal in major units.
+
+        Returns:
+            Decimal: The amount.
+        """
+        return Decimal(self.minor).scaleb(-self.scale)
+
+    def _coerce(self, other):
+        if isinstance(other, Money):
+            return other.rescale(self.scale).minor if other.scale != self.scale else other.minor
+        if isinstance(other, (int, float, Decimal)):
+            return to_minor(other, self.scale)
+        return None
+
+    def __add__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return Money.from_minor(self.minor + minor, self.scale)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return Money.from_minor(self.minor - minor, self.scale)
+
+    def __rsub__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return Money.from_minor(minor - self.minor, self.scale)
+
+    def __mul__(self, other):
+        if not isinstance(other, int):
+            return NotImplemented
+        return Money.from_minor(self.minor * other, self.scale)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Money.from_minor(-self.minor, self.scale)
+
+    def __abs__(self):
+        return Money.from_minor(abs(self.minor), self.scale)
+
+    def __bool__(self):
+        return self.minor != 0
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.to_decimal() == other.to_decimal()
+        if isinstance(other, float):
+            return float(self) == other
+        if isinstance(other, (int, Decimal)):
+            return self.to_decimal() == other
+        return NotImplemented
+
+    def __lt__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return self.minor < minor
+
+    def __le__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return self.minor <= minor
+
+    def __gt__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return self.minor > minor
+
+    def __ge__(self, other):
+        minor = self._coerce(other)
+        if minor is None:
+            return NotImplemented
+        return self.minor >= minor
+
+    def __hash__(self):
+        return hash(self.to_decimal())
+
+    def __float__(self):
+        return self.minor / _FACTORS[self.scale]
+
+    def __str__(self):
+        return minor_to_str(self.minor, self.scale)
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __reduce__(self):
+        return (Money.from_minor, (self.minor, self.scale))
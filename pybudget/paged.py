@@ -0,0 +1,586 @@
+# pybudget/paged.py
+
+"""
+Paged on-disk expense storage for ledgers larger than memory.
+
+A paged ledger file holds a fixed header, then pages of ``page_size``
+rows and a JSON page directory::
+
+    header      magic, version, byte order, currency scale, page size,
+                directory offset and size
+    pages       per page: row and category counts, int64 amounts (minor
+                units), int32 date keys, uint32 category codes, then the
+                page's category names and descriptions as length-prefixed
+                UTF-8
+    directory   JSON: budget metadata and, per page, its offset, size, row
+                count, totals, date range and per-category sums
+
+New pages and directories are only ever written past the data the
+current directory refers to, and a flush commits them by rewriting the
+directory pointer in the header last. A process that dies between
+flushes leaves the file as it was at the last flush. Each flush leaves
+the previous directory, and a reopened partial page, behind as unused
+space.
+
+Every page but the last is full, so row ``i`` lives in page
+``i // page_size``. Pages are decoded on demand through a bounded LRU
+cache, so iterating or indexing holds at most ``cache_pages`` pages in
+memory. Totals, category summaries and date-range sums over whole pages
+come from the directory without reading any rows.
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from itertools import chain
+
+from .expense import Expense
+from .money import DEFAULT_SCALE
+from .storage import ExpenseStorage
+from .utils import NO_DATE, date_to_key, key_to_date
+
+MAGIC = b"PYBPAGED"
+VERSION = 2
+
+DEFAULT_PAGE_SIZE = 4096
+DEFAULT_CACHE_PAGES = 32
+
+_HEADER = struct.Struct("<8sHHHxxIQQ")
+_PAGE_HEADER = struct.Struct("<II")
+_BYTE_ORDERS = {"little": 0, "big": 1}
+
+
+def _pack_strings(strings) -> bytes:
+    encoded = [string.encode("utf-8") for string in strings]
+    return array("I", map(len, encoded)).tobytes() + b"".join(encoded)
+
+
+def _unpack_strings(data, offset: int, count: int):
+    lengths = array("I")
+    lengths.frombytes(data[offset : offset + 4 * count])
+    position = offset + 4 * count
+    strings = []
+    for length in lengths:
+        strings.append(str(data[position : position + length], "utf-8"))
+        position += length
+    return strings, position
+
+
+class _Page:
+    """
+    The decoded columns of one page.
+    """
+
+    __slots__ = ("descriptions", "amounts", "categories", "keys")
+
+    def __init__(self, descriptions, amounts, categories, keys):
+        self.descriptions = descriptions
+        self.amounts = amounts
+        self.categories = categories
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def expense(self, row: int, scale: int) -> Expense:
+        return Expense.from_minor(
+            self.descriptions[row],
+            self.amounts[row],
+            self.categories[row],
+            key_to_date(self.keys[row]),
+            scale,
+        )
+
+    def encode(self) -> bytes:
+        table = list(dict.fromkeys(self.categories))
+        lookup = {category: code for code, category in enumerate(table)}
+        return b"".join(
+            [
+                _PAGE_HEADER.pack(len(self.amounts), len(table)),
+                array("q", self.amounts).tobytes(),
+                array("i", self.keys).tobytes(),
+                array("I", map(lookup.__getitem__, self.categories)).tobytes(),
+                _pack_strings(table),
+                _pack_strings(self.descriptions),
+            ]
+        )
+
+    @classmethod
+    def decode(cls, data: bytes) -> "_Page":
+        rows, n_categories = _PAGE_HEADER.unpack_from(data)
+        position = _PAGE_HEADER.size
+        columns = []
+        for typecode, size in (("q", 8), ("i", 4), ("I", 4)):
+            column = array(typecode)
+            column.frombytes(data[position : position + size * rows])
+            columns.append(column)
+            position += size * rows
+        amounts, keys, codes = columns
+        table, position = _unpack_strings(data, position, n_categories)
+        descriptions, _ = _unpack_strings(data, position, rows)
+        return cls(descriptions, amounts, [table[code] for code in codes], keys)
+
+    def summary(self) -> dict:
+        categories = {}
+        dated_total = dated_count = 0
+        first = last = None
+        for category, key, amount in zip(self.categories, self.keys, self.amounts):
+            entry = categories.get(category)
+            if entry is None:
+                categories[category] = [amount, 1, amount, amount]
+            else:
+                entry[0] += amount
+                entry[1] += 1
+                entry[2] = min(entry[2], amount)
+                entry[3] = max(entry[3], amount)
+            if key != NO_DATE:
+                dated_total += amount
+                dated_count += 1
+                first = key if first is None else min(first, key)
+                last = key if last is None else max(last, key)
+        return {
+            "rows": len(self.amounts),
+            "total": sum(self.amounts),
+            "dated_total": dated_total,
+            "dated_count": dated_count,
+            "first": first,
+            "last": last,
+            "categories": categories,
+        }
+
+
+class PagedStorage(ExpenseStorage):
+    """
+    Storage backend keeping expenses in fixed-size pages of a disk file.
+
+    Appended expenses collect in an in-memory tail page that is written
+    once full, or on flush. Only the page directory and at most
+    ``cache_pages`` decoded pages are held in memory.
+
+    Attributes:
+        path (str): The path of the paged ledger file.
+        page_size (int): The number of rows per page.
+        cache_pages (int): The maximum number of decoded pages cached.
+        hits (int): The number of page lookups answered from the cache.
+        misses (int): The number of pages read from disk.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cache_pages: int = DEFAULT_CACHE_PAGES,
+        scale: int = None,
+    ):
+        """
+        Initialize a PagedStorage instance, creating the file if needed.
+
+        Args:
+            path (str): The path of the paged ledger file.
+            page_size (int): The number of rows per page of a new file.
+            cache_pages (int): The maximum number of decoded pages cached.
+            scale (int, optional): The number of decimal places of the
+                amounts. A new file records it; an existing one must match.
+
+        Raises:
+            ValueError: If the file is not a paged ledger written on this
+                platform, or its scale does not match.
+        """
+        self.path = path
+        self.cache_pages = max(1, cache_pages)
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._tail = _Page([], array("q"), [], array("i"))
+        self._tail_written = False
+        if os.path.exists(path) and os.path.getsize(path):
+            self._fp = open(path, "r+b")
+            try:
+                self._read_directory(scale)
+            except ValueError:
+                self._fp.close()
+                raise
+        else:
+            self._fp = open(path, "w+b")
+            self.scale = DEFAULT_SCALE if scale is None else scale
+            self.page_size = page_size
+            self._pages = []
+            self._meta = {}
+            self._data_end = _HEADER.size
+            self._write_directory()
+        self._stored = sum(page["rows"] for page in self._pages)
+        if self._pages and self._pages[-1]["rows"] < self.page_size:
+            # Continue filling a partly written last page.
+            self._tail = self._read_page(len(self._pages) - 1)
+            self._tail_written = True
+
+    def _read_directory(self, scale):
+        header = self._fp.read(_HEADER.size)
+        try:
+            magic, version, byte_order, stored_scale, page_size, offset, size = _HEADER.unpack(
+                header
+            )
+        except struct.error:
+            raise ValueError(f"{self.path} is not a paged ledger file") from None
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} paged ledger file")
+        if byte_order != _BYTE_ORDERS[sys.byteorder]:
+            raise ValueError(f"{self.path} was written with a different byte order")
+        if scale is not None and scale != stored_scale:
+            raise ValueError(f"{self.path} stores amounts with scale {stored_scale}, not {scale}")
+        self.scale = stored_scale
+        self.page_size = page_size
+        self._fp.seek(offset)
+        data = self._fp.read(size)
+        if len(data) != size:
+            raise ValueError(f"{self.path} is truncated; its page directory is missing")
+        directory = json.loads(data)
+        self._pages = directory["pages"]
+        self._meta = directory["meta"]
+        # Anything past the committed directory is left over from a process
+        # that stopped before its next flush; new data overwrites it.
+        self._data_end = offset + size
+        self._dirty = False
+
+    def _write_directory(self):
+        # Write the directory past all committed data, make it durable, then
+        # point the header at it; until then the old directory stays valid.
+        directory = json.dumps({"meta": self._meta, "pages": self._pages}).encode("utf-8")
+        offset = self._data_end
+        self._fp.seek(offset)
+        self._fp.write(directory)
+        self._fp.truncate()
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._fp.seek(0)
+        self._fp.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                _BYTE_ORDERS[sys.byteorder],
+                self.scale,
+                self.page_size,
+                offset,
+                len(directory),
+            )
+        )
+        self._fp.flush()
+        self._data_end = offset + len(directory)
+        self._dirty = False
+
+    def _write_page(self, page: _Page):
+        data = page.encode()
+        entry = page.summary()
+        entry["offset"] = self._data_end
+        entry["size"] = len(data)
+        self._fp.seek(self._data_end)
+        self._fp.write(data)
+        self._data_end += len(data)
+        self._pages.append(entry)
+        self._stored += len(page)
+        self._dirty = True
+
+    def _read_page(self, number: int) -> _Page:
+        entry = self._pages[number]
+        self._fp.seek(entry["offset"])
+        return _Page.decode(self._fp.read(entry["size"]))
+
+    def _page(self, number: int) -> _Page:
+        if number == len(self._pages) - 1 and self._tail_written:
+            return self._tail
+        page = self._cache.get(number)
+        if page is not None:
+            self.hits += 1
+            self._cache.move_to_end(number)
+            return page
+        self.misses += 1
+        page = self._cache[number] = self._read_page(number)
+        if len(self._cache) > self.cache_pages:
+            self._cache.popitem(last=False)
+        return page
+
+    def _pages_in_order(self):
+        # Stored pages followed by the unwritten tail.
+        for number in range(len(self._pages)):
+            yield self._page(number)
+        if self._tail and not self._tail_written:
+            yield self._tail
+
+    def __len__(self):
+        return self._stored + (0 if self._tail_written else len(self._tail))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("expense index out of range")
+        number, row = divmod(index, self.page_size)
+        page = self._page(number) if number < len(self._pages) else self._tail
+        return page.expense(row, self.scale)
+
+    def __iter__(self):
+        scale = self.scale
+        for page in self._pages_in_order():
+            for row in range(len(page)):
+                yield page.expense(row, scale)
+
+    def __repr__(self):
+        return f"PagedStorage({self.path!r}, rows={len(self)}, pages={len(self._pages)})"
+
+    def _reopen_tail(self):
+        # The partly filled last page is being appended to again. Its new
+        # version goes at the end of the file, so the copy the committed
+        # directory points at stays intact until the next flush.
+        if self._tail_written:
+            entry = self._pages.pop()
+            self._stored -= entry["rows"]
+            self._tail_written = False
+            self._dirty = True
+
+    def append(self, expense):
+        self.extend_columns(
+            [expense.description], [expense.amount_minor], [expense.category], [expense.date]
+        )
+
+    def extend_columns(self, descriptions, amounts, categories, dates=None):
+        self._reopen_tail()
+        keys = [NO_DATE] * len(amounts) if dates is None else list(map(date_to_key, dates))
+        tail = self._tail
+        start = 0
+        while start < len(amounts):
+            stop = start + self.page_size - len(tail)
+            tail.descriptions.extend(descriptions[start:stop])
+            tail.amounts.extend(amounts[start:stop])
+            tail.categories.extend(categories[start:stop])
+            tail.keys.extend(keys[start:stop])
+            start = stop
+            if len(tail) == self.page_size:
+                self._write_page(tail)
+                tail = self._tail = _Page([], array("q"), [], array("i"))
+
+    def flush(self):
+        """
+        Write the tail page and the page directory to disk.
+        """
+        if self._tail and not self._tail_written:
+            self._write_page(self._tail)
+            self._tail_written = True
+        if self._dirty:
+            self._write_directory()
+
+    def close(self):
+        """
+        Flush the storage and close the file.
+        """
+        if not self._fp.closed:
+            self.flush()
+            self._fp.close()
+
+    def get_meta(self, key: str, default=None):
+        """
+        Read a stored budget attribute.
+
+        Args:
+            key (str): The attribute name.
+            default: The value returned if the attribute is not stored.
+
+        Returns:
+            The stored value, or the default.
+        """
+        return self._meta.get(key, default)
+
+    def set_meta(self, key: str, value):
+        """
+        Store a budget attribute, written with the page directory.
+
+        Args:
+            key (str): The attribute name.
+            value: A JSON-serializable value to store.
+        """
+        self._meta[key] = value
+        self._dirty = True
+
+    def _summaries(self):
+        summaries = list(self._pages)
+        if self._tail and not self._tail_written:
+            summaries.append(self._tail.summary())
+        return summaries
+
+    def total(self) -> int:
+        return sum(summary["total"] for summary in self._summaries())
+
+    def category_summaries(self) -> dict:
+        summaries = {}
+        for summary in self._summaries():
+            for category, (total, count, _, _) in summary["categories"].items():
+                entry = summaries.get(category, (0, 0))
+                summaries[category] = (entry[0] + total, entry[1] + count)
+        return summaries
+
+    def category_stats(self) -> dict:
+        stats = {}
+        for summary in self._summaries():
+            for category, (total, count, low, high) in summary["categories"].items():
+                entry = stats.get(category)
+                if entry is None:
+                    stats[category] = (count, total, low, high)
+                else:
+                    stats[category] = (
+                        entry[0] + count,
+                        entry[1] + total,
+                        min(entry[2], low),
+                        max(entry[3], high),
+                    )
+        return stats
+
+    def iter_columns(self):
+        for page in self._pages_in_order():
+            yield from zip(page.categories, page.keys, page.amounts)
+
+    def iter_descriptions(self):
+        return chain.from_iterable(page.descriptions for page in self._pages_in_order())
+
+    def dated_rows(self):
+        row = 0
+        for page in self._pages_in_order():
+            for key, amount in zip(page.keys, page.amounts):
+                if key != NO_DATE:
+                    yield row, key, amount
+                row += 1
+
+    def time_index(self):
+        return PagedTimeIndex(self)
+
+    def category_index(self):
+        return PagedCategoryIndex(self)
+
+
+class PagedTimeIndex:
+    """
+    A time index for PagedStorage that answers range queries page by page.
+
+    Pages whose whole date range lies inside the query contribute their
+    stored sums and counts; only pages straddling a bound are read.
+    """
+
+    def __init__(self, storage: PagedStorage):
+        """
+        Initialize a PagedTimeIndex instance.
+
+        Args:
+            storage (PagedStorage): The storage to query.
+        """
+        self._storage = storage
+
+    def __len__(self):
+        return self.count_between()
+
+    def add(self, row: int, key: int, amount: int):
+        """
+        Record a new dated expense; the storage's page summaries cover it.
+        """
+
+    def extend(self, entries):
+        """
+        Record several new dated expenses; the storage's page summaries cover them.
+        """
+
+    def _scan(self, start, end):
+        # Yield (page, summary, None) for pages wholly inside the range and
+        # (page, None, matching (key, row, amount) entries) for the others.
+        lo = -1 if start is None else date_to_key(start)
+        hi = 2**31 if end is None else date_to_key(end)
+        storage = self._storage
+        for number, summary in enumerate(storage._summaries()):
+            if summary["first"] is None or summary["last"] < lo or summary["first"] > hi:
+                continue
+            if lo <= summary["first"] and summary["last"] <= hi:
+                yield number, summary, None
+                continue
+            page = storage._tail if number >= len(storage._pages) else storage._page(number)
+            yield number, None, [
+                (key, row, amount)
+                for row, (key, amount) in enumerate(zip(page.keys, page.amounts))
+                if key != NO_DATE and lo <= key <= hi
+            ]
+
+    def sum_between(self, start=None, end=None) -> int:
+        total = 0
+        for _, summary, entries in self._scan(start, end):
+            total += summary["dated_total"] if entries is None else sum(e[2] for e in entries)
+        return total
+
+    def count_between(self, start=None, end=None) -> int:
+        count = 0
+        for _, summary, entries in self._scan(start, end):
+            count += summary["dated_count"] if entries is None else len(entries)
+        return count
+
+    def rows_between(self, start=None, end=None):
+        storage = self._storage
+        found = []
+        for number, summary, entries in self._scan(start, end):
+            first_row = number * storage.page_size
+            if entries is None:
+                page = storage._tail if number >= len(storage._pages) else storage._page(number)
+                entries = [(key, row) for row, key in enumerate(page.keys) if key != NO_DATE]
+            found.extend((key, first_row + row) for key, row, *_ in entries)
+        found.sort()
+        return [row for _, row in found]
+
+
+class PagedCategoryIndex:
+    """
+    A category index for PagedStorage that reads only the relevant pages.
+
+    The page directory records the categories of each page, so a lookup
+    skips every page without the category and the budget keeps no
+    per-row category data in memory.
+    """
+
+    def __init__(self, storage: PagedStorage):
+        """
+        Initialize a PagedCategoryIndex instance.
+
+        Args:
+            storage (PagedStorage): The storage to query.
+        """
+        self._storage = storage
+
+    def add(self, row: int, category: str):
+        """
+        Record a new expense; the storage's page summaries cover it.
+        """
+
+    def extend(self, first_row: int, categories):
+        """
+        Record several new expenses; the storage's page summaries cover them.
+        """
+
+    def rows(self, category: str):
+        """
+        Return the row numbers of the expenses in a category.
+
+        Args:
+            category (str): The category to look up.
+
+        Returns:
+            array: The row numbers in insertion order.
+        """
+        storage = self._storage
+        found = array("L")
+        for number, summary in enumerate(storage._summaries()):
+            if category not in summary["categories"]:
+                continue
+            page = storage._tail if number >= len(storage._pages) else storage._page(number)
+            first_row = number * storage.page_size
+            found.extend(
+                first_row + row for row, name in enumerate(page.categories) if name == category
+            )
+        return found
@@ -0,0 +1,442 @@
+# pybudget/portfolio.py
+
+"""
+Portfolio module for managing many budgets in shared columnar arrays.
+"""
+
+import operator
+from array import array
+from collections.abc import Sequence
+
+from .money import DEFAULT_SCALE, Money, factor, to_minor
+from .sketches import QUANTILES, AmountSummary, group_summaries, merge_summaries
+from .storage import ColumnarStorage
+from .utils import first_invalid_amount, validate_amount, validate_amounts
+
+
+class BudgetPortfolio:
+    """
+    A collection of budgets stored in shared columnar arrays.
+
+    Allocations and spent totals are kept in one array per figure, indexed
+    by budget id, and every expense lives in a single shared ColumnarStorage
+    with an owner column. Remaining amounts, overspend flags and rollups for
+    all budgets are therefore computed in one pass over flat arrays instead
+    of one Python loop per budget. The figures are int64 minor units, so
+    the arithmetic is exact.
+
+    Attributes:
+        names (list): The budget names, indexed by budget id.
+        allocations (array): The amount allocated to each budget, in minor units.
+        spent (array): The running total of expenses for each budget, in minor units.
+        owners (array): The budget id of each row in ``expenses``.
+        expenses (ColumnarStorage): The expenses of every budget.
+        scale (int): The number of decimal places of the currency.
+    """
+
+    def __init__(self, scale: int = DEFAULT_SCALE):
+        """
+        Initialize an empty BudgetPortfolio.
+
+        Args:
+            scale (int): The number of decimal places of the currency.
+        """
+        self.scale = scale
+        self.names = []
+        self.allocations = array("q")
+        self.spent = array("q")
+        self.owners = array("I")
+        self.expenses = ColumnarStorage(scale=scale)
+        self._ids = {}
+        self._rows = []
+        self._summaries = None
+
+    @classmethod
+    def from_budgets(cls, budgets):
+        """
+        Build a portfolio from existing Budget objects.
+
+        Args:
+            budgets (iterable): The budgets to copy into the portfolio.
+
+        Returns:
+            BudgetPortfolio: A portfolio holding a copy of each budget.
+        """
+        budgets = list(budgets)
+        portfolio = cls(budgets[0].scale if budgets else DEFAULT_SCALE)
+        for budget in budgets:
+            portfolio.add_budget(budget.name, budget.money)
+            portfolio.add_expenses(budget.name, budget.expenses)
+        return portfolio
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __iter__(self):
+        for budget_id in range(len(self.names)):
+            yield PortfolioBudget(self, budget_id)
+
+    def __getitem__(self, name):
+        """
+        Return a view of one budget that works with generate_report.
+
+        Args:
+            name (str): The name of the budget.
+
+        Returns:
+            PortfolioBudget: A view of the budget.
+        """
+        return PortfolioBudget(self, self._id(name))
+
+    def _id(self, name) -> int:
+        try:
+            return self._ids[name]
+        except KeyError:
+            raise KeyError(f"No budget named {name!r} in the portfolio") from None
+
+    def add_budget(self, name: str, amount):
+        """
+        Add a new, empty budget to the portfolio.
+
+        Args:
+            name (str): The name of the budget.
+            amount: The total amount allocated for the budget, as a float,
+                int, Decimal or Money.
+
+        Returns:
+            PortfolioBudget: A view of the new budget.
+
+        Raises:
+            ValueError: If a budget with the same name already exists.
+        """
+        if name in self._ids:
+            raise ValueError(f"A budget named {name!r} already exists")
+        allocation = to_minor(amount, self.scale)
+        budget_id = len(self.names)
+        self._ids[name] = budget_id
+        self.names.append(name)
+        self.allocations.append(allocation)
+        self.spent.append(0)
+        self._rows.append(array("L"))
+        return PortfolioBudget(self, budget_id)
+
+    def add_expense(self, name: str, expense):
+        """
+        Add an expense to one budget.
+
+        Args:
+            name (str): The name of the budget.
+            expense: An Expense object to add.
+
+        Raises:
+            KeyError: If the budget name is not in the portfolio.
+            ValueError: If the amount is not positive or the expense uses a
+                different currency scale.
+        """
+        budget_id = self._id(name)
+        if expense.scale != self.scale:
+            raise ValueError(
+                f"Expense scale {expense.scale} does not match portfolio scale {self.scale}"
+            )
+        if not validate_amount(expense.amount_minor):
+            raise ValueError(f"Invalid expense amount: {expense.amount!r}")
+        self._rows[budget_id].append(len(self.expenses))
+        self.owners.append(budget_id)
+        self.expenses.append(expense)
+        self.spent[budget_id] += expense.amount_minor
+        if self._summaries is not None:
+            summary = self._summaries.get(budget_id)
+            if summary is None:
+                summary = self._summaries[budget_id] = AmountSummary()
+            summary.add(expense.amount_minor)
+
+    def add_expenses(self, name: str, expenses):
+        """
+        Add several expenses to one budget.
+
+        Args:
+            name (str): The name of the budget.
+            expenses (iterable): The Expense objects to add.
+        """
+        for expense in expenses:
+            self.add_expense(name, expense)
+
+    def add_columns(self, names, descriptions, amounts, categories, dates=None):
+        """
+        Add expenses for many budgets given as parallel columns.
+
+        Args:
+            names (sequence): The budget name of each expense.
+            descriptions (sequence): The expense descriptions.
+            amounts (sequence): The expense amounts.
+            categories (sequence): The expense categories.
+            dates (sequence, optional): The expense dates, None for undated.
+
+        Raises:
+            KeyError: If a budget name is not in the portfolio.
+            ValueError: If the columns differ in length or any amount is not positive.
+        """
+        if not len(names) == len(descriptions) == len(amounts) == len(categories):
+            raise ValueError("Expense columns must have the same length")
+        if dates is not None and len(dates) != len(amounts):
+            raise ValueError("Expense columns must have the same length")
+        scale = self.scale
+        minor = [to_minor(amount, scale) for amount in amounts]
+        if not validate_amounts(minor):
+            index = first_invalid_amount(minor)
+            raise ValueError(f"Invalid expense amount at position {index}: {amounts[index]!r}")
+        ids = [self._id(name) for name in names]
+        first_row = len(self.expenses)
+        self.expenses.extend_columns(descriptions, minor, categories, dates)
+        self.owners.extend(ids)
+        spent = self.spent
+        rows = self._rows
+        for row, (budget_id, amount) in enumerate(zip(ids, minor), start=first_row):
+            spent[budget_id] += amount
+            rows[budget_id].append(row)
+        if self._summaries is not None:
+            group_summaries(zip(ids, minor), self._summaries)
+
+    def remaining_minor(self) -> array:
+        """
+        Compute the exact remaining amount of every budget in one pass.
+
+        Returns:
+            array: The remaining amount for each budget id, in minor units.
+        """
+        return array("q", map(operator.sub, self.allocations, self.spent))
+
+    def remaining_amounts(self) -> array:
+        """
+        Compute the remaining amount of every budget in one pass.
+
+        Returns:
+            array: The remaining amount for each budget id, in major units.
+        """
+        f = factor(self.scale)
+        return array("d", (remaining / f for remaining in self.remaining_minor()))
+
+    def overspent(self) -> list:
+        """
+        Return the names of the budgets whose expenses exceed their allocation.
+
+        Returns:
+            list: The overspent budget names, in budget id order.
+        """
+        return [
+            name
+            for name, over in zip(self.names, map(operator.gt, self.spent, self.allocations))
+            if over
+        ]
+
+    def rollup(self, key=None) -> dict:
+        """
+        Aggregate allocations and spending across groups of budgets.
+
+        Args:
+            key (callable, optional): Maps a budget name to its group, for
+                example its department. None rolls up the whole portfolio.
+
+        Returns:
+            dict: A mapping of group to a dict with "amount", "spent",
+            "remaining" (in major units) and "budgets" (the number of budgets
+            in the group).
+        """
+        groups = {}
+        for name, allocated, spent in zip(self.names, self.allocations, self.spent):
+            group = key(name) if key is not None else None
+            totals = groups.get(group)
+            if totals is None:
+                totals = groups[group] = [0, 0, 0]
+            totals[0] += allocated
+            totals[1] += spent
+            totals[2] += 1
+        f = factor(self.scale)
+        return {
+            group: {
+                "amount": amount / f,
+                "spent": spent / f,
+                "remaining": (amount - spent) / f,
+                "budgets": count,
+            }
+            for group, (amount, spent, count) in groups.items()
+        }
+
+    def _get_summaries(self) -> dict:
+        if self._summaries is None:
+            self._summaries = group_summaries(zip(self.owners, self.expenses.amounts))
+        return self._summaries
+
+    def amount_summary(self, names=None) -> AmountSummary:
+        """
+        Merge the per-budget summaries of expense amounts, in minor units.
+
+        Each budget's summary is built from one scan the first time any is
+        used and maintained as expenses are added, so this costs time in
+        proportion to the number of budgets merged, not expenses.
+
+        Args:
+            names (iterable, optional): The budgets to include; defaults to all.
+
+        Returns:
+            AmountSummary: A new summary of the selected budgets' expenses.
+        """
+        summaries = self._get_summaries()
+        ids = range(len(self.names)) if names is None else map(self._id, names)
+        return merge_summaries(summaries[i] for i in ids if i in summaries)
+
+    def quantiles(self, quantiles=QUANTILES, names=None) -> dict:
+        """
+        Estimate quantiles of expense amounts across budgets.
+
+        Args:
+            quantiles (sequence): The quantiles to estimate, between 0 and 1.
+            names (iterable, optional): The budgets to include; defaults to all.
+
+        Returns:
+            dict: A mapping of quantile to estimated amount, None if there
+            are no expenses.
+        """
+        summary = self.amount_summary(names)
+        f = factor(self.scale)
+        return {
+            q: None if summary.count == 0 else summary.quantile(q) / f for q in quantiles
+        }
+
+    def recompute_spent(self) -> array:
+        """
+        Recompute every budget's spent total from the shared expense columns.
+
+        This is a single pass over all expenses, intended for consistency
+        checks of the running totals.
+
+        Returns:
+            array: The recomputed spent total for each budget id, in minor units.
+        """
+        spent = [0] * len(self.names)
+        for budget_id, amount in zip(self.owners, self.expenses.amounts):
+            spent[budget_id] += amount
+        return array("q", spent)
+
+
+class PortfolioBudget:
+    """
+    A view of one budget inside a BudgetPortfolio.
+
+    Provides the attributes generate_report relies on: ``name``, ``amount``,
+    ``amount_minor``, ``scale``, ``expenses`` and the remaining-amount getters.
+    """
+
+    __slots__ = ("_portfolio", "_id")
+
+    def __init__(self, portfolio: BudgetPortfolio, budget_id: int):
+        """
+        Initialize a PortfolioBudget view.
+
+        Args:
+            portfolio (BudgetPortfolio): The portfolio holding the budget.
+            budget_id (int): The id of the budget within the portfolio.
+        """
+        self._portfolio = portfolio
+        self._id = budget_id
+
+    @property
+    def name(self) -> str:
+        return self._portfolio.names[self._id]
+
+    @property
+    def scale(self) -> int:
+        return self._portfolio.scale
+
+    @property
+    def amount_minor(self) -> int:
+        return self._portfolio.allocations[self._id]
+
+    @property
+    def amount(self) -> float:
+        return self.amount_minor / factor(self.scale)
+
+    @amount.setter
+    def amount(self, value):
+        self._portfolio.allocations[self._id] = to_minor(value, self.scale)
+
+    @property
+    def money(self) -> Money:
+        return Money.from_minor(self.amount_minor, self.scale)
+
+    @property
+    def expenses(self):
+        return _PortfolioExpenses(self._portfolio.expenses, self._portfolio._rows[self._id])
+
+    def add_expense(self, expense):
+        """
+        Add an expense to the budget.
+
+        Args:
+            expense: An Expense object to add.
+        """
+        self._portfolio.add_expense(self.name, expense)
+
+    def get_amount_summary(self) -> AmountSummary:
+        """
+        Return the streaming summary of the budget's expense amounts.
+
+        Returns:
+            AmountSummary: The summary, in minor units; treat it as read-only.
+        """
+        return self._portfolio._get_summaries().get(self._id) or AmountSummary()
+
+    def get_total_expenses(self) -> float:
+        """
+        Return the sum of all expenses in the budget.
+
+        Returns:
+            float: The total amount of all expenses.
+        """
+        return self._portfolio.spent[self._id] / factor(self.scale)
+
+    def get_remaining_amount(self) -> float:
+        """
+        Calculate the remaining amount in the budget.
+
+        Returns:
+            float: The remaining amount in the budget.
+        """
+        return self.get_remaining_minor() / factor(self.scale)
+
+    def get_remaining_minor(self) -> int:
+        """
+        Calculate the exact remaining amount in the budget.
+
+        Returns:
+            int: The remaining amount in minor units.
+        """
+        return self._portfolio.allocations[self._id] - self._portfolio.spent[self._id]
+
+    def __str__(self):
+        return (
+            f"Budget(name='{self.name}', amount={self.amount}, "
+            f"remaining={self.get_remaining_amount()})"
+        )
+
+
+class _PortfolioExpenses(Sequence):
+    def __init__(self, storage, rows):
+        self._storage = storage
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._storage[row] for row in self._rows[index]]
+        return self._storage[self._rows[index]]
+
+    def __iter__(self):
+        storage = self._storage
+        for row in self._rows:
+            yield storage[row]
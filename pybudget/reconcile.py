@@ -0,0 +1,269 @@
+# pybudget/reconcile.py
+
+"""
+Reconciliation of budget expenses against bank statement lines.
+
+Both sides are reduced to integer columns (minor-unit amounts and date
+keys) and joined through hash indexes instead of compared pairwise. Rows
+with identical keys are paired first in one exact hash join. When an
+amount tolerance or a date window is allowed, the leftover statement lines
+are then bucketed by amount and date in buckets one tolerance (or window)
+wide, so each leftover expense only inspects its own and the neighbouring
+buckets. A pair is matched when each row is the other's only candidate;
+rows with several candidates are reported as ambiguous rather than guessed.
+"""
+
+from array import array
+from itertools import product
+
+from .indexes import tokenize
+from .money import to_minor
+from .storage import ExpenseStorage, as_storage
+from .utils import NO_DATE, date_to_key
+
+
+class Reconciliation:
+    """
+    The outcome of reconciling expenses against a statement.
+
+    Rows are positions in the two sequences that were reconciled.
+
+    Attributes:
+        matched (list): (expense row, statement row) pairs.
+        ambiguous (list): (expense row, statement rows) pairs for expenses
+            with more than one possible statement line, or whose only line
+            is also claimed by another expense.
+        unmatched_expenses (list): Expense rows with no statement line.
+        unmatched_statement (list): Statement rows with no expense.
+    """
+
+    def __init__(self, matched, ambiguous, unmatched_expenses, unmatched_statement):
+        """
+        Initialize a Reconciliation instance.
+
+        Args:
+            matched (list): (expense row, statement row) pairs.
+            ambiguous (list): (expense row, statement rows) pairs.
+            unmatched_expenses (list): Expense rows with no statement line.
+            unmatched_statement (list): Statement rows with no expense.
+        """
+        self.matched = matched
+        self.ambiguous = ambiguous
+        self.unmatched_expenses = unmatched_expenses
+        self.unmatched_statement = unmatched_statement
+
+    @property
+    def is_reconciled(self) -> bool:
+        """
+        Whether every expense and statement line was matched.
+        """
+        return not (self.ambiguous or self.unmatched_expenses or self.unmatched_statement)
+
+    def __repr__(self):
+        return (
+            f"Reconciliation(matched={len(self.matched)}, ambiguous={len(self.ambiguous)}, "
+            f"unmatched_expenses={len(self.unmatched_expenses)}, "
+            f"unmatched_statement={len(self.unmatched_statement)})"
+        )
+
+
+def normalize_description(description: str) -> str:
+    """
+    Normalize a description for matching: casefolded words, single-spaced.
+
+    Args:
+        description (str): The description to normalize.
+
+    Returns:
+        str: The normalized description.
+    """
+    return " ".join(tokenize(description))
+
+
+def _columns(source, descriptions: bool):
+    # Return (scale, amounts, date keys, normalized descriptions or None).
+    expenses = as_storage(getattr(source, "expenses", source))
+    texts = None
+    if isinstance(expenses, ExpenseStorage):
+        columns = list(expenses.iter_columns())
+        amounts = [amount for _, _, amount in columns]
+        keys = array("i", [key for _, key, _ in columns])
+        if descriptions:
+            texts = list(map(normalize_description, expenses.iter_descriptions()))
+        return expenses.scale, amounts, keys, texts
+    scale = expenses[0].scale if len(expenses) else None
+    amounts = [expense.amount_minor for expense in expenses]
+    keys = array("i", [date_to_key(expense.date) for expense in expenses])
+    if descriptions:
+        texts = [normalize_description(expense.description) for expense in expenses]
+    return scale, amounts, keys, texts
+
+
+def _exact_join(expense_keys, statement_keys):
+    # Pair rows with equal keys in row order; return the pairs and leftovers.
+    index = {}
+    for row in reversed(range(len(statement_keys))):
+        key = statement_keys[row]
+        found = index.get(key)
+        if found is None:
+            index[key] = row
+        elif type(found) is int:
+            index[key] = [found, row]
+        else:
+            found.append(row)
+    matched = []
+    leftover = []
+    for row, key in enumerate(expense_keys):
+        found = index.get(key)
+        if found is None:
+            leftover.append(row)
+        elif type(found) is int:
+            del index[key]
+            matched.append((row, found))
+        else:
+            matched.append((row, found.pop()))
+            if not found:
+                del index[key]
+    remaining = []
+    for found in index.values():
+        if type(found) is int:
+            remaining.append(found)
+        else:
+            remaining.extend(found)
+    remaining.sort()
+    return matched, leftover, remaining
+
+
+def reconcile(
+    expenses,
+    statement,
+    amount_tolerance=0,
+    date_window: int = 0,
+    match_descriptions: bool = False,
+) -> Reconciliation:
+    """
+    Reconcile expenses against bank statement lines.
+
+    An expense and a statement line can match when their amounts differ by
+    at most ``amount_tolerance`` and their dates by at most ``date_window``
+    days. Undated rows only match undated rows. Each row matches at most
+    one row on the other side.
+
+    Args:
+        expenses: A Budget, expense storage or sequence of expenses.
+        statement: The statement lines, as a Budget, expense storage or
+            sequence of expenses.
+        amount_tolerance: The largest allowed amount difference, in major
+            units.
+        date_window (int): The largest allowed date difference, in days.
+        match_descriptions (bool): Also require equal descriptions, compared
+            casefolded and ignoring punctuation and spacing.
+
+    Returns:
+        Reconciliation: The matched, ambiguous and unmatched rows.
+
+    Raises:
+        ValueError: If the tolerance or window is negative, or the two sides
+            use different currency scales.
+    """
+    if date_window < 0:
+        raise ValueError(f"Invalid date window: {date_window!r}")
+    expense_scale, amounts, keys, texts = _columns(expenses, match_descriptions)
+    statement_scale, statement_amounts, statement_keys, statement_texts = _columns(
+        statement, match_descriptions
+    )
+    if None not in (expense_scale, statement_scale) and expense_scale != statement_scale:
+        raise ValueError(
+            f"Cannot reconcile amounts with scale {expense_scale} against scale {statement_scale}"
+        )
+    tolerance = to_minor(amount_tolerance, expense_scale or statement_scale or 2)
+    if tolerance < 0:
+        raise ValueError(f"Invalid amount tolerance: {amount_tolerance!r}")
+
+    def join_keys(amounts, keys, texts):
+        if texts is None:
+            return list(zip(amounts, keys))
+        return list(zip(amounts, keys, texts))
+
+    matched, leftover, remaining = _exact_join(
+        join_keys(amounts, keys, texts),
+        join_keys(statement_amounts, statement_keys, statement_texts),
+    )
+    ambiguous = []
+    if (tolerance or date_window) and leftover and remaining:
+        fuzzy, ambiguous, leftover, remaining = _window_join(
+            leftover,
+            remaining,
+            (amounts, keys, texts),
+            (statement_amounts, statement_keys, statement_texts),
+            tolerance,
+            date_window,
+        )
+        matched.extend(fuzzy)
+        matched.sort()
+    return Reconciliation(matched, ambiguous, leftover, remaining)
+
+
+def _window_join(rows, statement_rows, columns, statement_columns, tolerance, window):
+    amounts, keys, texts = columns
+    statement_amounts, statement_keys, statement_texts = statement_columns
+    amount_width = tolerance + 1
+    date_width = window + 1
+
+    def bucket(amount, key, text):
+        return amount // amount_width, None if key == NO_DATE else key // date_width, text
+
+    buckets = {}
+    for row in statement_rows:
+        text = statement_texts[row] if statement_texts is not None else None
+        key = bucket(statement_amounts[row], statement_keys[row], text)
+        buckets.setdefault(key, []).append(row)
+
+    amount_steps = (-1, 0, 1) if tolerance else (0,)
+    date_steps = (-1, 0, 1) if window else (0,)
+    candidates = {}
+    for row in rows:
+        amount, key = amounts[row], keys[row]
+        text = texts[row] if texts is not None else None
+        amount_bucket, date_bucket, _ = bucket(amount, key, text)
+        found = []
+        for amount_step, date_step in product(amount_steps, date_steps):
+            if date_bucket is None and date_step:
+                continue
+            day = None if date_bucket is None else date_bucket + date_step
+            for other in buckets.get((amount_bucket + amount_step, day, text), ()):
+                if abs(statement_amounts[other] - amount) > tolerance:
+                    continue
+                if key != NO_DATE and abs(statement_keys[other] - key) > window:
+                    continue
+                found.append(other)
+        candidates[row] = found
+
+    # Match rows that are each other's only candidate; each match can leave
+    # another row with a single candidate, so repeat until nothing changes.
+    matched = []
+    taken = set()
+    pending = [row for row in rows if candidates[row]]
+    while pending:
+        claims = {}
+        for row in pending:
+            found = candidates[row] = [other for other in candidates[row] if other not in taken]
+            for other in found:
+                claims[other] = claims.get(other, 0) + 1
+        still_pending = []
+        for row in pending:
+            found = candidates[row]
+            if len(found) == 1 and claims[found[0]] == 1:
+                matched.append((row, found[0]))
+                taken.add(found[0])
+            elif found:
+                still_pending.append(row)
+        if len(still_pending) == len(pending):
+            break
+        pending = still_pending
+
+    ambiguous = [(row, sorted(candidates[row])) for row in pending]
+    claimed = taken.union(*(found for _, found in ambiguous))
+    unmatched = [row for row in rows if not candidates[row]]
+    unmatched_statement = [row for row in statement_rows if row not in claimed]
+    return matched, ambiguous, unmatched, unmatched_statement
@@ -0,0 +1,250 @@
+# pybudget/recurring.py
+
+"""
+Recurring expenses, such as rent and subscriptions, kept as schedules.
+
+A schedule is never materialized into rows. Its occurrences are produced
+lazily by generators, and the number of occurrences in a date range is
+found in closed form from the first and last occurrence index inside the
+range, so totalling a schedule over any range costs O(1) however many
+years it spans.
+"""
+
+import calendar
+import datetime
+
+from .expense import Expense
+from .money import DEFAULT_SCALE, Money, factor, to_minor
+
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly")
+
+_DAYS = {"daily": 1, "weekly": 7}
+_MONTHS = {"monthly": 1, "yearly": 12}
+
+
+def _month_index(date) -> int:
+    return date.year * 12 + date.month - 1
+
+
+class RecurringExpense:
+    """
+    An expense that repeats on a fixed schedule.
+
+    Monthly and yearly schedules keep the day of the month of their start
+    date, falling back to the last day of shorter months: a schedule
+    starting on January 31 occurs on February 28 (or 29) and March 31.
+
+    Attributes:
+        description (str): A description of the expense.
+        amount (float): The amount of each occurrence.
+        amount_minor (int): The amount of each occurrence in minor units.
+        scale (int): The number of decimal places of the currency.
+        category (str): The category of the expense.
+        start (datetime.date): The date of the first occurrence.
+        end (datetime.date): The last day an occurrence may fall on, or
+            None for a schedule without end.
+        frequency (str): "daily", "weekly", "monthly" or "yearly".
+        interval (int): The number of frequency units between occurrences.
+    """
+
+    def __init__(
+        self,
+        description: str,
+        amount,
+        category: str,
+        start,
+        frequency: str = "monthly",
+        interval: int = 1,
+        end=None,
+        scale: int = None,
+    ):
+        """
+        Initialize a RecurringExpense.
+
+        Args:
+            description (str): A description of the expense.
+            amount: The amount of each occurrence, as a float, int, Decimal
+                or Money.
+            category (str): The category of the expense.
+            start (datetime.date): The date of the first occurrence.
+            frequency (str): "daily", "weekly", "monthly" or "yearly".
+            interval (int): The number of frequency units between
+                occurrences, e.g. 2 with "weekly" for every other week.
+            end (datetime.date, optional): The last day an occurrence may
+                fall on; None for a schedule without end.
+            scale (int, optional): The number of decimal places of the
+                currency; defaults to the scale of a Money amount, else 2.
+
+        Raises:
+            ValueError: If the amount is not positive, the frequency is
+                unknown, the interval is not a positive integer or the
+                schedule ends before it starts.
+        """
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency {frequency!r}; expected one of {FREQUENCIES}")
+        if not isinstance(interval, int) or interval < 1:
+            raise ValueError(f"Interval must be a positive integer: {interval!r}")
+        if end is not None and end < start:
+            raise ValueError(f"Schedule ends on {end} before it starts on {start}")
+        if scale is None:
+            scale = amount.scale if isinstance(amount, Money) else DEFAULT_SCALE
+        amount_minor = to_minor(amount, scale)
+        if amount_minor <= 0:
+            raise ValueError(f"Invalid recurring amount: {amount!r}")
+        self.description = description
+        self.amount_minor = amount_minor
+        self.scale = scale
+        self.category = category
+        self.start = start
+        self.end = end
+        self.frequency = frequency
+        self.interval = interval
+
+    @property
+    def amount(self) -> float:
+        return self.amount_minor / factor(self.scale)
+
+    def occurrence(self, n: int) -> datetime.date:
+        """
+        Return the date of an occurrence, counting from 0.
+
+        The date is computed directly; the end date is not checked.
+
+        Args:
+            n (int): The number of the occurrence.
+
+        Returns:
+            datetime.date: The date of the occurrence.
+        """
+        if self.frequency in _DAYS:
+            step = _DAYS[self.frequency] * self.interval
+            return datetime.date.fromordinal(self.start.toordinal() + n * step)
+        months = _month_index(self.start) + n * _MONTHS[self.frequency] * self.interval
+        year, month = divmod(months, 12)
+        month += 1
+        day = min(self.start.day, calendar.monthrange(year, month)[1])
+        return datetime.date(year, month, day)
+
+    def _first(self, start) -> int:
+        # The number of the first occurrence on or after start.
+        if start <= self.start:
+            return 0
+        if self.frequency in _DAYS:
+            step = _DAYS[self.frequency] * self.interval
+            return -((self.start.toordinal() - start.toordinal()) // step)
+        step = _MONTHS[self.frequency] * self.interval
+        n = -((_month_index(self.start) - _month_index(start)) // step)
+        return n if self.occurrence(n) >= start else n + 1
+
+    def _last(self, end) -> int:
+        # The number of the last occurrence on or before end, or -1.
+        if end < self.start:
+            return -1
+        if self.frequency in _DAYS:
+            step = _DAYS[self.frequency] * self.interval
+            return (end.toordinal() - self.start.toordinal()) // step
+        step = _MONTHS[self.frequency] * self.interval
+        n = (_month_index(end) - _month_index(self.start)) // step
+        return n if self.occurrence(n) <= end else n - 1
+
+    def _bounds(self, start, end) -> tuple:
+        first = 0 if start is None else self._first(start)
+        if end is None or (self.end is not None and self.end < end):
+            end = self.end
+        return first, None if end is None else self._last(end)
+
+    def count_between(self, start=None, end=None) -> int:
+        """
+        Count the occurrences within a range of days, without enumerating them.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Returns:
+            int: The number of occurrences in the range.
+
+        Raises:
+            ValueError: If neither the range nor the schedule has an end.
+        """
+        first, last = self._bounds(start, end)
+        if last is None:
+            raise ValueError(f"Schedule {self.description!r} has no end; give an end date")
+        return max(last - first + 1, 0)
+
+    def get_total_between(self, start=None, end=None) -> float:
+        """
+        Sum the occurrences within a range of days, without enumerating them.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Returns:
+            float: The total amount of the occurrences in the range.
+
+        Raises:
+            ValueError: If neither the range nor the schedule has an end.
+        """
+        return self.get_total_minor_between(start, end) / factor(self.scale)
+
+    def get_total_minor_between(self, start=None, end=None) -> int:
+        """
+        Sum the occurrences within a range of days, in minor units.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Returns:
+            int: The total amount of the occurrences in the range.
+
+        Raises:
+            ValueError: If neither the range nor the schedule has an end.
+        """
+        return self.count_between(start, end) * self.amount_minor
+
+    def dates(self, start=None, end=None):
+        """
+        Generate the dates of the occurrences within a range of days.
+
+        Without an end for either the range or the schedule the generator
+        never stops.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Yields:
+            datetime.date: The occurrence dates, in order.
+        """
+        n, last = self._bounds(start, end)
+        while last is None or n <= last:
+            yield self.occurrence(n)
+            n += 1
+
+    def iter_expenses(self, start=None, end=None):
+        """
+        Generate the occurrences within a range of days as expenses.
+
+        Args:
+            start (datetime.date, optional): The first day included; None for no lower bound.
+            end (datetime.date, optional): The last day included; None for no upper bound.
+
+        Yields:
+            Expense: One expense per occurrence, in date order.
+        """
+        for date in self.dates(start, end):
+            yield Expense.from_minor(
+                self.description, self.amount_minor, self.category, date, self.scale
+            )
+
+    def __iter__(self):
+        return self.iter_expenses()
+
+    def __repr__(self):
+        every = self.frequency if self.interval == 1 else f"{self.frequency} x{self.interval}"
+        return (
+            f"RecurringExpense({self.description!r}, {self.amount}, {self.category!r}, "
+            f"{every}, start={self.start}, end={self.end})"
+        )
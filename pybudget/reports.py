@@ -4,29 +4,360 @@
 Reports module for generating budget and expense reports.
 """
 
+import csv
+import io
+import json
+import weakref
+from collections import OrderedDict
 
-def generate_report(budget):
+from .money import format_minor, minor_to_str
+from .utils import format_currency
+
+REPORT_FORMATS = ("text", "csv", "jsonl")
+
+CSV_HEADER = ["description", "amount", "category", "date"]
+
+CHUNK_LINES = 1000
+
+DEFAULT_CACHE_SIZE = 128
+
+
+class ReportCache:
+    """
+    A bounded LRU cache of rendered reports.
+
+    Entries are looked up by budget identity and format and are valid for
+    one budget ``version``. When a budget has only gained expenses since
+    its report was cached (its ``rows_version`` is unchanged), the cached
+    expense lines are kept and only the new rows and the header are
+    rendered. Each entry holds one copy of the report text. Budgets
+    without ``versions`` counters are rendered uncached.
+
+    Attributes:
+        maxsize (int): The maximum number of cached reports.
+        hits (int): The number of lookups answered from the cache unchanged.
+        extensions (int): The number of lookups answered by extending a report.
+        misses (int): The number of reports rendered from scratch.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize a ReportCache instance.
+
+        Args:
+            maxsize (int): The maximum number of cached reports.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.extensions = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """
+        Remove every cached report.
+        """
+        self._entries.clear()
+
+    def get(self, budget, fmt: str = "text") -> str:
+        """
+        Return the report for a budget, rendering only what has changed.
+
+        Args:
+            budget: A Budget object to generate the report for.
+            fmt (str): The report format: "text", "csv" or "jsonl".
+
+        Returns:
+            str: The complete report.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported report format: {fmt!r}")
+        # Reading the counters through ``versions`` lets budgets that buffer
+        # writes, such as ConcurrentBudget, bring them up to date first.
+        versions = getattr(budget, "versions", None)
+        if versions is None:
+            self.misses += 1
+            return _render_head(budget, fmt) + _render_body(budget.expenses, fmt)
+        version, rows_version = versions
+
+        key = (id(budget), fmt)
+        entry = self._entries.get(key)
+        if entry is not None and entry.ref() is budget:
+            self._entries.move_to_end(key)
+            if entry.version == version:
+                self.hits += 1
+                return entry.text
+            rows = len(budget.expenses)
+            if entry.rows_version == rows_version and entry.rows <= rows:
+                self.extensions += 1
+                added = budget.expenses[entry.rows : rows]
+                body = _extend_body(entry.body(fmt), entry.rows, added, fmt)
+                entry.store(_render_head(budget, fmt), body, rows, fmt)
+                entry.version = version
+                return entry.text
+
+        self.misses += 1
+        expenses = budget.expenses
+        rows = len(expenses)
+        entry = _CachedReport(weakref.ref(budget, self._discard(key)), version, rows_version)
+        entry.store(_render_head(budget, fmt), _render_rows(expenses, fmt), rows, fmt)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry.text
+
+    def _discard(self, key):
+        entries = weakref.ref(self._entries)
+
+        def discard(ref):
+            live = entries()
+            if live is not None and key in live and live[key].ref is ref:
+                del live[key]
+
+        return discard
+
+
+class _CachedReport:
+    # Only the finished text is kept; the rendered rows are sliced back out
+    # of it after the header when the report is extended.
+    __slots__ = ("ref", "version", "rows_version", "rows", "head_size", "text")
+
+    def __init__(self, ref, version, rows_version):
+        self.ref = ref
+        self.version = version
+        self.rows_version = rows_version
+        self.rows = 0
+        self.head_size = 0
+        self.text = None
+
+    def store(self, head, body, rows, fmt):
+        self.rows = rows
+        self.head_size = len(head)
+        self.text = head + _finish_body(body, rows, fmt)
+
+    def body(self, fmt):
+        if fmt == "text" and not self.rows:
+            return ""
+        return self.text[self.head_size :]
+
+
+report_cache = ReportCache()
+
+
+def generate_report(budget, cache=None):
     """
     Generate a report for a given budget.
 
+    With a cache, reports are memoized in a bounded LRU cache, so asking
+    again for an unchanged budget returns the cached text and a budget that
+    only gained expenses has its report extended rather than rebuilt.
+
     Args:
         budget: A Budget object to generate the report for.
+        cache (ReportCache, optional): The cache to use, such as the
+            module-wide ``report_cache``; None, the default, renders afresh
+            and keeps nothing.
 
     Returns:
         str: A formatted report string.
     """
-    report = []
-    report.append(f"Budget Report for '{budget.name}'")
-    report.append("=" * 40)
-    report.append(f"Total Budget: ${budget.amount:.2f}")
-    report.append(f"Remaining Budget: ${budget.get_remaining_amount():.2f}")
-    report.append("\nExpenses:")
-    report.append("-" * 40)
+    if cache is None:
+        return "".join(iter_report(budget))
+    return cache.get(budget, "text")
 
-    if not budget.expenses:
+
+def generate_category_report(budget):
+    """
+    Generate a per-category breakdown of a budget's expenses.
+
+    The figures come from the budget's incrementally maintained category
+    aggregates, so the report does not rescan the expenses.
+
+    Args:
+        budget: A Budget object to generate the report for.
+
+    Returns:
+        str: A formatted report string, largest categories first.
+    """
+    report = [f"Category Breakdown for '{budget.name}'", "=" * 40]
+    groups = budget.aggregate("category")
+    if not groups:
         report.append("No expenses recorded.")
+    for category, stats in sorted(groups.items(), key=lambda item: -item[1]["sum"]):
+        report.append(
+            f"{category}: {format_currency(stats['sum'])} ({stats['count']} expenses, "
+            f"avg {format_currency(stats['mean'])}, min {format_currency(stats['min'])}, "
+            f"max {format_currency(stats['max'])})"
+        )
+    return "\n".join(report)
+
+
+def write_report(budget, fp, fmt: str = "text"):
+    """
+    Write a report for a budget incrementally to a file-like object.
+
+    Only one chunk of the report is held in memory at a time.
+
+    Args:
+        budget: A Budget object to generate the report for.
+        fp: A writable text file-like object.
+        fmt (str): The report format: "text", "csv" or "jsonl".
+    """
+    for chunk in iter_report(budget, fmt):
+        fp.write(chunk)
+
+
+def iter_report(budget, fmt: str = "text", chunk_lines: int = CHUNK_LINES):
+    """
+    Generate a report for a budget as a stream of text chunks.
+
+    Joining the chunks of a "text" report gives exactly the output of
+    generate_report.
+
+    Args:
+        budget: A Budget object to generate the report for.
+        fmt (str): The report format: "text", "csv" or "jsonl".
+        chunk_lines (int): The number of report lines per chunk.
+
+    Yields:
+        str: Consecutive pieces of the report.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if fmt == "text":
+        return _iter_text_report(budget, chunk_lines)
+    if fmt == "csv":
+        return _iter_csv_report(budget, chunk_lines)
+    if fmt == "jsonl":
+        return _iter_jsonl_report(budget, chunk_lines)
+    raise ValueError(f"Unsupported report format: {fmt!r}")
+
+
+def _head_lines(budget):
+    yield f"Budget Report for '{budget.name}'"
+    yield "=" * 40
+    yield f"Total Budget: {format_minor(budget.amount_minor, budget.scale)}"
+    yield f"Remaining Budget: {format_minor(budget.get_remaining_minor(), budget.scale)}"
+    yield "\nExpenses:"
+    yield "-" * 40
+
+
+def _text_lines(budget):
+    yield from _head_lines(budget)
+    if not budget.expenses:
+        yield "No expenses recorded."
     else:
         for expense in budget.expenses:
-            report.append(str(expense))
+            yield str(expense)
 
-    return "\n".join(report)
+
+def _iter_text_report(budget, chunk_lines):
+    lines = []
+    separator = ""
+    for line in _text_lines(budget):
+        lines.append(line)
+        if len(lines) >= chunk_lines:
+            yield separator + "\n".join(lines)
+            separator = "\n"
+            lines = []
+    if lines:
+        yield separator + "\n".join(lines)
+
+
+def _iter_csv_report(budget, chunk_lines):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    rows = 0
+    for expense in budget.expenses:
+        writer.writerow(_csv_fields(expense))
+        rows += 1
+        if rows >= chunk_lines:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    yield buffer.getvalue()
+
+
+def _iter_jsonl_report(budget, chunk_lines):
+    lines = [json.dumps(_budget_record(budget))]
+    for expense in budget.expenses:
+        lines.append(json.dumps(_expense_record(expense)))
+        if len(lines) >= chunk_lines:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _csv_fields(expense):
+    date = expense.date
+    return [
+        expense.description,
+        minor_to_str(expense.amount_minor, expense.scale),
+        expense.category,
+        date.isoformat() if date is not None else "",
+    ]
+
+
+def _budget_record(budget):
+    return {
+        "budget": budget.name,
+        "amount": budget.amount,
+        "remaining": budget.get_remaining_amount(),
+    }
+
+
+def _expense_record(expense):
+    date = expense.date
+    return {
+        "description": expense.description,
+        "amount": expense.amount,
+        "category": expense.category,
+        "date": date.isoformat() if date is not None else None,
+    }
+
+
+def _render_head(budget, fmt):
+    if fmt == "text":
+        return "\n".join(_head_lines(budget)) + "\n"
+    if fmt == "csv":
+        return ",".join(CSV_HEADER) + "\n"
+    return json.dumps(_budget_record(budget)) + "\n"
+
+
+def _render_rows(expenses, fmt):
+    if fmt == "text":
+        return "\n".join(map(str, expenses))
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(map(_csv_fields, expenses))
+        return buffer.getvalue()
+    dumps = json.dumps
+    return "".join([dumps(_expense_record(expense)) + "\n" for expense in expenses])
+
+
+def _render_body(expenses, fmt):
+    return _finish_body(_render_rows(expenses, fmt), len(expenses), fmt)
+
+
+def _extend_body(body, rows, expenses, fmt):
+    added = _render_rows(expenses, fmt)
+    if fmt == "text" and rows and added:
+        return body + "\n" + added
+    return body + added
+
+
+def _finish_body(body, rows, fmt):
+    if fmt == "text" and not rows:
+        return "No expenses recorded."
+    return body
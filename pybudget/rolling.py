@@ -0,0 +1,343 @@
+# pybudget/rolling.py
+
+"""
+Trailing-window spend aggregates updated as expenses are added.
+
+Each window keeps one bucket per day it covers, oldest first, with the
+day's sum, count and largest amount, plus a monotonic queue of daily maxima
+(each entry larger than every later one). Adding an expense for the newest
+day and evicting expired days are both amortized O(1), so asking for "the
+trailing 30 days" costs the same on a ledger of any size. An expense dated
+inside the window but before its newest day is slotted into its bucket
+and the maxima are rebuilt from the buckets, costing O(days) rather than
+O(rows).
+"""
+
+from collections import deque
+
+from .utils import NO_DATE, date_to_key, key_to_date
+
+DEFAULT_WINDOWS = (7, 30, 90)
+
+
+class RollingWindow:
+    """
+    The sum, count and maximum of the amounts in a trailing window of days.
+
+    The window ends on its newest day, ``now``, and covers the ``days``
+    days up to and including it. Amounts are whatever unit is added;
+    budgets use integer minor units.
+
+    Attributes:
+        days (int): The length of the window, in days.
+        now (int): The date key of the newest day, or None when empty.
+        total: The sum of the amounts in the window.
+        count (int): The number of amounts in the window.
+    """
+
+    __slots__ = ("days", "now", "total", "count", "_buckets", "_maxima")
+
+    def __init__(self, days: int):
+        """
+        Initialize an empty RollingWindow.
+
+        Args:
+            days (int): The length of the window, in days.
+
+        Raises:
+            ValueError: If the length is not positive.
+        """
+        if days <= 0:
+            raise ValueError(f"Invalid window length: {days!r}")
+        self.days = days
+        self.now = None
+        self.total = 0
+        self.count = 0
+        self._buckets = deque()
+        self._maxima = deque()
+
+    @property
+    def max(self):
+        """
+        The largest amount in the window, or None when it is empty.
+        """
+        return self._maxima[0][1] if self._maxima else None
+
+    def advance(self, key: int):
+        """
+        Move the end of the window forward, evicting days that fall out.
+
+        Args:
+            key (int): The date key of the new newest day; earlier keys
+                leave the window where it is.
+        """
+        if self.now is not None and key <= self.now:
+            return
+        self.now = key
+        start = key - self.days + 1
+        buckets = self._buckets
+        while buckets and buckets[0][0] < start:
+            _, total, count, _ = buckets.popleft()
+            self.total -= total
+            self.count -= count
+        maxima = self._maxima
+        while maxima and maxima[0][0] < start:
+            maxima.popleft()
+
+    def add(self, key: int, amount) -> bool:
+        """
+        Add an amount dated by a date key.
+
+        Args:
+            key (int): The date key of the amount.
+            amount: The amount to add.
+
+        Returns:
+            bool: False if the amount is older than the window and was not added.
+        """
+        self.advance(key)
+        if key <= self.now - self.days:
+            return False
+        self.total += amount
+        self.count += 1
+        buckets = self._buckets
+        if not buckets or buckets[-1][0] < key:
+            buckets.append([key, amount, 1, amount])
+            self._push_max(key, amount)
+        elif buckets[-1][0] == key:
+            bucket = buckets[-1]
+            bucket[1] += amount
+            bucket[2] += 1
+            if amount > bucket[3]:
+                bucket[3] = amount
+                self._push_max(key, amount)
+        else:
+            self._add_late(key, amount)
+        return True
+
+    def _push_max(self, key, amount):
+        maxima = self._maxima
+        while maxima and maxima[-1][1] <= amount:
+            maxima.pop()
+        maxima.append((key, amount))
+
+    def _add_late(self, key, amount):
+        buckets = self._buckets
+        position = len(buckets) - 1
+        while position and buckets[position - 1][0] >= key:
+            position -= 1
+        if buckets[position][0] == key:
+            bucket = buckets[position]
+            bucket[1] += amount
+            bucket[2] += 1
+            bucket[3] = max(bucket[3], amount)
+        else:
+            buckets.insert(position, [key, amount, 1, amount])
+        self._maxima.clear()
+        for day, _, _, largest in buckets:
+            self._push_max(day, largest)
+
+    def clear(self):
+        """
+        Remove every amount, keeping the end of the window.
+        """
+        self.total = 0
+        self.count = 0
+        self._buckets.clear()
+        self._maxima.clear()
+
+    def __repr__(self):
+        return f"RollingWindow(days={self.days}, count={self.count}, total={self.total!r})"
+
+
+class RollingSpend:
+    """
+    Trailing-window spend per window length, overall and per category.
+
+    All windows end on the newest expense date seen, or a later date passed
+    to advance(). Undated expenses are ignored. Attached to a budget, the
+    aggregates follow every expense added to it.
+
+    Attributes:
+        windows (tuple): The window lengths, in days.
+    """
+
+    def __init__(self, windows=DEFAULT_WINDOWS):
+        """
+        Initialize a RollingSpend instance.
+
+        Args:
+            windows (iterable): The window lengths, in days.
+
+        Raises:
+            ValueError: If no windows are given or a length is not positive.
+        """
+        self.windows = tuple(sorted(set(windows)))
+        if not self.windows:
+            raise ValueError("At least one window length is required")
+        self._overall = {days: RollingWindow(days) for days in self.windows}
+        self._categories = {days: {} for days in self.windows}
+        self._budget = None
+
+    @property
+    def now(self):
+        """
+        The date the windows end on, or None before any dated expense.
+        """
+        now = self._overall[self.windows[0]].now
+        return None if now is None else key_to_date(now)
+
+    def add(self, date, amount, category: str = None):
+        """
+        Add one dated expense amount.
+
+        Args:
+            date (datetime.date): The day of the expense; None is ignored.
+            amount: The amount, in the unit the aggregates are read in.
+            category (str, optional): The category of the expense.
+        """
+        if date is None:
+            return
+        key = date_to_key(date)
+        for days, window in self._overall.items():
+            if window.add(key, amount) and category is not None:
+                categories = self._categories[days]
+                bucket = categories.get(category)
+                if bucket is None:
+                    bucket = categories[category] = RollingWindow(days)
+                bucket.advance(window.now)
+                bucket.add(key, amount)
+
+    def add_columns(self, amounts, categories, dates):
+        """
+        Add a batch of expenses given as columns.
+
+        Args:
+            amounts (sequence): The amounts.
+            categories (sequence): The category of each expense.
+            dates (sequence): The date of each expense, or None.
+        """
+        if dates is None:
+            return
+        for date, amount, category in zip(dates, amounts, categories):
+            self.add(date, amount, category)
+
+    def advance(self, date):
+        """
+        Move the end of every window forward to a date, evicting old spend.
+
+        Args:
+            date (datetime.date): The new end date; earlier dates are ignored.
+        """
+        key = date_to_key(date)
+        for window in self._overall.values():
+            window.advance(key)
+
+    def _window(self, days: int, category):
+        overall = self._overall.get(days)
+        if overall is None:
+            raise ValueError(f"No {days}-day window is tracked; windows are {self.windows}")
+        if category is None:
+            return overall
+        window = self._categories[days].get(category)
+        if window is None:
+            return None
+        if overall.now is not None:
+            window.advance(overall.now)
+        return window
+
+    def sum(self, days: int, category: str = None):
+        """
+        Return the spend in a trailing window.
+
+        Args:
+            days (int): The window length, one of ``windows``.
+            category (str, optional): Only count this category.
+
+        Returns:
+            The sum of the amounts in the window.
+
+        Raises:
+            ValueError: If the window length is not tracked.
+        """
+        window = self._window(days, category)
+        return window.total if window is not None else 0
+
+    def count(self, days: int, category: str = None) -> int:
+        """
+        Return the number of expenses in a trailing window.
+
+        Args:
+            days (int): The window length, one of ``windows``.
+            category (str, optional): Only count this category.
+
+        Returns:
+            int: The number of expenses in the window.
+
+        Raises:
+            ValueError: If the window length is not tracked.
+        """
+        window = self._window(days, category)
+        return window.count if window is not None else 0
+
+    def max(self, days: int, category: str = None):
+        """
+        Return the largest expense in a trailing window.
+
+        Args:
+            days (int): The window length, one of ``windows``.
+            category (str, optional): Only consider this category.
+
+        Returns:
+            The largest amount in the window, or None if it is empty.
+
+        Raises:
+            ValueError: If the window length is not tracked.
+        """
+        window = self._window(days, category)
+        return window.max if window is not None else None
+
+    def attach(self, budget):
+        """
+        Follow a budget: seed the windows from its recent expenses, in minor
+        units, and update them as expenses are added.
+
+        Args:
+            budget: The Budget to follow.
+        """
+        self.detach()
+        latest = max((key for _, key, _ in budget.expenses.iter_columns()), default=NO_DATE)
+        if latest != NO_DATE:
+            self.advance(key_to_date(latest))
+        self._reload(budget)
+        self._budget = budget
+        budget.add_listener(self._on_change)
+
+    def detach(self):
+        """
+        Stop following the attached budget, if any.
+        """
+        if self._budget is not None:
+            self._budget.remove_listener(self._on_change)
+            self._budget = None
+
+    def _reload(self, budget):
+        for window in self._overall.values():
+            window.clear()
+        for categories in self._categories.values():
+            categories.clear()
+        now = self._overall[self.windows[-1]].now
+        if now is None:
+            return
+        start = key_to_date(now - self.windows[-1] + 1)
+        for expense in budget.get_expenses_between(start):
+            self.add(expense.date, expense.amount_minor, expense.category)
+
+    def _on_change(self, budget, event: str, data: dict):
+        if event == "add":
+            self.add_columns(data["amounts"], data["categories"], data["dates"])
+        elif event in ("remove", "recategorize"):
+            self._reload(budget)
+
+    def __repr__(self):
+        return f"RollingSpend(windows={self.windows}, now={self.now!r})"
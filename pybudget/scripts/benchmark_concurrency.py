@@ -0,0 +1,110 @@
+"""
+Benchmark concurrent expense ingestion against a single global lock.
+
+Each writer thread builds and adds expenses, pausing every ``--batch``
+rows to simulate waiting on its upstream source, while one reader takes
+totals snapshots. The "locked" mode guards a plain Budget with one lock;
+the "buffered" mode uses ConcurrentBudget's per-thread buffers.
+
+Example:
+    python pybudget/scripts/benchmark_concurrency.py --threads 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Add the repository root to the sys.path to allow imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(current_dir)))
+
+from pybudget.budget import Budget
+from pybudget.concurrent import ConcurrentBudget
+from pybudget.expense import Expense
+
+
+class LockedBudget:
+    """
+    A plain Budget behind one global lock, the baseline being compared.
+    """
+
+    def __init__(self):
+        self.budget = Budget("Locked", 1e9, storage="columnar")
+        self.lock = threading.Lock()
+
+    def add_expense(self, expense):
+        with self.lock:
+            self.budget.add_expense(expense)
+
+    def snapshot(self):
+        with self.lock:
+            return self.budget.get_total_minor(), self.budget.get_category_totals()
+
+
+def run(mode: str, threads: int, rows: int, batch: int, pause: float) -> float:
+    """
+    Ingest ``rows`` expenses per thread and return the throughput.
+
+    Args:
+        mode (str): "locked" or "buffered".
+        threads (int): The number of writer threads.
+        rows (int): The number of expenses each thread adds.
+        batch (int): The number of rows between simulated source waits.
+        pause (float): The length of each wait, in seconds.
+
+    Returns:
+        float: Expenses ingested per second.
+    """
+    if mode == "locked":
+        budget = LockedBudget()
+    else:
+        budget = ConcurrentBudget("Buffered", 1e9, storage="columnar")
+    done = threading.Event()
+
+    def writer(number):
+        category = f"Source {number % 8}"
+        for i in range(rows):
+            budget.add_expense(Expense("Card payment", 1.0 + i % 100, category))
+            if pause and i % batch == batch - 1:
+                time.sleep(pause)
+
+    def reader():
+        while not done.is_set():
+            budget.snapshot()
+            time.sleep(0.001)
+
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    watcher = threading.Thread(target=reader)
+    start = time.perf_counter()
+    watcher.start()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    budget.snapshot()
+    elapsed = time.perf_counter() - start
+    done.set()
+    watcher.join()
+    return threads * rows / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--rows", type=int, default=20000, help="expenses per thread")
+    parser.add_argument("--batch", type=int, default=500, help="rows between source waits")
+    parser.add_argument("--pause-ms", type=float, default=2.0, help="length of each wait")
+    args = parser.parse_args(argv)
+
+    print(f"{'threads':>7} {'locked rows/s':>14} {'buffered rows/s':>16} {'speedup':>8}")
+    for threads in args.threads:
+        pause = args.pause_ms / 1000
+        locked = run("locked", threads, args.rows, args.batch, pause)
+        buffered = run("buffered", threads, args.rows, args.batch, pause)
+        print(f"{threads:>7} {locked:>14,.0f} {buffered:>16,.0f} {buffered / locked:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+# pybudget/sketches.py
+
+"""
+Streaming, mergeable summaries of expense amounts.
+
+A Welford accumulator keeps the count, mean and variance exactly enough for
+reporting in constant space. A merging t-digest keeps a bounded set of
+weighted centroids, dense at the tails, from which any quantile can be
+estimated without keeping or sorting the amounts. Both merge losslessly
+(the digest within its accuracy bound), so summaries kept per budget or
+per shard combine into portfolio-level figures cheaply.
+"""
+
+import math
+from itertools import islice
+
+DEFAULT_COMPRESSION = 200
+
+CHUNK_SIZE = 65536
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Welford:
+    """
+    A running count, mean and variance using Welford's algorithm.
+
+    Attributes:
+        count (int): The number of values added.
+        mean (float): The mean of the values, 0.0 when empty.
+        m2 (float): The sum of squared differences from the mean.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        """
+        Initialize an empty Welford accumulator.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        """
+        Add a value.
+
+        Args:
+            value: The value to add.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def extend(self, values):
+        """
+        Add several values, summarising them as one batch first.
+
+        Args:
+            values (sequence): The values to add.
+        """
+        count = len(values)
+        if not count:
+            return
+        mean = sum(values) / count
+        batch = Welford()
+        batch.count = count
+        batch.mean = mean
+        batch.m2 = sum((value - mean) ** 2 for value in values)
+        self.merge(batch)
+
+    def merge(self, other: "Welford"):
+        """
+        Fold another accumulator into this one (Chan et al.'s formula).
+
+        Args:
+            other (Welford): The accumulator to merge.
+        """
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    def copy(self) -> "Welford":
+        """
+        Return an independent copy of the accumulator.
+
+        Returns:
+            Welford: The copy.
+        """
+        copy = Welford()
+        copy.count = self.count
+        copy.mean = self.mean
+        copy.m2 = self.m2
+        return copy
+
+    @property
+    def variance(self) -> float:
+        """
+        The sample variance of the values, or None for fewer than two.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def stdev(self) -> float:
+        """
+        The sample standard deviation of the values, or None for fewer than two.
+        """
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def __repr__(self):
+        return f"Welford(count={self.count}, mean={self.mean!r}, m2={self.m2!r})"
+
+
+class TDigest:
+    """
+    A merging t-digest for estimating quantiles of a stream of values.
+
+    Values are buffered and periodically merged into at most about
+    ``compression`` centroids, sized by the arcsine scale function so the
+    tails keep small centroids and extreme quantiles stay accurate. The
+    exact minimum and maximum are tracked separately.
+
+    Attributes:
+        compression (int): Bounds the number of centroids kept.
+        count (int): The number of values added.
+        minimum: The smallest value added, or None.
+        maximum: The largest value added, or None.
+    """
+
+    __slots__ = ("compression", "count", "minimum", "maximum", "_means", "_weights", "_buffer")
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION):
+        """
+        Initialize an empty TDigest.
+
+        Args:
+            compression (int): Bounds the number of centroids kept; larger
+                values are more accurate and use more memory.
+
+        Raises:
+            ValueError: If the compression is not positive.
+        """
+        if compression <= 0:
+            raise ValueError(f"Invalid compression: {compression!r}")
+        self.compression = compression
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+        self._means = []
+        self._weights = []
+        self._buffer = []
+
+    def add(self, value):
+        """
+        Add a value.
+
+        Args:
+            value: The value to add.
+        """
+        self._buffer.append((value, 1))
+        self.count += 1
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def extend(self, values):
+        """
+        Add several values.
+
+        The values are buffered and merged a buffer's worth at a time, so
+        the extra memory used stays bounded by the compression however
+        many values are added.
+
+        Args:
+            values (sequence): The values to add.
+        """
+        if not len(values):
+            return
+        low, high = min(values), max(values)
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        limit = 5 * self.compression
+        position = 0
+        while position < len(values):
+            chunk = values[position : position + limit - len(self._buffer)]
+            position += len(chunk)
+            self._buffer.extend((value, 1) for value in chunk)
+            self.count += len(chunk)
+            if len(self._buffer) >= limit:
+                self._compress()
+
+    def merge(self, other: "TDigest"):
+        """
+        Fold another digest into this one.
+
+        Args:
+            other (TDigest): The digest to merge.
+        """
+        if not other.count:
+            return
+        other._compress()
+        self._buffer.extend(zip(other._means, other._weights))
+        self.count += other.count
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self._compress()
+
+    def copy(self) -> "TDigest":
+        """
+        Return an independent copy of the digest.
+
+        Returns:
+            TDigest: The copy.
+        """
+        self._compress()
+        copy = TDigest(self.compression)
+        copy.count = self.count
+        copy.minimum = self.minimum
+        copy.maximum = self.maximum
+        copy._means = list(self._means)
+        copy._weights = list(self._weights)
+        return copy
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        items = sorted(self._buffer + list(zip(self._means, self._weights)))
+        self._buffer = []
+        total = self.count
+        scale = self.compression / (2 * math.pi)
+        means = []
+        weights = []
+
+        def limit(done):
+            # The cumulative weight the next centroid may reach: one unit of
+            # the arcsine scale function k(q) = scale * asin(2q - 1) further on.
+            k = scale * math.asin(2 * done / total - 1) + 1
+            if k >= scale * math.pi / 2:
+                return total
+            return total * (math.sin(k / scale) + 1) / 2
+
+        mean, weight = items[0]
+        done = 0
+        bound = limit(done)
+        for value, value_weight in items[1:]:
+            if done + weight + value_weight <= bound:
+                weight += value_weight
+                mean += (value - mean) * value_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                bound = limit(done)
+                mean, weight = value, value_weight
+        means.append(mean)
+        weights.append(weight)
+        self._means = means
+        self._weights = weights
+
+    @property
+    def centroids(self) -> int:
+        """
+        The number of centroids currently kept.
+        """
+        self._compress()
+        return len(self._means)
+
+    def quantile(self, q: float):
+        """
+        Estimate a quantile of the values.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated value, or None if the digest is empty.
+
+        Raises:
+            ValueError: If q is outside [0, 1].
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1: {q!r}")
+        if not self.count:
+            return None
+        self._compress()
+        means, weights = self._means, self._weights
+        if len(means) == 1:
+            return float(means[0])
+        index = q * self.count
+        # Interpolate between centroid centres, with the exact extremes at the ends.
+        done = weights[0] / 2
+        if index < done:
+            return self.minimum + (means[0] - self.minimum) * index / done
+        for i in range(len(means) - 1):
+            step = (weights[i] + weights[i + 1]) / 2
+            if done + step > index:
+                return means[i] + (means[i + 1] - means[i]) * (index - done) / step
+            done += step
+        tail = weights[-1] / 2
+        position = min(1.0, (index - done) / tail)
+        return means[-1] + (self.maximum - means[-1]) * position
+
+    def __repr__(self):
+        return f"TDigest(count={self.count}, centroids={self.centroids})"
+
+
+class AmountSummary:
+    """
+    A streaming summary of amounts: moments, extremes and quantiles.
+
+    Amounts are whatever unit is added; budgets use integer minor units.
+
+    Attributes:
+        moments (Welford): The count, mean and variance.
+        digest (TDigest): The quantile sketch, with the exact extremes.
+    """
+
+    __slots__ = ("moments", "digest")
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION):
+        """
+        Initialize an empty AmountSummary.
+
+        Args:
+            compression (int): The t-digest compression.
+        """
+        self.moments = Welford()
+        self.digest = TDigest(compression)
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    def add(self, amount):
+        """
+        Add an amount.
+
+        Args:
+            amount: The amount to add.
+        """
+        self.moments.add(amount)
+        self.digest.add(amount)
+
+    def extend(self, amounts):
+        """
+        Add several amounts, taking them ``CHUNK_SIZE`` at a time.
+
+        Args:
+            amounts (iterable): The amounts to add.
+        """
+        amounts = iter(amounts)
+        while True:
+            chunk = list(islice(amounts, CHUNK_SIZE))
+            if not chunk:
+                return
+            self.moments.extend(chunk)
+            self.digest.extend(chunk)
+
+    def merge(self, other: "AmountSummary"):
+        """
+        Fold another summary into this one.
+
+        Args:
+            other (AmountSummary): The summary to merge.
+        """
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+
+    def copy(self) -> "AmountSummary":
+        """
+        Return an independent copy of the summary.
+
+        Returns:
+            AmountSummary: The copy.
+        """
+        copy = AmountSummary.__new__(AmountSummary)
+        copy.moments = self.moments.copy()
+        copy.digest = self.digest.copy()
+        return copy
+
+    def quantile(self, q: float):
+        """
+        Estimate a quantile of the amounts.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated amount, or None if the summary is empty.
+        """
+        return self.digest.quantile(q)
+
+    def get(self, statistic: str):
+        """
+        Return one statistic of the amounts.
+
+        Args:
+            statistic (str): One of "count", "mean", "variance", "stdev",
+                "min", "max", "median", "p90" or "p99".
+
+        Returns:
+            The statistic, or None if the summary has too few amounts.
+
+        Raises:
+            ValueError: If the statistic is not supported.
+        """
+        if statistic == "count":
+            return self.moments.count
+        if statistic == "mean":
+            return self.moments.mean if self.moments.count else None
+        if statistic == "variance":
+            return self.moments.variance
+        if statistic == "stdev":
+            return self.moments.stdev
+        if statistic == "min":
+            return self.digest.minimum
+        if statistic == "max":
+            return self.digest.maximum
+        if statistic == "median":
+            return self.digest.quantile(0.5)
+        if statistic in ("p90", "p99"):
+            return self.digest.quantile(int(statistic[1:]) / 100)
+        raise ValueError(f"Unsupported statistic: {statistic!r}")
+
+    def __repr__(self):
+        return f"AmountSummary(count={self.count}, mean={self.get('mean')!r})"
+
+
+def merge_summaries(summaries, compression: int = DEFAULT_COMPRESSION) -> AmountSummary:
+    """
+    Combine summaries from several budgets or shards into one.
+
+    Args:
+        summaries (iterable): The AmountSummary objects to combine.
+        compression (int): The t-digest compression of the result.
+
+    Returns:
+        AmountSummary: A new summary covering all the amounts.
+    """
+    merged = AmountSummary(compression)
+    for summary in summaries:
+        merged.merge(summary)
+    return merged
+
+
+def group_summaries(pairs, groups: dict = None) -> dict:
+    """
+    Build or update an AmountSummary for each key from (key, amount) pairs.
+
+    Amounts are bucketed by key, and the buckets are added to their
+    summaries in batches once ``CHUNK_SIZE`` amounts are waiting.
+
+    Args:
+        pairs (iterable): (group key, amount) tuples.
+        groups (dict, optional): Existing summaries to update in place.
+
+    Returns:
+        dict: A mapping of group key to AmountSummary.
+    """
+    if groups is None:
+        groups = {}
+    buckets = {}
+    waiting = 0
+    for key, amount in pairs:
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [amount]
+        else:
+            bucket.append(amount)
+        waiting += 1
+        if waiting == CHUNK_SIZE:
+            _flush_buckets(buckets, groups)
+            waiting = 0
+    _flush_buckets(buckets, groups)
+    return groups
+
+
+def _flush_buckets(buckets, groups):
+    for key, amounts in buckets.items():
+        summary = groups.get(key)
+        if summary is None:
+            summary = groups[key] = AmountSummary()
+        summary.extend(amounts)
+    buckets.clear()
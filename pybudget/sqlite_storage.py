@@ -0,0 +1,393 @@
+# pybudget/sqlite_storage.py
+
+"""
+SQLite storage backend for persistent budgets.
+
+Expenses are buffered in memory and written in batched transactions. The
+database runs in WAL mode, keeps indexes on category and date, and maintains a
+small per-category summary table in the same transactions as the inserts,
+so reopening a large ledger and asking for its totals never reads the rows.
+Amounts are stored as INTEGER minor units, so SQL sums are exact.
+"""
+
+import sqlite3
+from array import array
+from itertools import repeat
+
+from .expense import Expense
+from .money import DEFAULT_SCALE
+from .storage import ExpenseStorage
+from .utils import date_to_key, key_to_date
+
+DEFAULT_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    date INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses (category, amount);
+CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (date, amount);
+CREATE TABLE IF NOT EXISTS category_totals (
+    category TEXT PRIMARY KEY,
+    total INTEGER NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS budget_meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+_COLUMNS = "description, amount, category, date"
+
+
+def _to_expense(row, scale):
+    description, amount, category, key = row
+    date = None if key is None else key_to_date(key)
+    return Expense.from_minor(description, amount, category, date, scale)
+
+
+def _to_row(description, amount, category, date):
+    return description, amount, category, None if date is None else date_to_key(date)
+
+
+class SQLiteStorage(ExpenseStorage):
+    """
+    Storage backend keeping expenses in an SQLite database.
+
+    Row ``i`` of the storage is the expense with id ``i + 1``, so indexing
+    is a primary key lookup. Appended expenses are buffered and written
+    every ``batch_size`` rows, or whenever the storage is read.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE, scale: int = None):
+        """
+        Initialize an SQLiteStorage instance.
+
+        Args:
+            path (str): The database file path, or ":memory:".
+            batch_size (int): The number of buffered expenses that triggers a write.
+            scale (int, optional): The number of decimal places of the amounts.
+                A new database records it; an existing one must match.
+
+        Raises:
+            ValueError: If the scale does not match the one stored in the database.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        stored_scale = self.get_meta("scale")
+        if stored_scale is None:
+            self.scale = DEFAULT_SCALE if scale is None else scale
+            self.set_meta("scale", self.scale)
+        elif scale is not None and scale != stored_scale:
+            self._conn.close()
+            raise ValueError(f"{path} stores amounts with scale {stored_scale}, not {scale}")
+        else:
+            self.scale = stored_scale
+        self._pending = []
+        self._stored = self._conn.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM category_totals"
+        ).fetchone()[0]
+
+    def __len__(self):
+        return self._stored + len(self._pending)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            self.flush()
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM expenses WHERE id > ? AND id <= ? ORDER BY id",
+                (start, stop),
+            )
+            return [_to_expense(row, self.scale) for row in rows]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("expense index out of range")
+        self.flush()
+        row = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM expenses WHERE id = ?", (index + 1,)
+        ).fetchone()
+        return _to_expense(row, self.scale)
+
+    def __iter__(self):
+        self.flush()
+        cursor = self._conn.execute(f"SELECT {_COLUMNS} FROM expenses ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield _to_expense(row, self.scale)
+
+    def __repr__(self):
+        return f"SQLiteStorage({self.path!r}, rows={len(self)})"
+
+    def append(self, expense):
+        self._pending.append(
+            _to_row(expense.description, expense.amount_minor, expense.category, expense.date)
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def extend_columns(self, descriptions, amounts, categories, dates=None):
+        if dates is None:
+            rows = zip(descriptions, amounts, categories, repeat(None))
+            self._pending.extend(rows)
+        else:
+            self._pending.extend(map(_to_row, descriptions, amounts, categories, dates))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        pending = self._pending
+        summaries = {}
+        for _, amount, category, _ in pending:
+            total, count = summaries.get(category, (0, 0))
+            summaries[category] = (total + amount, count + 1)
+        first_id = self._stored + 1
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO expenses (id, description, amount, category, date) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((first_id + i, *row) for i, row in enumerate(pending)),
+            )
+            self._conn.executemany(
+                "INSERT INTO category_totals (category, total, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (category) DO UPDATE SET "
+                "total = total + excluded.total, count = count + excluded.count",
+                ((category, total, count) for category, (total, count) in summaries.items()),
+            )
+        self._stored += len(pending)
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def set_category(self, index: int, category: str):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("expense index out of range")
+        self.flush()
+        old, amount = self._conn.execute(
+            "SELECT category, amount FROM expenses WHERE id = ?", (index + 1,)
+        ).fetchone()
+        with self._conn:
+            self._conn.execute(
+                "UPDATE expenses SET category = ? WHERE id = ?", (category, index + 1)
+            )
+            self._conn.execute(
+                "UPDATE category_totals SET total = total - ?, count = count - 1 "
+                "WHERE category = ?",
+                (amount, old),
+            )
+            self._conn.execute("DELETE FROM category_totals WHERE count = 0")
+            self._conn.execute(
+                "INSERT INTO category_totals (category, total, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (category) DO UPDATE SET "
+                "total = total + excluded.total, count = count + 1",
+                (category, amount),
+            )
+
+    def total(self) -> int:
+        self.flush()
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(total), 0) FROM category_totals"
+        ).fetchone()[0]
+
+    def category_summaries(self) -> dict:
+        self.flush()
+        rows = self._conn.execute("SELECT category, total, count FROM category_totals")
+        return {category: (total, count) for category, total, count in rows}
+
+    def category_rows(self, category: str):
+        """
+        Iterate over the expenses of one category using the category index.
+
+        Args:
+            category (str): The category to select.
+
+        Yields:
+            Expense: The expenses in the category, in insertion order.
+        """
+        self.flush()
+        cursor = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM expenses WHERE category = ? ORDER BY id", (category,)
+        )
+        for row in cursor:
+            yield _to_expense(row, self.scale)
+
+    def iter_columns(self):
+        self.flush()
+        cursor = self._conn.execute(
+            "SELECT category, COALESCE(date, 0), amount FROM expenses ORDER BY id"
+        )
+        yield from cursor
+
+    def iter_descriptions(self):
+        self.flush()
+        cursor = self._conn.execute("SELECT description FROM expenses ORDER BY id")
+        return (description for (description,) in cursor)
+
+    def category_stats(self) -> dict:
+        self.flush()
+        rows = self._conn.execute(
+            "SELECT category, COUNT(*), SUM(amount), MIN(amount), MAX(amount) "
+            "FROM expenses GROUP BY category"
+        )
+        return {category: tuple(stats) for category, *stats in rows}
+
+    def dated_rows(self):
+        self.flush()
+        cursor = self._conn.execute(
+            "SELECT id - 1, date, amount FROM expenses WHERE date IS NOT NULL ORDER BY date, id"
+        )
+        yield from cursor
+
+    def time_index(self):
+        return SQLiteTimeIndex(self)
+
+    def category_index(self):
+        return SQLiteCategoryIndex(self)
+
+    def get_meta(self, key: str, default=None):
+        """
+        Read a stored budget attribute.
+
+        Args:
+            key (str): The attribute name.
+            default: The value returned if the attribute is not stored.
+
+        Returns:
+            The stored value, or the default.
+        """
+        row = self._conn.execute("SELECT value FROM budget_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else default
+
+    def set_meta(self, key: str, value):
+        """
+        Store a budget attribute.
+
+        Args:
+            key (str): The attribute name.
+            value: The value to store.
+        """
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO budget_meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+
+class SQLiteCategoryIndex:
+    """
+    A category index for SQLiteStorage that looks rows up in SQL.
+
+    Lookups use the category index of the expenses table, so the budget
+    keeps no per-row category data in memory.
+    """
+
+    def __init__(self, storage: SQLiteStorage):
+        """
+        Initialize an SQLiteCategoryIndex instance.
+
+        Args:
+            storage (SQLiteStorage): The storage to query.
+        """
+        self._storage = storage
+
+    def add(self, row: int, category: str):
+        """
+        Record a new expense; the database indexes it when flushed.
+        """
+
+    def extend(self, first_row: int, categories):
+        """
+        Record several new expenses; the database indexes them when flushed.
+        """
+
+    def rows(self, category: str):
+        """
+        Return the row numbers of the expenses in a category.
+
+        Args:
+            category (str): The category to look up.
+
+        Returns:
+            array: The row numbers in insertion order.
+        """
+        self._storage.flush()
+        cursor = self._storage._conn.execute(
+            "SELECT id - 1 FROM expenses WHERE category = ? ORDER BY id", (category,)
+        )
+        return array("L", (row for (row,) in cursor))
+
+
+class SQLiteTimeIndex:
+    """
+    A time index for SQLiteStorage that answers range queries in SQL.
+
+    Range sums and counts use the date index of the expenses table, so
+    no rows are loaded into Python.
+    """
+
+    def __init__(self, storage: SQLiteStorage):
+        """
+        Initialize an SQLiteTimeIndex instance.
+
+        Args:
+            storage (SQLiteStorage): The storage to query.
+        """
+        self._storage = storage
+
+    def __len__(self):
+        return self._query("COUNT(*)", None, None)
+
+    def add(self, row: int, key: int, amount: int):
+        """
+        Record a new dated expense; the database indexes it when flushed.
+        """
+
+    def extend(self, entries):
+        """
+        Record several new dated expenses; the database indexes them when flushed.
+        """
+
+    def _query(self, select: str, start, end):
+        self._storage.flush()
+        lo = -1 if start is None else date_to_key(start)
+        hi = 2**31 if end is None else date_to_key(end)
+        return self._storage._conn.execute(
+            f"SELECT {select} FROM expenses WHERE date BETWEEN ? AND ?", (lo, hi)
+        ).fetchone()[0]
+
+    def sum_between(self, start=None, end=None) -> int:
+        return self._query("COALESCE(SUM(amount), 0)", start, end)
+
+    def count_between(self, start=None, end=None) -> int:
+        return self._query("COUNT(*)", start, end)
+
+    def rows_between(self, start=None, end=None):
+        self._storage.flush()
+        lo = -1 if start is None else date_to_key(start)
+        hi = 2**31 if end is None else date_to_key(end)
+        cursor = self._storage._conn.execute(
+            "SELECT id - 1 FROM expenses WHERE date BETWEEN ? AND ? ORDER BY date, id", (lo, hi)
+        )
+        return [row for (row,) in cursor]
@@ -0,0 +1,940 @@
+# pybudget/storage.py
+
+"""
+Storage backends for the expenses held by a budget.
+
+A Budget keeps its expenses in a storage object rather than a bare list, so
+large ledgers can be held in a compact column-oriented layout while the
+familiar ``budget.expenses`` sequence interface keeps working.
+
+Below the Expense interface every backend works in integer minor units:
+``extend_columns`` takes minor-unit amounts and the aggregate helpers
+return them, at the storage's currency ``scale``.
+"""
+
+from array import array
+from bisect import bisect_right, insort
+from collections.abc import Sequence
+from itertools import chain, islice, repeat
+
+from .expense import Expense
+from .money import DEFAULT_SCALE, Money, factor
+from .utils import NO_DATE, date_to_key, key_to_date
+
+
+class ExpenseStorage(Sequence):
+    """
+    Base class for expense storage backends.
+
+    Subclasses must implement ``__len__``, ``__getitem__`` and ``append``.
+    Aggregate helpers have generic implementations that backends may
+    override with faster versions.
+
+    Attributes:
+        scale (int): The number of decimal places of the stored amounts.
+    """
+
+    scale = DEFAULT_SCALE
+
+    def append(self, expense):
+        """
+        Append an expense to the storage.
+
+        Args:
+            expense: An Expense (or expense-like) object to store.
+        """
+        raise NotImplementedError
+
+    def extend(self, expenses):
+        """
+        Append several expenses to the storage.
+
+        Args:
+            expenses: An iterable of Expense objects.
+        """
+        for expense in expenses:
+            self.append(expense)
+
+    def extend_columns(self, descriptions, amounts, categories, dates=None):
+        """
+        Append several expenses given as parallel columns.
+
+        Args:
+            descriptions (sequence): The expense descriptions.
+            amounts (sequence): The expense amounts in minor units.
+            categories (sequence): The expense categories.
+            dates (sequence, optional): The expense dates, None for undated.
+        """
+        if dates is None:
+            dates = repeat(None)
+        self.extend(
+            map(Expense.from_minor, descriptions, amounts, categories, dates, repeat(self.scale))
+        )
+
+    def remove(self, index: int):
+        """
+        Remove the expense at a position; later expenses move up one row.
+
+        Args:
+            index (int): The position of the expense.
+
+        Returns:
+            Expense: The removed expense.
+
+        Raises:
+            IndexError: If the position is out of range.
+            ValueError: If the backend does not support removal.
+        """
+        raise ValueError(f"{type(self).__name__} does not support removing expenses")
+
+    def set_category(self, index: int, category: str):
+        """
+        Change the category of the expense at a position.
+
+        Args:
+            index (int): The position of the expense.
+            category (str): The new category.
+
+        Raises:
+            IndexError: If the position is out of range.
+            ValueError: If the backend does not support changing expenses.
+        """
+        raise ValueError(f"{type(self).__name__} does not support changing expenses")
+
+    def total(self) -> int:
+        """
+        Calculate the sum of all stored expense amounts.
+
+        Returns:
+            int: The total amount of all expenses, in minor units.
+        """
+        return sum(expense.amount_minor for expense in self)
+
+    def category_totals(self) -> dict:
+        """
+        Calculate the sum of expense amounts for each category.
+
+        Returns:
+            dict: A mapping of category name to total amount, in minor units.
+        """
+        return {category: total for category, (total, _) in self.category_summaries().items()}
+
+    def category_summaries(self) -> dict:
+        """
+        Calculate the sum and number of expenses for each category.
+
+        Returns:
+            dict: A mapping of category name to a (total, count) tuple.
+        """
+        summaries = {}
+        for expense in self:
+            total, count = summaries.get(expense.category, (0, 0))
+            summaries[expense.category] = (total + expense.amount_minor, count + 1)
+        return summaries
+
+    def iter_columns(self):
+        """
+        Iterate over the grouping columns of every expense, in row order.
+
+        Yields:
+            tuple: (category, date key, amount in minor units) for each expense.
+        """
+        for expense in self:
+            yield expense.category, date_to_key(expense.date), expense.amount_minor
+
+    def iter_descriptions(self):
+        """
+        Iterate over the description of every expense, in row order.
+
+        Yields:
+            str: The description of each expense.
+        """
+        for expense in self:
+            yield expense.description
+
+    def category_stats(self) -> dict:
+        """
+        Calculate the count, sum, minimum and maximum amount for each category.
+
+        Returns:
+            dict: A mapping of category name to a (count, total, min, max) tuple.
+        """
+        stats = {}
+        for category, _, amount in self.iter_columns():
+            entry = stats.get(category)
+            if entry is None:
+                stats[category] = (1, amount, amount, amount)
+            else:
+                count, total, low, high = entry
+                stats[category] = (count + 1, total + amount, min(low, amount), max(high, amount))
+        return stats
+
+    def dated_rows(self):
+        """
+        Iterate over the dated expenses as index entries.
+
+        Yields:
+            tuple: (row, date key, amount in minor units) for every expense with a date.
+        """
+        for row, expense in enumerate(self):
+            if expense.date is not None:
+                yield row, date_to_key(expense.date), expense.amount_minor
+
+    def time_index(self):
+        """
+        Return a backend-specific time index, if the backend provides one.
+
+        Returns:
+            An object with the TimeIndex query interface, or None to let the
+            budget maintain an in-memory TimeIndex.
+        """
+        return None
+
+    def category_index(self):
+        """
+        Return a backend-specific category index, if the backend provides one.
+
+        Returns:
+            An object with the CategoryIndex ``add``, ``extend`` and ``rows``
+            interface, or None to let the budget maintain an in-memory
+            CategoryIndex.
+        """
+        return None
+
+    def get_meta(self, key: str, default=None):
+        """
+        Read a stored budget attribute, if the backend persists them.
+
+        Args:
+            key (str): The attribute name.
+            default: The value returned if the attribute is not stored.
+
+        Returns:
+            The stored value, or the default.
+        """
+        return default
+
+    def set_meta(self, key: str, value):
+        """
+        Store a budget attribute, if the backend persists them.
+
+        In-memory backends ignore it.
+
+        Args:
+            key (str): The attribute name.
+            value: The value to store.
+        """
+
+    def flush(self):
+        """
+        Write any buffered expenses through to the underlying store.
+        """
+
+    def close(self):
+        """
+        Flush and release any resources held by the storage.
+        """
+        self.flush()
+
+
+def _keep(expense):
+    # A list-backed budget keeps the object itself and totals of its amount,
+    # so the amount is frozen from now on.
+    if isinstance(expense, Expense):
+        expense._stored = True
+    return expense
+
+
+class ListStorage(ExpenseStorage):
+    """
+    Storage backend keeping Expense objects in a plain Python list.
+
+    This is the default backend and returns the exact objects that were added.
+    """
+
+    def __init__(self, expenses=None, scale: int = DEFAULT_SCALE):
+        """
+        Initialize a ListStorage instance.
+
+        Args:
+            expenses (iterable, optional): Initial expenses to store.
+            scale (int): The number of decimal places of the stored amounts.
+        """
+        self.scale = scale
+        self._rows = list(map(_keep, expenses)) if expenses is not None else []
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __eq__(self, other):
+        if isinstance(other, ListStorage):
+            return self._rows == other._rows
+        if isinstance(other, list):
+            return self._rows == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ListStorage({self._rows!r})"
+
+    def append(self, expense):
+        self._rows.append(_keep(expense))
+
+    def extend(self, expenses):
+        self._rows.extend(map(_keep, expenses))
+
+    def remove(self, index: int):
+        return self._rows.pop(index)
+
+    def set_category(self, index: int, category: str):
+        # Replace the row rather than mutating an Expense the caller may share.
+        self._rows[index] = _keep(_relabel(self._rows[index], category))
+
+
+class ColumnarStorage(ExpenseStorage):
+    """
+    Storage backend keeping expenses in contiguous typed columns.
+
+    Amounts live in an int64 array of minor units, categories are dictionary-encoded into
+    a uint32 code column, descriptions are interned in a string table and
+    dates are stored as int32 day ordinals (0 for undated rows), so each row
+    costs a handful of bytes instead of a full Python object. Indexing
+    returns lightweight ExpenseView rows.
+    """
+
+    def __init__(self, expenses=None, scale: int = DEFAULT_SCALE):
+        """
+        Initialize a ColumnarStorage instance.
+
+        Args:
+            expenses (iterable, optional): Initial expenses to store.
+            scale (int): The number of decimal places of the stored amounts.
+        """
+        self.scale = scale
+        self.amounts = array("q")
+        self.category_codes = array("I")
+        self.description_codes = array("I")
+        self.dates = array("i")
+        self.categories = []
+        self.descriptions = []
+        self._category_lookup = {}
+        self._description_lookup = {}
+        if expenses is not None:
+            self.extend(expenses)
+
+    @classmethod
+    def from_columns(
+        cls,
+        amounts,
+        category_codes,
+        description_codes,
+        dates,
+        categories,
+        descriptions,
+        scale: int = DEFAULT_SCALE,
+    ):
+        """
+        Build a storage directly from encoded columns and their string tables.
+
+        Args:
+            amounts (array): The int64 amount column, in minor units.
+            category_codes (array): The uint32 category code column.
+            description_codes (array): The uint32 description code column.
+            dates (array): The int32 date key column.
+            categories (list): The category table, indexed by code.
+            descriptions (list): The description table, indexed by code.
+            scale (int): The number of decimal places of the amounts.
+
+        Returns:
+            ColumnarStorage: A storage over the given columns.
+        """
+        storage = cls(scale=scale)
+        storage.amounts = amounts
+        storage.category_codes = category_codes
+        storage.description_codes = description_codes
+        storage.dates = dates
+        storage.categories = list(categories)
+        storage.descriptions = list(descriptions)
+        storage._category_lookup = {c: code for code, c in enumerate(storage.categories)}
+        storage._description_lookup = {d: code for code, d in enumerate(storage.descriptions)}
+        return storage
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ExpenseView(self, row) for row in range(*index.indices(len(self)))]
+        size = len(self.amounts)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("expense index out of range")
+        return ExpenseView(self, index)
+
+    def __iter__(self):
+        for row in range(len(self.amounts)):
+            yield ExpenseView(self, row)
+
+    def __repr__(self):
+        return f"ColumnarStorage(rows={len(self)}, categories={len(self.categories)})"
+
+    def append(self, expense):
+        self.append_row(
+            expense.description, expense.amount_minor, expense.category, expense.date
+        )
+
+    def append_row(self, description: str, amount: int, category: str, date=None):
+        """
+        Append a single expense given as raw column values.
+
+        Args:
+            description (str): A description of the expense.
+            amount (int): The amount of the expense in minor units.
+            category (str): The category of the expense.
+            date (datetime.date, optional): The day the expense was incurred.
+        """
+        self.amounts.append(amount)
+        self.category_codes.append(self.category_code(category))
+        self.description_codes.append(self._description_code(description))
+        self.dates.append(date_to_key(date))
+
+    def extend(self, expenses):
+        descriptions = []
+        amounts = []
+        categories = []
+        dates = []
+        for expense in expenses:
+            descriptions.append(expense.description)
+            amounts.append(expense.amount_minor)
+            categories.append(expense.category)
+            dates.append(expense.date)
+        self.extend_columns(descriptions, amounts, categories, dates)
+
+    def extend_columns(self, descriptions, amounts, categories, dates=None):
+        self.amounts.extend(amounts)
+        self.category_codes.extend(map(self.category_code, categories))
+        self.description_codes.extend(map(self._description_code, descriptions))
+        if dates is None:
+            self.dates.extend(repeat(NO_DATE, len(amounts)))
+        else:
+            self.dates.extend(map(date_to_key, dates))
+
+    def remove(self, index: int):
+        size = len(self.amounts)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("expense index out of range")
+        expense = ExpenseView(self, index).to_expense()
+        del self.amounts[index]
+        del self.category_codes[index]
+        del self.description_codes[index]
+        del self.dates[index]
+        return expense
+
+    def set_category(self, index: int, category: str):
+        self.category_codes[index] = self.category_code(category)
+
+    def category_code(self, category: str) -> int:
+        """
+        Return the dictionary code for a category, adding it if needed.
+
+        Args:
+            category (str): The category name.
+
+        Returns:
+            int: The code used for the category in ``category_codes``.
+        """
+        code = self._category_lookup.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(category)
+            self._category_lookup[category] = code
+        return code
+
+    def _description_code(self, description: str) -> int:
+        code = self._description_lookup.get(description)
+        if code is None:
+            code = len(self.descriptions)
+            self.descriptions.append(description)
+            self._description_lookup[description] = code
+        return code
+
+    def description_at(self, row: int) -> str:
+        """
+        Return the description stored at a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            str: The description of the expense.
+        """
+        return self.descriptions[self.description_codes[row]]
+
+    def amount_at(self, row: int) -> float:
+        """
+        Return the amount stored at a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            float: The amount of the expense in major units.
+        """
+        return self.amounts[row] / factor(self.scale)
+
+    def category_at(self, row: int) -> str:
+        """
+        Return the category stored at a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            str: The category of the expense.
+        """
+        return self.categories[self.category_codes[row]]
+
+    def date_at(self, row: int):
+        """
+        Return the date stored at a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            datetime.date: The date of the expense, or None.
+        """
+        return key_to_date(self.dates[row])
+
+    def total(self) -> int:
+        return sum(self.amounts)
+
+    def iter_columns(self):
+        categories = self.categories
+        for code, key, amount in zip(self.category_codes, self.dates, self.amounts):
+            yield categories[code], key, amount
+
+    def iter_descriptions(self):
+        return map(self.descriptions.__getitem__, self.description_codes)
+
+    def dated_rows(self):
+        for row, (key, amount) in enumerate(zip(self.dates, self.amounts)):
+            if key != NO_DATE:
+                yield row, key, amount
+
+    def category_summaries(self) -> dict:
+        sums = [0] * len(self.categories)
+        counts = [0] * len(self.categories)
+        for code, amount in zip(self.category_codes, self.amounts):
+            sums[code] += amount
+            counts[code] += 1
+        return {
+            category: (sums[code], counts[code])
+            for code, category in enumerate(self.categories)
+            if counts[code]
+        }
+
+
+class ForkStorage(ExpenseStorage):
+    """
+    A copy-on-write storage layered over a frozen prefix of another storage.
+
+    The first ``base_rows`` rows of the base storage are shared, not
+    copied. Rows appended to the fork go into a small storage of its own,
+    removed base rows are recorded as a sorted list of tombstones and
+    recategorized base rows as a mapping of row to category, so a fork
+    costs memory in proportion to its own changes only. Rows the base
+    storage gains after the fork was taken are not visible.
+
+    Attributes:
+        base (ExpenseStorage): The shared storage.
+        base_rows (int): The number of base rows the fork starts from.
+        removed (array): The removed base row numbers, sorted.
+        added (ExpenseStorage): The rows appended to the fork.
+        owns_base (bool): Whether closing the fork closes the base, for a
+            base no other budget uses.
+    """
+
+    def __init__(self, base: ExpenseStorage, base_rows: int = None):
+        """
+        Initialize a ForkStorage instance.
+
+        Args:
+            base (ExpenseStorage): The storage to share.
+            base_rows (int, optional): The number of shared rows; defaults
+                to the current length of the base.
+        """
+        self.base = base
+        self.base_rows = len(base) if base_rows is None else base_rows
+        self.scale = base.scale
+        self.removed = array("L")
+        self._categories = {}
+        self.owns_base = False
+        if isinstance(base, ListStorage):
+            self.added = ListStorage(scale=base.scale)
+        else:
+            self.added = ColumnarStorage(scale=base.scale)
+
+    @property
+    def _visible_base(self) -> int:
+        return self.base_rows - len(self.removed)
+
+    def _base_row(self, index: int) -> int:
+        # The smallest row r with r == index + (number of removed rows <= r)
+        # is the index-th row that has not been removed.
+        removed = self.removed
+        row = index
+        while True:
+            shifted = index + bisect_right(removed, row)
+            if shifted == row:
+                return row
+            row = shifted
+
+    def __len__(self):
+        return self._visible_base + len(self.added)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[row] for row in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("expense index out of range")
+        visible = self._visible_base
+        if index < visible:
+            return self._base_expense(self._base_row(index))
+        return self.added[index - visible]
+
+    def _base_expense(self, row: int):
+        expense = self.base[row]
+        category = self._categories.get(row)
+        return expense if category is None else _relabel(expense, category)
+
+    def _base_iter(self, rows, relabel):
+        rows = islice(rows, self.base_rows)
+        if not self.removed and not self._categories:
+            return rows
+        return self._filter_base(rows, relabel)
+
+    def _filter_base(self, rows, relabel):
+        removed = iter(self.removed)
+        next_removed = next(removed, None)
+        categories = self._categories
+        for row, item in enumerate(rows):
+            if row == next_removed:
+                next_removed = next(removed, None)
+                continue
+            category = categories.get(row)
+            yield item if category is None else relabel(item, category)
+
+    def __iter__(self):
+        return chain(self._base_iter(iter(self.base), _relabel), self.added)
+
+    def __repr__(self):
+        return (
+            f"ForkStorage(base_rows={self.base_rows}, removed={len(self.removed)}, "
+            f"added={len(self.added)})"
+        )
+
+    def append(self, expense):
+        self.added.append(expense)
+
+    def extend(self, expenses):
+        self.added.extend(expenses)
+
+    def extend_columns(self, descriptions, amounts, categories, dates=None):
+        self.added.extend_columns(descriptions, amounts, categories, dates)
+
+    def remove(self, index: int):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("expense index out of range")
+        visible = self._visible_base
+        if index >= visible:
+            return self.added.remove(index - visible)
+        row = self._base_row(index)
+        expense = self._base_expense(row)
+        insort(self.removed, row)
+        self._categories.pop(row, None)
+        return expense.to_expense() if hasattr(expense, "to_expense") else expense
+
+    def set_category(self, index: int, category: str):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("expense index out of range")
+        visible = self._visible_base
+        if index >= visible:
+            self.added.set_category(index - visible, category)
+        else:
+            self._categories[self._base_row(index)] = category
+
+    def detach(self):
+        """
+        Replace the shared base rows with a private in-memory copy.
+
+        Called before the base storage changes its existing rows, so the
+        fork keeps its snapshot while the base is changed in place.
+        """
+        base = self.base
+        rows = islice(base, self.base_rows)
+        if isinstance(self.added, ListStorage):
+            self.base = ListStorage(rows, scale=self.scale)
+        else:
+            self.base = ColumnarStorage(rows, scale=self.scale)
+        if self.owns_base:
+            self.owns_base = False
+            base.close()
+
+    def close(self):
+        """
+        Flush the fork's own rows, and close the base if the fork owns it.
+        """
+        self.added.close()
+        if self.owns_base:
+            self.base.close()
+
+    def iter_columns(self):
+        return chain(
+            self._base_iter(self.base.iter_columns(), _relabel_columns),
+            self.added.iter_columns(),
+        )
+
+    def iter_descriptions(self):
+        return chain(
+            self._base_iter(self.base.iter_descriptions(), _keep_description),
+            self.added.iter_descriptions(),
+        )
+
+
+def _relabel(expense, category):
+    return Expense.from_minor(
+        expense.description, expense.amount_minor, category, expense.date, expense.scale
+    )
+
+
+def _relabel_columns(columns, category):
+    return (category, columns[1], columns[2])
+
+
+def _keep_description(description, category):
+    return description
+
+
+class ExpenseView:
+    """
+    A lightweight, read-only view of one row in a ColumnarStorage.
+
+    Views expose the same attributes as Expense and compare equal to any
+    expense with the same description, amount, category and date.
+    """
+
+    __slots__ = ("_storage", "_row")
+
+    def __init__(self, storage: ColumnarStorage, row: int):
+        """
+        Initialize an ExpenseView instance.
+
+        Args:
+            storage (ColumnarStorage): The storage holding the row.
+            row (int): The row number within the storage.
+        """
+        self._storage = storage
+        self._row = row
+
+    @property
+    def description(self) -> str:
+        return self._storage.description_at(self._row)
+
+    @property
+    def amount(self) -> float:
+        return self._storage.amount_at(self._row)
+
+    @property
+    def amount_minor(self) -> int:
+        return self._storage.amounts[self._row]
+
+    @property
+    def scale(self) -> int:
+        return self._storage.scale
+
+    @property
+    def money(self) -> Money:
+        return Money.from_minor(self.amount_minor, self._storage.scale)
+
+    @property
+    def category(self) -> str:
+        return self._storage.category_at(self._row)
+
+    @property
+    def date(self):
+        return self._storage.date_at(self._row)
+
+    def to_expense(self) -> Expense:
+        """
+        Materialize the row as a standalone Expense object.
+
+        Returns:
+            Expense: A new Expense with the row's values.
+        """
+        return Expense.from_minor(
+            self.description, self.amount_minor, self.category, self.date, self.scale
+        )
+
+    def __eq__(self, other):
+        try:
+            return (
+                self.description == other.description
+                and self.money == other.money
+                and self.category == other.category
+                and self.date == getattr(other, "date", None)
+            )
+        except AttributeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    __str__ = Expense.__str__
+
+
+class ExpenseSequence(Sequence):
+    """
+    The expenses of a budget, as a sequence view of its storage.
+
+    Reads and the storage's aggregate helpers go straight to the storage.
+    ``append`` and ``extend`` go through the budget's add_expense and
+    add_expenses, so its totals and indexes stay in step; the view has no
+    other way to change the expenses.
+    """
+
+    __slots__ = ("_budget",)
+
+    def __init__(self, budget):
+        """
+        Initialize an ExpenseSequence instance.
+
+        Args:
+            budget: The Budget whose expenses to show.
+        """
+        self._budget = budget
+
+    @property
+    def storage(self) -> ExpenseStorage:
+        """
+        The storage backend holding the expenses.
+        """
+        return self._budget._storage
+
+    @property
+    def scale(self) -> int:
+        return self._budget._storage.scale
+
+    def __len__(self):
+        return len(self._budget._storage)
+
+    def __getitem__(self, index):
+        return self._budget._storage[index]
+
+    def __iter__(self):
+        return iter(self._budget._storage)
+
+    def __eq__(self, other):
+        return self._budget._storage == as_storage(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._budget._storage)
+
+    def append(self, expense):
+        """
+        Add an expense through the budget.
+
+        Args:
+            expense: An Expense object to add.
+        """
+        self._budget.add_expense(expense)
+
+    def extend(self, expenses):
+        """
+        Add several expenses through the budget.
+
+        Args:
+            expenses (iterable): The Expense objects to add.
+        """
+        self._budget.add_expenses(expenses)
+
+    def total(self) -> int:
+        return self._budget._storage.total()
+
+    def category_totals(self) -> dict:
+        return self._budget._storage.category_totals()
+
+    def category_summaries(self) -> dict:
+        return self._budget._storage.category_summaries()
+
+    def category_stats(self) -> dict:
+        return self._budget._storage.category_stats()
+
+    def iter_columns(self):
+        return self._budget._storage.iter_columns()
+
+    def iter_descriptions(self):
+        return self._budget._storage.iter_descriptions()
+
+    def dated_rows(self):
+        return self._budget._storage.dated_rows()
+
+
+def as_storage(expenses):
+    """
+    Return the storage behind a budget's expenses view.
+
+    Args:
+        expenses: An ExpenseSequence, or any other sequence of expenses.
+
+    Returns:
+        The view's ExpenseStorage, or the argument unchanged.
+    """
+    return expenses.storage if isinstance(expenses, ExpenseSequence) else expenses
+
+
+def make_storage(storage=None, scale: int = None) -> ExpenseStorage:
+    """
+    Resolve a storage specification into a storage backend.
+
+    Args:
+        storage: None or "list" for a ListStorage, "columnar" for a
+            ColumnarStorage, or an existing ExpenseStorage instance.
+        scale (int, optional): The number of decimal places of the amounts;
+            defaults to 2 for new storages and must match existing ones.
+
+    Returns:
+        ExpenseStorage: The resolved storage backend.
+
+    Raises:
+        ValueError: If the specification is not recognized, or the scale
+            does not match an existing storage.
+    """
+    storage = as_storage(storage)
+    if storage is None or storage == "list":
+        return ListStorage(scale=DEFAULT_SCALE if scale is None else scale)
+    if storage == "columnar":
+        return ColumnarStorage(scale=DEFAULT_SCALE if scale is None else scale)
+    if isinstance(storage, ExpenseStorage):
+        if scale is not None and scale != storage.scale:
+            raise ValueError(f"Storage scale {storage.scale} does not match scale {scale}")
+        return storage
+    raise ValueError(f"Unknown expense storage: {storage!r}")
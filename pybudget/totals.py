@@ -0,0 +1,267 @@
+# pybudget/totals.py
+
+"""
+Incrementally maintained totals for budgets.
+"""
+
+
+class RunningTotal:
+    """
+    A running sum of expense amounts in integer minor units.
+
+    Amounts are whole numbers of minor units (see pybudget.money), so the
+    sum is plain integer addition: exact, independent of insertion order
+    and never drifting however many amounts are added.
+
+    Attributes:
+        count (int): The number of amounts added.
+        value (int): The current total in minor units.
+    """
+
+    __slots__ = ("count", "value")
+
+    def __init__(self):
+        """
+        Initialize an empty RunningTotal.
+        """
+        self.count = 0
+        self.value = 0
+
+    def add(self, amount: int):
+        """
+        Add an amount to the total.
+
+        Args:
+            amount (int): The amount to add, in minor units.
+        """
+        self.count += 1
+        self.value += amount
+
+    def merge(self, total: int, count: int):
+        """
+        Add a pre-aggregated sum of several amounts to the total.
+
+        Args:
+            total (int): The sum of the amounts, in minor units.
+            count (int): The number of amounts in the sum.
+        """
+        self.value += total
+        self.count += count
+
+    def extend(self, amounts):
+        """
+        Add several amounts to the total.
+
+        Args:
+            amounts (sequence): The amounts to add, in minor units.
+        """
+        self.count += len(amounts)
+        self.value += sum(amounts)
+
+    def remove(self, amount: int):
+        """
+        Take a previously added amount out of the total.
+
+        Args:
+            amount (int): The amount to remove, in minor units.
+        """
+        self.count -= 1
+        self.value -= amount
+
+    def copy(self) -> "RunningTotal":
+        """
+        Return an independent copy of the total.
+
+        Returns:
+            RunningTotal: The copy.
+        """
+        total = RunningTotal()
+        total.count = self.count
+        total.value = self.value
+        return total
+
+    def __repr__(self):
+        return f"RunningTotal(value={self.value!r}, count={self.count})"
+
+
+AGGREGATES = ("sum", "count", "mean", "min", "max")
+
+
+class GroupStats:
+    """
+    Incrementally maintained aggregates for one group of expenses.
+
+    Keeps the sum and count in a RunningTotal along with the smallest and
+    largest amounts, all in integer minor units. When a group is seeded
+    from a pre-aggregated sum the extremes are unknown until ``set_bounds``
+    supplies them.
+
+    Attributes:
+        total (RunningTotal): The running sum and count of the group.
+        minimum (int): The smallest amount, or None if unknown.
+        maximum (int): The largest amount, or None if unknown.
+    """
+
+    __slots__ = ("total", "minimum", "maximum")
+
+    def __init__(self):
+        """
+        Initialize an empty GroupStats instance.
+        """
+        self.total = RunningTotal()
+        self.minimum = None
+        self.maximum = None
+
+    @property
+    def count(self) -> int:
+        return self.total.count
+
+    @property
+    def bounded(self) -> bool:
+        """
+        Whether the minimum and maximum are known.
+        """
+        return self.minimum is not None or not self.total.count
+
+    def add(self, amount: int):
+        """
+        Add an amount to the group.
+
+        Args:
+            amount (int): The amount to add, in minor units.
+        """
+        known = self.bounded
+        self.total.add(amount)
+        if known:
+            if self.minimum is None or amount < self.minimum:
+                self.minimum = amount
+            if self.maximum is None or amount > self.maximum:
+                self.maximum = amount
+
+    def extend(self, amounts):
+        """
+        Add several amounts to the group.
+
+        Args:
+            amounts (sequence): The amounts to add, in minor units.
+        """
+        if not amounts:
+            return
+        known = self.bounded
+        self.total.extend(amounts)
+        if known:
+            low, high = min(amounts), max(amounts)
+            self.minimum = low if self.minimum is None else min(self.minimum, low)
+            self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+    def remove(self, amount: int):
+        """
+        Take a previously added amount out of the group.
+
+        Removing the current minimum or maximum leaves that extreme unknown
+        until ``set_bounds`` supplies it again.
+
+        Args:
+            amount (int): The amount to remove, in minor units.
+        """
+        self.total.remove(amount)
+        if amount == self.minimum or amount == self.maximum or not self.total.count:
+            self.minimum = self.maximum = None
+
+    def copy(self) -> "GroupStats":
+        """
+        Return an independent copy of the group's aggregates.
+
+        Returns:
+            GroupStats: The copy.
+        """
+        stats = GroupStats()
+        stats.total = self.total.copy()
+        stats.minimum = self.minimum
+        stats.maximum = self.maximum
+        return stats
+
+    def merge(self, total: int, count: int):
+        """
+        Add a pre-aggregated sum to the group, leaving the extremes unknown.
+
+        Args:
+            total (int): The sum of the amounts, in minor units.
+            count (int): The number of amounts in the sum.
+        """
+        self.total.merge(total, count)
+        self.minimum = self.maximum = None
+
+    def set_bounds(self, minimum: int, maximum: int):
+        """
+        Supply the extremes of a group seeded from a pre-aggregated sum.
+
+        Args:
+            minimum (int): The smallest amount in the group.
+            maximum (int): The largest amount in the group.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def get(self, aggregate: str):
+        """
+        Return one aggregate of the group.
+
+        Args:
+            aggregate (str): One of "sum", "count", "mean", "min" or "max".
+
+        Returns:
+            The aggregate value in minor units (the mean as a float); the
+            mean of an empty group is None.
+
+        Raises:
+            ValueError: If the aggregate is not supported.
+        """
+        if aggregate == "sum":
+            return self.total.value
+        if aggregate == "count":
+            return self.total.count
+        if aggregate == "mean":
+            return self.total.value / self.total.count if self.total.count else None
+        if aggregate == "min":
+            return self.minimum
+        if aggregate == "max":
+            return self.maximum
+        raise ValueError(f"Unsupported aggregate: {aggregate!r}")
+
+    def __repr__(self):
+        return (
+            f"GroupStats(sum={self.total.value!r}, count={self.total.count}, "
+            f"min={self.minimum!r}, max={self.maximum!r})"
+        )
+
+
+def group_stats(pairs, groups: dict = None) -> dict:
+    """
+    Build or update GroupStats for each key from (key, amount) pairs.
+
+    Amounts are first bucketed by key and each bucket is then aggregated
+    in one batch, which is much faster than updating stats row by row.
+
+    Args:
+        pairs (iterable): (group key, amount in minor units) tuples.
+        groups (dict, optional): Existing GroupStats to update in place.
+
+    Returns:
+        dict: A mapping of group key to GroupStats.
+    """
+    buckets = {}
+    for key, amount in pairs:
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [amount]
+        else:
+            bucket.append(amount)
+    if groups is None:
+        groups = {}
+    for key, amounts in buckets.items():
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = GroupStats()
+        stats.extend(amounts)
+    return groups
@@ -4,6 +4,10 @@
 Utility functions for the pybudget module.
 """
 
+import datetime
+
+NO_DATE = 0
+
 
 def validate_amount(amount: float) -> bool:
     """
@@ -18,6 +22,37 @@ def validate_amount(amount: float) -> bool:
     return amount > 0
 
 
+def validate_amounts(amounts) -> bool:
+    """
+    Validate that every amount in a batch is a positive number.
+
+    Applies the same rule as validate_amount to a whole sequence at once.
+
+    Args:
+        amounts (sequence): The amounts to validate.
+
+    Returns:
+        bool: True if all amounts are valid (or there are none), False otherwise.
+    """
+    return not amounts or min(amounts) > 0
+
+
+def first_invalid_amount(amounts) -> int:
+    """
+    Find the position of the first invalid amount in a batch.
+
+    Args:
+        amounts (sequence): The amounts to check.
+
+    Returns:
+        int: The index of the first amount that fails validate_amount, or -1.
+    """
+    for index, amount in enumerate(amounts):
+        if not validate_amount(amount):
+            return index
+    return -1
+
+
 def format_currency(amount: float) -> str:
     """
     Format a number as a currency string.
@@ -29,3 +64,62 @@ def format_currency(amount: float) -> str:
         str: The formatted currency string.
     """
     return f"${amount:.2f}"
+
+
+def date_to_key(date) -> int:
+    """
+    Convert an expense date to the integer key used by indexes and columns.
+
+    Dates are day-granular: a datetime is keyed by its calendar day.
+
+    Args:
+        date (datetime.date): The date to convert, or None.
+
+    Returns:
+        int: The proleptic Gregorian ordinal of the day, or NO_DATE for None.
+    """
+    return NO_DATE if date is None else date.toordinal()
+
+
+def key_to_date(key: int):
+    """
+    Convert an integer date key back into a date.
+
+    Args:
+        key (int): A key produced by date_to_key.
+
+    Returns:
+        datetime.date: The date, or None for NO_DATE.
+    """
+    return None if key == NO_DATE else datetime.date.fromordinal(key)
+
+
+def month_of(date) -> tuple:
+    """
+    Return the calendar month of a date, as used for monthly grouping.
+
+    Args:
+        date (datetime.date): The date.
+
+    Returns:
+        tuple: A (year, month) tuple.
+    """
+    return date.year, date.month
+
+
+def parse_date(value):
+    """
+    Parse an ISO 8601 date string as found in expense files.
+
+    Args:
+        value (str): The date string; empty strings and None mean no date.
+
+    Returns:
+        datetime.date: The parsed date, or None.
+
+    Raises:
+        ValueError: If the string is not a valid ISO date.
+    """
+    if not value:
+        return None
+    return datetime.date.fromisoformat(value[:10])
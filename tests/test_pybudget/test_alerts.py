@@ -0,0 +1,126 @@
+# tests/test_pybudget/test_alerts.py
+
+"""
+Unit tests for threshold alerts in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import threading
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.concurrent import ConcurrentBudget
+from pybudget.expense import Expense
+
+
+class TestThresholdAlerts(unittest.TestCase):
+    """
+    Test cases for Budget threshold alerts.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.budget = Budget("Monthly", 1000)
+        self.alerts = []
+
+    def tearDown(self):
+        """
+        Stop the alert worker.
+        """
+        self.budget.close()
+
+    def received(self):
+        """
+        Wait for queued alerts and return (category, threshold) pairs.
+        """
+        self.budget.alerts.join()
+        return [(alert.category, alert.threshold) for alert in self.alerts]
+
+    def test_crossing_fires_once(self):
+        """
+        Test that each threshold fires once, including several in one expense.
+        """
+        self.budget.add_threshold_alert(self.alerts.append)
+        self.budget.add_expense(Expense("Rent", 400, "Housing"))
+        self.assertEqual(self.received(), [])
+        self.budget.add_expense(Expense("Food", 100, "Food"))
+        self.assertEqual(self.received(), [(None, 0.5)])
+        self.budget.add_expense(Expense("Food", 50, "Food"))
+        self.budget.add_expense(Expense("Car", 500, "Transport"))
+        self.assertEqual(self.received(), [(None, 0.5), (None, 0.8), (None, 1.0)])
+        self.assertEqual(self.alerts[-1].spent_minor, 105000)
+        self.assertAlmostEqual(self.alerts[-1].utilization, 1.05)
+        self.budget.add_expense(Expense("Car", 500, "Transport"))
+        self.assertEqual(len(self.received()), 3)
+
+    def test_category_limits_and_rearm(self):
+        """
+        Test per-category limits, and thresholds re-arming after spend falls.
+        """
+        self.budget.add_expense(Expense("Lunch", 60, "Food"))
+        self.budget.add_threshold_alert(self.alerts.append, [0.5, 1.0], category="Food", limit=100)
+        with self.assertRaises(ValueError):
+            self.budget.add_threshold_alert(self.alerts.append, category="Travel")
+        self.budget.add_expense(Expense("Taxi", 90, "Transport"))
+        self.budget.add_expense(Expense("Dinner", 40, "Food"))
+        self.assertEqual(self.received(), [("Food", 1.0)])
+        self.budget.remove_expense(2)
+        self.budget.add_expense(Expense("Dinner", 45, "Food"))
+        self.assertEqual(self.received(), [("Food", 1.0), ("Food", 1.0)])
+        self.budget.recategorize(0, "Misc")
+        self.budget.recategorize(0, "Food")
+        self.assertEqual(len(self.received()), 4)
+
+    def test_amount_change_and_unsubscribe(self):
+        """
+        Test that lowering the budget fires newly reached thresholds.
+        """
+        handle = self.budget.add_threshold_alert(self.alerts.append)
+        self.budget.add_expense(Expense("Rent", 600, "Housing"))
+        self.budget.amount = 700
+        self.assertEqual(self.received(), [(None, 0.5), (None, 0.8)])
+        self.budget.remove_threshold_alert(handle)
+        with self.assertRaises(ValueError):
+            self.budget.remove_threshold_alert(handle)
+        self.budget.amount = 500
+        self.assertEqual(len(self.received()), 2)
+
+    def test_concurrent_budget_merges_before_checking(self):
+        """
+        Test that thresholds reached by buffered rows do not fire on subscribing.
+        """
+        budget = ConcurrentBudget("Shared", 1000, merge_every=100)
+        budget.add_expense(Expense("Lunch", 60, "Food"))
+        budget.add_threshold_alert(self.alerts.append, [0.5], category="Food", limit=100)
+        budget.add_expense(Expense("Snack", 5, "Food"))
+        self.assertEqual(budget.get_category_total_minor("Food"), 6500)
+        budget.alerts.join()
+        self.assertEqual(self.alerts, [])
+        budget.close()
+
+    def test_slow_callback_does_not_block(self):
+        """
+        Test that a blocked callback neither stops ingestion nor grows the queue.
+        """
+        release = threading.Event()
+        self.budget.add_threshold_alert(lambda alert: release.wait(), [0.1], maxsize=2)
+        self.budget.add_threshold_alert(self.alerts.append, [0.1])
+        for amount in (100, 1):
+            for _ in range(3):
+                self.budget.add_expense(Expense("Item", amount, "Misc"))
+                self.budget.remove_expense(0)
+        self.assertEqual(len(self.budget.expenses), 0)
+        self.assertGreater(self.budget.alerts.dropped, 0)
+        release.set()
+        self.budget.alerts.join()
+        self.assertEqual(self.budget.alerts.failed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
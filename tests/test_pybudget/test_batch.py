@@ -0,0 +1,127 @@
+# tests/test_pybudget/test_batch.py
+
+"""
+Unit tests for the batch module in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import datetime
+import tempfile
+import unittest
+import zipfile
+
+from pybudget.batch import balanced_chunks, generate_reports, report_filename
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.hierarchy import BudgetTree
+from pybudget.portfolio import BudgetPortfolio
+from pybudget.reports import generate_report, iter_report
+
+
+class TestBatchReports(unittest.TestCase):
+    """
+    Test cases for parallel batch report generation.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.budgets = []
+        for i in range(6):
+            storage = "columnar" if i % 2 else None
+            budget = Budget(f"Cost Center {i}", 1000.0 * (i + 1), storage=storage)
+            for j in range(i * 10):
+                budget.add_expense(
+                    Expense(f"Item {j}", 1.5 + j, "Ops", datetime.date(2024, 1, 1 + j % 28))
+                )
+            self.budgets.append(budget)
+
+    def tearDown(self):
+        """
+        Clean up test fixtures.
+        """
+        self.tmp.cleanup()
+
+    def test_balanced_chunks(self):
+        """
+        Test that chunks are balanced by size and cover every item once.
+        """
+        sizes = [100, 1, 1, 50, 50, 1]
+        chunks = balanced_chunks(sizes, 2)
+        self.assertEqual(sorted(i for chunk in chunks for i in chunk), list(range(6)))
+        loads = [sum(sizes[i] for i in chunk) for chunk in chunks]
+        self.assertLessEqual(abs(loads[0] - loads[1]), 2)
+        self.assertEqual(balanced_chunks([], 4), [])
+
+    def test_report_filename(self):
+        """
+        Test that report file names are ordered and safe.
+        """
+        self.assertEqual(report_filename(3, "Sales / EMEA", "csv"), "0003-Sales_EMEA.csv")
+        self.assertEqual(report_filename(0, "../", "text"), "0000-budget.txt")
+
+    def test_per_budget_files_in_parallel(self):
+        """
+        Test writing one report file per budget with a process pool.
+        """
+        paths = generate_reports(self.budgets, output_dir=self.tmp.name, workers=2)
+        self.assertEqual(len(paths), 6)
+        for path, budget in zip(paths, self.budgets):
+            with open(path, encoding="utf-8") as fp:
+                self.assertEqual(fp.read(), generate_report(budget))
+
+    def test_archive_in_process(self):
+        """
+        Test writing all reports into a single archive.
+        """
+        archive = os.path.join(self.tmp.name, "reports.zip")
+        names = generate_reports(self.budgets, archive=archive, fmt="csv", workers=1)
+        with zipfile.ZipFile(archive) as zf:
+            self.assertEqual(zf.namelist(), names)
+            content = zf.read(names[2]).decode("utf-8")
+        self.assertEqual(content, "".join(iter_report(self.budgets[2], "csv")))
+
+    def test_portfolio_views(self):
+        """
+        Test generating reports for budgets inside a portfolio.
+        """
+        portfolio = BudgetPortfolio.from_budgets(self.budgets[:3])
+        paths = generate_reports(list(portfolio), output_dir=self.tmp.name, workers=2)
+        with open(paths[2], encoding="utf-8") as fp:
+            self.assertEqual(fp.read(), generate_report(self.budgets[2]))
+
+    def test_tree_nodes(self):
+        """
+        Test that reports of tree nodes keep the nodes' own remaining amounts.
+        """
+        tree = BudgetTree()
+        tree.add_budget("Company", 1000)
+        tree.add_budget("Sales", 500, parent="Company")
+        tree["Sales"].budget.add_expense(Expense("Flight", 100, "Travel"))
+        nodes = [tree["Company"], tree["Sales"]]
+        for workers in (1, 2):
+            paths = generate_reports(nodes, output_dir=self.tmp.name, workers=workers)
+            for path, node in zip(paths, nodes):
+                with open(path, encoding="utf-8") as fp:
+                    self.assertEqual(fp.read(), generate_report(node))
+        with open(paths[0], encoding="utf-8") as fp:
+            self.assertIn("Remaining Budget: $900.00", fp.read())
+
+    def test_invalid_arguments(self):
+        """
+        Test that invalid output options are rejected.
+        """
+        with self.assertRaises(ValueError):
+            generate_reports(self.budgets)
+        with self.assertRaises(ValueError):
+            generate_reports(self.budgets, output_dir=self.tmp.name, fmt="xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,8 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
+import copy
+import datetime
 import unittest
 
 from pybudget.budget import Budget
@@ -43,6 +45,40 @@ class TestBudget(unittest.TestCase):
         self.assertEqual(len(self.budget.expenses), 1)
         self.assertEqual(self.budget.expenses[0], expense)
 
+    def test_append_through_expenses_view(self):
+        """
+        Test that appending to budget.expenses goes through the budget.
+        """
+        expense = Expense("Test Expense", 100.0, "Test Category")
+        self.budget.expenses.append(expense)
+        self.budget.expenses.extend([Expense("Other", 50.0, "Test Category")])
+        self.assertEqual(self.budget.get_remaining_amount(), 850.0)
+        self.assertEqual(self.budget.expenses[0], expense)
+        self.assertTrue(self.budget.verify_totals())
+        self.assertFalse(hasattr(self.budget.expenses, "remove"))
+
+    def test_stored_expense_amount_is_frozen(self):
+        """
+        Test that an expense kept by the budget cannot change its amount.
+        """
+        expense = Expense("Test Expense", 100.0, "Test Category")
+        expense.amount = 120.0
+        self.budget.add_expense(expense)
+        with self.assertRaises(ValueError):
+            expense.amount = 10.0
+        with self.assertRaises(ValueError):
+            expense.amount_minor = 1000
+        self.assertEqual(self.budget.get_remaining_amount(), 880.0)
+        self.assertTrue(self.budget.verify_totals())
+        copied = copy.copy(expense)
+        copied.amount = 10.0
+        self.assertEqual(copied.amount, 10.0)
+        columnar = Budget("Columnar", 1000.0, storage="columnar")
+        loose = Expense("Loose", 5.0, "Test Category")
+        columnar.add_expense(loose)
+        loose.amount = 6.0
+        self.assertEqual(columnar.get_total_expenses(), 5.0)
+
     def test_get_remaining_amount(self):
         """
         Test calculating the remaining amount in the budget.
@@ -61,6 +97,72 @@ class TestBudget(unittest.TestCase):
         remaining = self.budget.get_remaining_amount()
         self.assertEqual(remaining, 1000.0)
 
+    def test_category_totals(self):
+        """
+        Test the incrementally maintained per-category totals.
+        """
+        self.budget.add_expense(Expense("Lunch", 20.0, "Food"))
+        self.budget.add_expense(Expense("Dinner", 30.0, "Food"))
+        self.budget.add_expense(Expense("Bus", 5.0, "Transport"))
+        self.assertEqual(self.budget.get_total_expenses(), 55.0)
+        self.assertEqual(self.budget.get_category_total("Food"), 50.0)
+        self.assertEqual(self.budget.get_category_total("Unknown"), 0.0)
+        self.assertEqual(
+            self.budget.get_category_totals(), {"Food": 50.0, "Transport": 5.0}
+        )
+        self.assertTrue(self.budget.verify_totals())
+
+    def test_exact_totals_do_not_drift(self):
+        """
+        Test that exact mode keeps the correctly rounded total.
+        """
+        budget = Budget("Exact Budget", 1000.0, exact=True)
+        for _ in range(10):
+            budget.add_expense(Expense("Coffee", 0.1, "Food"))
+        self.assertEqual(budget.get_total_expenses(), 1.0)
+        self.assertEqual(budget.get_remaining_amount(), 999.0)
+        self.assertTrue(budget.verify_totals())
+
+    def test_add_expenses(self):
+        """
+        Test adding a batch of expenses.
+        """
+        expenses = [
+            Expense("Lunch", 20.0, "Food"),
+            Expense("Bus", 5.0, "Transport"),
+        ]
+        self.budget.add_expenses(expenses)
+        self.assertEqual(len(self.budget.expenses), 2)
+        self.assertIs(self.budget.expenses[1], expenses[1])
+        self.assertEqual(self.budget.get_remaining_amount(), 975.0)
+        self.assertTrue(self.budget.verify_totals())
+
+    def test_add_expenses_rejects_invalid_batch(self):
+        """
+        Test that an invalid batch leaves the budget unchanged.
+        """
+        with self.assertRaises(ValueError):
+            self.budget.add_expenses(
+                [Expense("Lunch", 20.0, "Food"), Expense("Refund", -5.0, "Food")]
+            )
+        self.assertEqual(len(self.budget.expenses), 0)
+        self.assertEqual(self.budget.get_remaining_amount(), 1000.0)
+
+    def test_add_columns(self):
+        """
+        Test adding expenses as parallel columns.
+        """
+        budget = Budget("Columnar Budget", 1000.0, storage="columnar")
+        budget.add_columns(
+            ["Lunch", "Bus", "Dinner"], [20.0, 5.0, 30.0], ["Food", "Transport", "Food"]
+        )
+        self.assertEqual(len(budget.expenses), 3)
+        self.assertEqual(budget.expenses[2].description, "Dinner")
+        self.assertEqual(budget.get_category_total("Food"), 50.0)
+        self.assertTrue(budget.verify_totals())
+        with self.assertRaises(ValueError):
+            budget.add_columns(["Lunch"], [20.0, 5.0], ["Food"])
+
     def test_str_representation(self):
         """
         Test the string representation of the budget.
@@ -71,5 +173,89 @@ class TestBudget(unittest.TestCase):
         )
 
 
+class TestBudgetFork(unittest.TestCase):
+    """
+    Test cases for copy-on-write budget forks and expense removal.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.budget = Budget("Plan", 1000.0, storage="columnar")
+        self.budget.add_columns(
+            ["Rent", "Lunch", "Bus"],
+            [600.0, 20.0, 5.0],
+            ["Housing", "Food", "Transport"],
+            [datetime.date(2024, 3, 1), datetime.date(2024, 3, 2), None],
+        )
+
+    def test_fork_is_independent(self):
+        """
+        Test that changes to a fork and its parent do not leak across.
+        """
+        fork = self.budget.fork("Scenario")
+        fork.add_columns(["Hotel"] * 2, [150.0, 150.0], ["Travel"] * 2)
+        fork.remove_expense(0)
+        self.budget.add_expense(Expense("Dinner", 30.0, "Food"))
+        self.assertIs(fork.expenses.storage.base, self.budget.expenses.storage)
+        self.assertEqual(fork.name, "Scenario")
+        self.assertEqual(fork.get_total_expenses(), 325.0)
+        self.assertEqual(
+            fork.get_category_totals(), {"Food": 20.0, "Transport": 5.0, "Travel": 300.0}
+        )
+        self.assertEqual(self.budget.get_total_expenses(), 655.0)
+        self.assertTrue(fork.verify_totals())
+        self.assertTrue(self.budget.verify_totals())
+
+    def test_parent_removal_after_fork(self):
+        """
+        Test that removing from a forked parent leaves the fork unchanged.
+        """
+        fork = self.budget.fork()
+        storage = self.budget.expenses.storage
+        self.budget.remove_expense(1)
+        self.assertIs(self.budget.expenses.storage, storage)
+        self.assertEqual([e.description for e in self.budget.expenses], ["Rent", "Bus"])
+        self.assertEqual([e.description for e in fork.expenses], ["Rent", "Lunch", "Bus"])
+        self.assertEqual(fork.get_total_between(datetime.date(2024, 3, 2)), 20.0)
+        self.assertEqual(self.budget.get_total_between(datetime.date(2024, 3, 2)), 0.0)
+
+    def test_remove_expense(self):
+        """
+        Test that removal updates totals, indexes and grouped aggregates.
+        """
+        removed = self.budget.remove_expense(-1)
+        self.assertEqual(removed.description, "Bus")
+        self.assertEqual(self.budget.get_remaining_amount(), 380.0)
+        self.assertNotIn("Transport", self.budget.get_category_totals())
+        self.assertEqual(self.budget.get_category_rows("Food").tolist(), [1])
+        self.budget.get_category_rows("Food").append(0)
+        self.assertEqual(len(self.budget.get_category_expenses("Food")), 1)
+        self.assertEqual(self.budget.aggregate("month")[(2024, 3)]["count"], 2)
+        self.assertEqual(self.budget.rows_version, 1)
+        with self.assertRaises(IndexError):
+            self.budget.remove_expense(5)
+
+    def test_recategorize(self):
+        """
+        Test that recategorizing moves totals and leaves forks unchanged.
+        """
+        fork = self.budget.fork()
+        events = []
+        self.budget.add_listener(lambda budget, event, data: events.append((event, data)))
+        self.budget.recategorize(1, "Dining")
+        self.assertEqual(self.budget.expenses[1].category, "Dining")
+        self.assertEqual(self.budget.get_category_total("Dining"), 20.0)
+        self.assertNotIn("Food", self.budget.get_category_totals())
+        self.assertEqual(self.budget.get_category_rows("Dining").tolist(), [1])
+        self.assertEqual(fork.expenses[1].category, "Food")
+        self.assertEqual(events, [("recategorize", {"index": 1, "category": "Dining"})])
+        self.assertTrue(self.budget.verify_totals())
+        fork.recategorize(0, "Rent")
+        self.assertEqual(fork.get_category_totals()["Rent"], 600.0)
+        self.assertEqual(self.budget.expenses[0].category, "Housing")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,116 @@
+# tests/test_pybudget/test_categorizer.py
+
+"""
+Unit tests for the rule-based categorizer in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import io
+import random
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.categorizer import Categorizer
+
+
+class TestCategorizer(unittest.TestCase):
+    """
+    Test cases for the Categorizer class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.categorizer = Categorizer(
+            [
+                ("uber", "Transport"),
+                ("uber eats", "Food"),
+                ("eats", "Food"),
+                ("amzn", "Shopping"),
+                ("amzn prime video", "Entertainment", 5),
+                ("shell", "Fuel", 1),
+                ("hell", "Misc"),
+            ]
+        )
+
+    def test_rule_precedence(self):
+        """
+        Test that priority, then keyword length, then rule order decide matches.
+        """
+        self.assertEqual(self.categorizer.match("UBER *TRIP 8841"), "Transport")
+        self.assertEqual(self.categorizer.match("Uber Eats Order"), "Food")
+        self.assertEqual(self.categorizer.match("AMZN Prime Video Rental"), "Entertainment")
+        self.assertEqual(self.categorizer.match("AMZN Mktp"), "Shopping")
+        self.assertEqual(self.categorizer.match("SHELL OIL 123"), "Fuel")
+        self.assertEqual(self.categorizer.match("Hello"), "Misc")
+        self.assertIsNone(self.categorizer.match("Corner shop"))
+        self.assertEqual(self.categorizer.categorize("Corner shop"), "Uncategorized")
+        self.assertEqual(self.categorizer.categorize("Corner shop", "Groceries"), "Groceries")
+        with self.assertRaises(ValueError):
+            self.categorizer.add_rule("", "Nothing")
+
+    def test_matches_naive_scan(self):
+        """
+        Test the automaton against checking every rule on random descriptions.
+        """
+        rng = random.Random(11)
+        alphabet = "abc "
+        rules = [
+            ("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))), f"C{i}", i % 3)
+            for i in range(60)
+        ]
+        rules = [rule for rule in rules if rule[0].strip()]
+        categorizer = Categorizer(rules)
+        ranked = sorted(
+            enumerate(rules), key=lambda item: (item[1][2], len(item[1][0]), -item[0])
+        )
+        for _ in range(300):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            expected = None
+            for _, (keyword, category, _) in ranked:
+                if keyword in text:
+                    expected = category
+            self.assertEqual(categorizer.match(text), expected, text)
+
+    def test_categorize_many(self):
+        """
+        Test batch categorization with fallbacks and a small cache.
+        """
+        categorizer = Categorizer([("uber", "Transport")], cache_size=2)
+        result = categorizer.categorize_many(
+            ["Uber", "Deli", "Deli", "Bakery", "UBER"], ["", "Food", "", "", "Misc"]
+        )
+        self.assertEqual(
+            result, ["Transport", "Food", "Uncategorized", "Uncategorized", "Transport"]
+        )
+        self.assertEqual(categorizer.categorize_many(["Deli"]), ["Uncategorized"])
+        categorizer.add_rule("deli", "Food")
+        self.assertEqual(categorizer.categorize_many(["Deli"]), ["Food"])
+
+    def test_bulk_ingestion(self):
+        """
+        Test categorizing expenses while loading files without categories.
+        """
+        data = "description,amount\nUber trip,12.5\nUber Eats,20.0\nRent,900\n"
+        budget = Budget.from_csv(
+            io.StringIO(data), "Imported", 2000.0, categorizer=self.categorizer
+        )
+        self.assertEqual(
+            budget.get_category_totals(),
+            {"Transport": 12.5, "Food": 20.0, "Uncategorized": 900.0},
+        )
+        data = '{"description": "AMZN Mktp", "amount": 30, "category": "Gifts"}\n'
+        data += '{"description": "Flowers", "amount": 15, "category": "Gifts"}\n'
+        budget = Budget.from_jsonl(
+            io.StringIO(data), "Imported", 2000.0, categorizer=self.categorizer
+        )
+        self.assertEqual([e.category for e in budget.expenses], ["Shopping", "Gifts"])
+
+
+if __name__ == "__main__":
+    unittest.main()
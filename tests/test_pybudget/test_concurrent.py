@@ -0,0 +1,96 @@
+# tests/test_pybudget/test_concurrent.py
+
+"""
+Unit tests for the thread-safe budget in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import datetime
+import threading
+import unittest
+
+from pybudget.concurrent import ConcurrentBudget
+from pybudget.expense import Expense
+
+
+class TestConcurrentBudget(unittest.TestCase):
+    """
+    Test cases for the ConcurrentBudget class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.budget = ConcurrentBudget("Shared", 100000.0, storage="columnar", merge_every=64)
+
+    def _ingest(self, threads: int, rows: int):
+        def worker(number):
+            category = f"Thread {number}"
+            for i in range(rows):
+                if i % 2:
+                    self.budget.add_expense(Expense("Item", 1.25, category))
+                else:
+                    self.budget.add_columns(["Item"], [1.25], [category])
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for thread in workers:
+            thread.start()
+        return workers
+
+    def test_threads_add_every_expense(self):
+        """
+        Test that expenses added from many threads are all merged.
+        """
+        for thread in self._ingest(8, 500):
+            thread.join()
+        self.assertEqual(len(self.budget.expenses), 4000)
+        self.assertEqual(self.budget.get_total_expenses(), 5000.0)
+        self.assertEqual(self.budget.get_category_total("Thread 3"), 625.0)
+        self.assertTrue(self.budget.verify_totals())
+        self.assertEqual(self.budget.snapshot()["count"], 4000)
+
+    def test_snapshot_is_consistent_during_writes(self):
+        """
+        Test that snapshots taken while threads write always agree with themselves.
+        """
+        workers = self._ingest(4, 2000)
+        while any(thread.is_alive() for thread in workers):
+            snapshot = self.budget.snapshot()
+            self.assertEqual(snapshot["total"], 125 * snapshot["count"])
+            self.assertEqual(sum(snapshot["categories"].values()), snapshot["total"])
+            self.assertEqual(snapshot["remaining"], 10000000 - snapshot["total"])
+        for thread in workers:
+            thread.join()
+        self.assertEqual(self.budget.snapshot()["count"], 8000)
+
+    def test_reads_see_buffered_expenses(self):
+        """
+        Test that a read merges expenses still buffered by the writing thread.
+        """
+        self.budget.add_expense(Expense("Lunch", 12.5, "Food", datetime.date(2024, 5, 2)))
+        self.budget.add_columns(["Rent"], [900.0], ["Housing"])
+        self.assertEqual(self.budget.get_total_between(datetime.date(2024, 5, 1)), 12.5)
+        self.assertEqual(self.budget.get_remaining_amount(), 99087.5)
+        self.assertEqual([e.description for e in self.budget.expenses], ["Lunch", "Rent"])
+        with self.assertRaises(ValueError):
+            self.budget.add_columns(["Refund"], [-5.0], ["Food"])
+
+    def test_fork_is_thread_safe(self):
+        """
+        Test that a fork merges pending expenses and can be shared itself.
+        """
+        self.budget.add_columns(["Rent"], [900.0], ["Housing"])
+        fork = self.budget.fork("Scenario")
+        self.assertIsInstance(fork, ConcurrentBudget)
+        fork.add_expense(Expense("Hotel", 100.0, "Travel"))
+        self.assertEqual(fork.get_total_expenses(), 1000.0)
+        self.assertEqual(self.budget.get_total_expenses(), 900.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+# tests/test_pybudget/test_events.py
+
+"""
+Unit tests for the event-sourced budget history in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import datetime
+import tempfile
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.events import EventLog
+from pybudget.expense import Expense
+from pybudget.mapped import MappedStorage
+
+
+class FakeClock:
+    """
+    A clock that advances one minute per call.
+    """
+
+    def __init__(self):
+        self.now = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def __call__(self):
+        self.now += datetime.timedelta(minutes=1)
+        return self.now
+
+
+class TestEventLog(unittest.TestCase):
+    """
+    Test cases for recording, checkpointing and replaying budget events.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "history")
+        self.log = EventLog(self.directory, checkpoint_every=3, clock=FakeClock())
+        self.budget = Budget("Household", 1000.0)
+        self.log.attach(self.budget)
+        self.budget.add_expense(Expense("Rent", 600.0, "Housing", datetime.date(2024, 3, 1)))
+        self.budget.add_columns(["Lunch", "Bus"], [20.0, 5.0], ["Food", "Transport"])
+        self.budget.amount = 1200.0
+        self.budget.recategorize(1, "Dining")
+        self.budget.remove_expense(2)
+        self.budget.name = "Home"
+        self.budget.add_expense(Expense("Coffee", 3.5, "Dining"))
+        self.log.close()
+
+    def tearDown(self):
+        """
+        Clean up test fixtures.
+        """
+        self.tmp.cleanup()
+
+    def test_load_rebuilds_latest_state(self):
+        """
+        Test that loading from a checkpoint and the tail gives the same budget.
+        """
+        log = EventLog(self.directory, checkpoint_every=3)
+        self.assertEqual(log.seq, 7)
+        self.assertEqual([entry["seq"] for entry in log.checkpoints], [0, 3, 6])
+        budget = log.load()
+        self.assertIsInstance(budget.expenses.storage.base, MappedStorage)
+        self.assertEqual(len(budget.expenses.storage.added), 1)
+        self.assertEqual(budget.name, "Home")
+        self.assertEqual(budget.amount, 1200.0)
+        self.assertEqual(list(budget.expenses), list(self.budget.expenses))
+        self.assertEqual(budget.get_category_totals(), self.budget.get_category_totals())
+        self.assertEqual(budget.expenses[0].date, datetime.date(2024, 3, 1))
+        self.assertTrue(budget.verify_totals())
+        budget.add_expense(Expense("Tea", 2.0, "Dining"))
+        log.close()
+        self.assertEqual(EventLog(self.directory).load().get_total_expenses(), 625.5)
+
+    def test_load_only_restores_latest_state(self):
+        """
+        Test that load cannot rewind the budget it keeps recording.
+        """
+        log = EventLog(self.directory)
+        with self.assertRaises(TypeError):
+            log.load(seq=2)
+        budget = log.load(exact=True)
+        self.assertTrue(budget.exact)
+        self.assertEqual(len(budget.expenses), 3)
+        log.close()
+
+    def test_point_in_time_replay(self):
+        """
+        Test that replaying to a sequence number or time restores older states.
+        """
+        before_removal = self.log.replay(seq=4)
+        self.assertEqual(before_removal.name, "Household")
+        self.assertEqual(len(before_removal.expenses), 3)
+        self.assertEqual(before_removal.expenses[1].category, "Dining")
+        self.assertEqual(before_removal.get_total_expenses(), 625.0)
+        initial = self.log.replay(seq=0)
+        self.assertEqual(len(initial.expenses), 0)
+        self.assertEqual(initial.amount, 1000.0)
+        moment = datetime.datetime.fromisoformat(list(self.log.events())[1]["time"])
+        self.assertEqual(len(self.log.replay(until=moment).expenses), 3)
+
+    def test_replay_releases_checkpoint_on_close(self):
+        """
+        Test that closing a replayed budget closes its checkpoint mapping.
+        """
+        budget = self.log.replay(seq=4)
+        fork = budget.fork()
+        storage = budget.expenses.storage.base
+        self.assertIsInstance(storage, MappedStorage)
+        budget.close()
+        self.assertTrue(storage._mmap.closed)
+        self.assertEqual(len(fork.expenses), 3)
+        self.assertEqual(fork.expenses[1].category, "Dining")
+
+    def test_events_form_audit_trail(self):
+        """
+        Test that every change is kept in order even after checkpoints.
+        """
+        events = list(self.log.events())
+        self.assertEqual([event["seq"] for event in events], list(range(1, 8)))
+        self.assertEqual(
+            [event["event"] for event in events],
+            ["add", "add", "amount", "recategorize", "remove", "name", "add"],
+        )
+        self.assertEqual(events[1]["amounts"], [2000, 500])
+        self.assertEqual([event["seq"] for event in self.log.events(start=5)], [6, 7])
+
+    def test_torn_write_is_ignored(self):
+        """
+        Test that a partially written last event is dropped on load.
+        """
+        path = os.path.join(self.directory, "events-000000000006.jsonl")
+        with open(path, "a", encoding="utf-8") as fp:
+            fp.write('{"seq": 8, "event": "ad')
+        log = EventLog(self.directory)
+        budget = log.load()
+        self.assertEqual(log.seq, 7)
+        budget.amount = 900.0
+        log.close()
+        self.assertEqual(EventLog(self.directory).load().amount, 900.0)
+
+    def test_attach_requires_empty_log(self):
+        """
+        Test that attaching a second budget to an existing history fails.
+        """
+        with self.assertRaises(ValueError):
+            EventLog(self.directory).attach(Budget("Other", 10.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
+import datetime
 import unittest
 
 from pybudget.expense import Expense
@@ -32,6 +33,7 @@ class TestExpense(unittest.TestCase):
         self.assertEqual(self.expense.description, "Test Expense")
         self.assertEqual(self.expense.amount, 100.0)
         self.assertEqual(self.expense.category, "Test Category")
+        self.assertIsNone(self.expense.date)
 
     def test_str_representation(self):
         """
@@ -43,6 +45,16 @@ class TestExpense(unittest.TestCase):
             "Expense(description='Test Expense', amount=100.0, category='Test Category')",
         )
 
+    def test_str_representation_with_date(self):
+        """
+        Test the string representation of a dated expense.
+        """
+        expense = Expense("Rent", 1200.0, "Housing", datetime.date(2024, 3, 1))
+        self.assertEqual(
+            str(expense),
+            "Expense(description='Rent', amount=1200.0, category='Housing', date='2024-03-01')",
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
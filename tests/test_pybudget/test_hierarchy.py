@@ -0,0 +1,110 @@
+# tests/test_pybudget/test_hierarchy.py
+
+"""
+Unit tests for hierarchical budgets in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.hierarchy import BudgetTree
+from pybudget.reports import generate_report
+
+
+class TestBudgetTree(unittest.TestCase):
+    """
+    Test cases for the BudgetTree class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.tree = BudgetTree()
+        self.tree.add_budget("Company", 10000)
+        self.tree.add_budget("Engineering", 6000, parent="Company")
+        self.tree.add_budget("Sales", 3000, parent="Company")
+        self.tree.add_budget("Platform", 2000, parent="Engineering")
+        self.tree.add_budget("Mobile", 2000, parent="Engineering")
+
+    def test_rollup_along_path(self):
+        """
+        Test that expenses on a leaf update every ancestor's subtree total.
+        """
+        self.tree["Platform"].add_expense(Expense("Servers", 500, "Infra"))
+        self.tree["Mobile"].add_expenses([Expense("Phones", 300, "Devices")] * 2)
+        self.tree["Company"].add_expense(Expense("Office", 1000, "Rent"))
+        self.assertEqual(self.tree["Engineering"].get_total_expenses(), 1100)
+        self.assertEqual(self.tree["Company"].get_total_expenses(), 2100)
+        self.assertEqual(self.tree["Company"].get_remaining_amount(), 7900)
+        self.assertEqual(self.tree["Sales"].get_total_expenses(), 0)
+        self.tree["Mobile"].budget.remove_expense(0)
+        self.assertEqual(self.tree["Company"].subtree_total_minor, 180000)
+        self.assertTrue(self.tree.verify_totals())
+        self.assertEqual(self.tree["Platform"].path(), ["Company", "Engineering", "Platform"])
+        self.assertEqual(self.tree["Platform"].depth, 2)
+        self.assertEqual(
+            [node.name for node in self.tree],
+            ["Company", "Engineering", "Platform", "Mobile", "Sales"],
+        )
+
+    def test_reparent(self):
+        """
+        Test that moving a subtree moves its total between ancestor chains.
+        """
+        self.tree["Mobile"].add_expense(Expense("Phones", 400, "Devices"))
+        self.tree.add_budget("Field", 500, parent="Mobile")
+        self.tree["Field"].add_expense(Expense("Travel", 100, "Travel"))
+        self.tree.reparent("Mobile", "Sales")
+        self.assertEqual(self.tree["Engineering"].get_total_expenses(), 0)
+        self.assertEqual(self.tree["Sales"].get_total_expenses(), 500)
+        self.assertEqual(self.tree["Company"].get_total_expenses(), 500)
+        self.assertTrue(self.tree.verify_totals())
+        with self.assertRaises(ValueError):
+            self.tree.reparent("Sales", "Field")
+        self.tree.reparent("Field", None)
+        self.assertEqual(self.tree["Company"].get_total_expenses(), 400)
+        self.assertEqual([node.name for node in self.tree.roots], ["Company", "Field"])
+
+    def test_existing_budgets_and_removal(self):
+        """
+        Test adding a budget with expenses, renaming it and removing it.
+        """
+        budget = Budget("Research", 1000)
+        budget.add_expense(Expense("Lab", 250, "Equipment"))
+        node = self.tree.add(budget, parent="Engineering")
+        self.assertEqual(self.tree["Company"].get_total_expenses(), 250)
+        self.assertIn("Research", generate_report(node, cache=None))
+        budget.name = "R&D"
+        self.assertIs(self.tree["R&D"], node)
+        renames = []
+        budget.add_listener(lambda _, event, data: renames.append(data.get("name")))
+        with self.assertRaises(ValueError):
+            budget.name = "Sales"
+        with self.assertRaises(ValueError):
+            self.tree.rename("R&D", "Company")
+        self.assertEqual(budget.name, "R&D")
+        self.assertIs(self.tree["R&D"], node)
+        self.tree.rename("R&D", "Labs")
+        self.tree.rename("Labs", "R&D")
+        self.assertEqual(renames, ["Labs", "R&D"])
+        self.assertEqual(len(self.tree), 6)
+        with self.assertRaises(ValueError):
+            self.tree.add_budget("Sales", 10)
+        with self.assertRaises(ValueError):
+            self.tree.remove("Engineering")
+        self.assertIs(self.tree.remove("R&D"), budget)
+        self.assertEqual(self.tree["Company"].get_total_expenses(), 0)
+        budget.add_expense(Expense("Lab", 250, "Equipment"))
+        self.assertEqual(self.tree["Company"].get_total_expenses(), 0)
+        self.assertNotIn("R&D", self.tree)
+
+
+if __name__ == "__main__":
+    unittest.main()
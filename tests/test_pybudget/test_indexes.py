@@ -0,0 +1,321 @@
+# tests/test_pybudget/test_indexes.py
+
+"""
+Unit tests for the indexes module in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import datetime
+import tempfile
+import random
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.indexes import CategoryIndex, DescriptionIndex, TimeIndex, intersect_rows
+from pybudget.mapped import open_ledger, save_ledger
+
+MARCH = [datetime.date(2024, 3, day) for day in range(1, 32)]
+
+
+class TestTimeIndex(unittest.TestCase):
+    """
+    Test cases for the TimeIndex class.
+    """
+
+    def test_in_order_and_out_of_order_adds(self):
+        """
+        Test range queries after in-order and out-of-order inserts.
+        """
+        index = TimeIndex()
+        index.add(0, MARCH[4].toordinal(), 10.0)
+        index.add(1, MARCH[9].toordinal(), 20.0)
+        self.assertEqual(index.sum_between(MARCH[0], MARCH[30]), 30.0)
+        index.add(2, MARCH[2].toordinal(), 5.0)
+        index.add(3, MARCH[9].toordinal(), 1.0)
+        self.assertEqual(list(index.rows_between()), [2, 0, 1, 3])
+        self.assertEqual(index.sum_between(MARCH[2], MARCH[4]), 15.0)
+        self.assertEqual(index.count_between(MARCH[5], None), 2)
+        self.assertEqual(index.count_between(MARCH[20], MARCH[10]), 0)
+        self.assertEqual(index.sum_between(None, MARCH[1]), 0)
+
+    def test_unsorted_bulk_matches_scan(self):
+        """
+        Test buffered out-of-order entries against a brute-force scan.
+        """
+        rng = random.Random(3)
+        index = TimeIndex()
+        entries = []
+        for row in range(2000):
+            key = rng.randrange(1, 400)
+            entries.append((row, key, rng.randrange(1, 100)))
+            index.add(*entries[-1])
+            if row % 97 == 0:
+                lo, hi = sorted(rng.sample(range(400), 2))
+                start, end = datetime.date.fromordinal(lo), datetime.date.fromordinal(hi)
+                inside = [e for e in entries if lo <= e[1] <= hi]
+                self.assertEqual(index.sum_between(start, end), sum(e[2] for e in inside))
+                self.assertEqual(index.count_between(start, end), len(inside))
+        expected = [row for row, _, _ in sorted(entries, key=lambda e: e[1])]
+        self.assertEqual(list(index.rows_between()), expected)
+        self.assertEqual(len(index), 2000)
+
+    def test_build_from_entries(self):
+        """
+        Test building an index from unsorted entries.
+        """
+        index = TimeIndex([(0, 20, 1.0), (1, 10, 2.0), (2, 15, 4.0)])
+        self.assertEqual(list(index.keys), [10, 15, 20])
+        self.assertEqual(list(index.rows), [1, 2, 0])
+        self.assertEqual(len(index), 3)
+
+
+class TestCategoryIndex(unittest.TestCase):
+    """
+    Test cases for the CategoryIndex class.
+    """
+
+    def test_add_and_extend(self):
+        """
+        Test indexing rows by category.
+        """
+        index = CategoryIndex(["Food", "Rent"])
+        index.add(2, "Food")
+        index.extend(3, ["Bus", "Food"])
+        self.assertEqual(list(index.rows("Food")), [0, 2, 4])
+        self.assertEqual(list(index.rows("Unknown")), [])
+        self.assertEqual(index.categories(), ["Food", "Rent", "Bus"])
+        self.assertIn("Bus", index)
+
+    def test_rows_are_copies(self):
+        """
+        Test that mutating the returned rows leaves the index unchanged.
+        """
+        index = CategoryIndex(["Food", "Rent", "Food"])
+        index.rows("Food").append(7)
+        index.rows("Unknown").append(7)
+        self.assertEqual(list(index.rows("Food")), [0, 2])
+        self.assertEqual(list(index.rows("Unknown")), [])
+
+
+class TestDescriptionIndex(unittest.TestCase):
+    """
+    Test cases for the DescriptionIndex class.
+    """
+
+    def test_term_prefix_and_conjunctive_queries(self):
+        """
+        Test whole-word, prefix and multi-term searches.
+        """
+        index = DescriptionIndex(["Starbucks Coffee", "Star Market", "Blue Bottle COFFEE"])
+        index.extend(3, ["Starbucks coffee beans", "Uber"])
+        self.assertEqual(list(index.search("coffee")), [0, 2, 3])
+        self.assertEqual(list(index.search("star")), [1])
+        self.assertEqual(list(index.search("Star*")), [0, 1, 3])
+        self.assertEqual(list(index.search("star* coffee")), [0, 3])
+        self.assertEqual(list(index.search("coffee bean*")), [3])
+        self.assertEqual(list(index.search("coffee taxi")), [])
+        self.assertEqual(list(index.prefix_rows("zz")), [])
+
+    def test_rows_are_copies(self):
+        """
+        Test that mutating the returned rows leaves the index unchanged.
+        """
+        index = DescriptionIndex(["Starbucks Coffee", "Star Market"])
+        index.rows("coffee").append(9)
+        index.prefix_rows("starb").append(9)
+        index.search("coffee").append(9)
+        self.assertEqual(list(index.rows("coffee")), [0])
+        self.assertEqual(list(index.prefix_rows("starb")), [0])
+        self.assertEqual(list(index.search("coffee")), [0])
+
+    def test_intersect_rows(self):
+        """
+        Test intersecting sorted row lists of very different sizes.
+        """
+        self.assertEqual(list(intersect_rows(range(0, 1000, 2), [3, 4, 998, 1001])), [4, 998])
+        self.assertEqual(list(intersect_rows([1, 2, 3], [2, 3, 4], [3, 5])), [3])
+        self.assertEqual(list(intersect_rows()), [])
+
+
+class TestBudgetAggregates(unittest.TestCase):
+    """
+    Test cases for the category index and group-by aggregates of Budget.
+    """
+
+    def fill(self, budget):
+        """
+        Add expenses across two categories and two months.
+        """
+        budget.add_expense(Expense("Lunch", 12.0, "Food", MARCH[0]))
+        budget.add_expense(Expense("Rent", 800.0, "Housing", MARCH[0]))
+        budget.add_columns(
+            ["Dinner", "Snack", "Rent"],
+            [30.0, 3.0, 800.0],
+            ["Food", "Food", "Housing"],
+            [MARCH[10], None, datetime.date(2024, 4, 1)],
+        )
+        return budget
+
+    def check(self, budget):
+        """
+        Check the aggregates of a filled budget.
+        """
+        by_category = budget.aggregate("category")
+        self.assertEqual(
+            by_category["Food"], {"sum": 45.0, "count": 3, "mean": 15.0, "min": 3.0, "max": 30.0}
+        )
+        self.assertEqual(by_category["Housing"]["count"], 2)
+        by_month = budget.aggregate("month", ("sum", "count"))
+        self.assertEqual(
+            by_month,
+            {(2024, 3): {"sum": 842.0, "count": 3}, (2024, 4): {"sum": 800.0, "count": 1}},
+        )
+        both = budget.aggregate(("category", "month"), ("sum",))
+        self.assertEqual(both[("Food", (2024, 3))], {"sum": 42.0})
+        self.assertEqual(len(both), 3)
+        self.assertEqual(list(budget.get_category_rows("Food")), [0, 2, 3])
+        housing = budget.get_category_expenses("Housing")
+        self.assertEqual([e.description for e in housing], ["Rent", "Rent"])
+
+    def test_in_memory_budgets(self):
+        """
+        Test aggregates maintained incrementally by in-memory budgets.
+        """
+        self.check(self.fill(Budget("List", 5000.0)))
+        self.check(self.fill(Budget("Columnar", 5000.0, storage="columnar")))
+
+    def test_reopened_budgets(self):
+        """
+        Test aggregates of budgets seeded from persistent storage.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "b.db")
+            self.fill(Budget.open_sqlite(path, "SQLite", 5000.0)).close()
+            reopened = Budget.open_sqlite(path)
+            self.check(reopened)
+            reopened.close()
+
+            path = os.path.join(tmp, "b.ledger")
+            save_ledger(self.fill(Budget("Mapped", 5000.0)), path)
+            mapped = open_ledger(path)
+            self.check(mapped)
+            mapped.close()
+
+    def test_bounds_after_removal(self):
+        """
+        Test that removing a group's extreme amount refreshes its bounds.
+        """
+        for storage in ("list", "columnar"):
+            budget = self.fill(Budget("Removed", 5000.0, storage=storage))
+            budget.aggregate("month")
+            budget.remove_expense(2)
+            budget.remove_expense(1)
+            by_month = budget.aggregate("month", ("count", "min", "max"))
+            self.assertEqual(by_month[(2024, 3)], {"count": 1, "min": 12.0, "max": 12.0})
+            self.assertEqual(by_month[(2024, 4)], {"count": 1, "min": 800.0, "max": 800.0})
+            by_category = budget.aggregate("category", ("min", "max"))
+            self.assertEqual(by_category["Food"], {"min": 3.0, "max": 12.0})
+
+    def test_invalid_grouping(self):
+        """
+        Test that unsupported groupings and aggregates are rejected.
+        """
+        budget = Budget("Empty", 1.0)
+        with self.assertRaises(ValueError):
+            budget.aggregate("weekday")
+        with self.assertRaises(ValueError):
+            budget.aggregate("category", ("median",))
+
+
+class TestBudgetDateRanges(unittest.TestCase):
+    """
+    Test cases for the date range queries of Budget.
+    """
+
+    def fill(self, budget):
+        """
+        Add a month of daily expenses and one undated expense.
+        """
+        for day, date in enumerate(MARCH, start=1):
+            budget.add_expense(Expense(f"Day {day}", float(day), "Daily", date))
+        budget.add_expense(Expense("Undated", 100.0, "Misc"))
+        return budget
+
+    def check(self, budget):
+        """
+        Check the range queries on a filled budget.
+        """
+        self.assertEqual(budget.get_total_between(MARCH[2], MARCH[16]), sum(range(3, 18)))
+        self.assertEqual(budget.get_count_between(MARCH[2], MARCH[16]), 15)
+        self.assertEqual(budget.get_count_between(), 31)
+        expenses = budget.get_expenses_between(MARCH[29], None)
+        self.assertEqual([e.description for e in expenses], ["Day 30", "Day 31"])
+        self.assertEqual(list(budget.search_rows("day 3*")), [2, 29, 30])
+        self.assertEqual(list(budget.search_rows("DAY 3*", end=MARCH[4])), [2])
+
+    def test_list_and_columnar_budgets(self):
+        """
+        Test range queries on in-memory budgets.
+        """
+        self.check(self.fill(Budget("List", 1000.0)))
+        self.check(self.fill(Budget("Columnar", 1000.0, storage="columnar")))
+
+    def test_bulk_added_dates(self):
+        """
+        Test that bulk-added expenses are indexed.
+        """
+        budget = Budget("Bulk", 1000.0, storage="columnar")
+        budget.add_columns(
+            ["A", "B", "C"], [1.0, 2.0, 4.0], ["X", "X", "X"], [MARCH[5], None, MARCH[1]]
+        )
+        self.assertEqual(budget.get_total_between(MARCH[0], MARCH[5]), 5.0)
+        self.assertEqual(budget.expenses[0].date, MARCH[5])
+
+    def test_persistent_budgets(self):
+        """
+        Test range queries on SQLite and memory-mapped budgets.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            budget = self.fill(Budget.open_sqlite(os.path.join(tmp, "b.db"), "SQLite", 1000.0))
+            self.check(budget)
+            budget.close()
+            reopened = Budget.open_sqlite(os.path.join(tmp, "b.db"))
+            self.check(reopened)
+            reopened.close()
+
+            path = os.path.join(tmp, "b.ledger")
+            save_ledger(self.fill(Budget("Mapped", 1000.0)), path)
+            mapped = open_ledger(path)
+            self.check(mapped)
+            self.assertEqual(mapped.expenses[0].date, MARCH[0])
+            self.assertIsNone(mapped.expenses[31].date)
+            mapped.close()
+
+    def test_search_composes_with_filters(self):
+        """
+        Test that description search combines with category and date filters.
+        """
+        budget = self.fill(Budget("Search", 1000.0, storage="columnar"))
+        budget.add_columns(["Day Trip"], [5.0], ["Travel"], [MARCH[3]])
+        self.assertEqual(len(budget.search_rows("day")), 32)
+        self.assertEqual(list(budget.search_rows("day", category="Travel")), [32])
+        self.assertEqual(list(budget.search_rows("day", start=MARCH[2], end=MARCH[3])), [2, 3, 32])
+        self.assertEqual(list(budget.search_rows(category="Misc")), [31])
+        self.assertEqual(list(budget.search_rows("day 1*", end=MARCH[11])), [0, 9, 10, 11])
+        budget.remove_expense(0)
+        budget.add_expense(Expense("Day 1 again", 1.0, "Daily", MARCH[0]))
+        expenses = budget.search_expenses("again")
+        self.assertEqual([e.description for e in expenses], ["Day 1 again"])
+        fork = budget.fork()
+        fork.add_expense(Expense("Day 1 fork", 1.0, "Daily"))
+        self.assertEqual(len(fork.search_rows("day 1")), 2)
+        self.assertEqual(len(budget.search_rows("day 1")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+# tests/test_pybudget/test_loaders.py
+
+"""
+Unit tests for the loaders module in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import datetime
+import io
+import tempfile
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.loaders import read_csv_chunks, read_jsonl_chunks
+from pybudget.reports import write_report
+from pybudget.storage import ColumnarStorage
+
+CSV_DATA = """description,amount,category
+Groceries,150.0,Food
+Rent,1200.0,Housing
+"Coffee, large",4.5,Food
+"""
+
+JSONL_DATA = """{"description": "Groceries", "amount": 150.0, "category": "Food"}
+{"description": "Rent", "amount": 1200.0, "category": "Housing"}
+
+{"description": "Coffee", "amount": 4.5, "category": "Food"}
+"""
+
+
+class TestLoaders(unittest.TestCase):
+    """
+    Test cases for the chunked loaders.
+    """
+
+    def test_read_csv_chunks(self):
+        """
+        Test reading a CSV file in chunks, with amounts in minor units.
+        """
+        chunks = list(read_csv_chunks(io.StringIO(CSV_DATA), chunk_size=2))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(
+            chunks[0], (["Groceries", "Rent"], [15000, 120000], ["Food", "Housing"], None)
+        )
+        self.assertEqual(chunks[1], (["Coffee, large"], [450], ["Food"], None))
+
+    def test_read_csv_chunks_with_dates(self):
+        """
+        Test reading a CSV file with a date column.
+        """
+        data = "description,amount,category,date\nRent,1200.0,Housing,2024-03-01\nTip,2.0,Food,\n"
+        chunks = list(read_csv_chunks(io.StringIO(data)))
+        self.assertEqual(chunks[0][3], [datetime.date(2024, 3, 1), None])
+        with self.assertRaises(ValueError):
+            data = "description,amount,category,date\nRent,1,Housing,soon\n"
+            list(read_csv_chunks(io.StringIO(data)))
+
+    def test_read_csv_chunks_invalid(self):
+        """
+        Test that malformed CSV data raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            list(read_csv_chunks(io.StringIO("name,amount\nRent,1\n")))
+        with self.assertRaises(ValueError):
+            list(read_csv_chunks(io.StringIO("description,amount,category\nRent,abc,Housing\n")))
+
+    def test_read_jsonl_chunks(self):
+        """
+        Test reading a JSON Lines file in chunks.
+        """
+        chunks = list(read_jsonl_chunks(io.StringIO(JSONL_DATA), chunk_size=2))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[1], (["Coffee"], [450], ["Food"], [None]))
+        with self.assertRaises(ValueError):
+            list(read_jsonl_chunks(io.StringIO('{"description": "Rent"}\n')))
+        for line in ("42", '["budget"]', '"budget"'):
+            with self.assertRaisesRegex(ValueError, "line 2"):
+                list(read_jsonl_chunks(io.StringIO(f"\n{line}\n")))
+
+    def test_budget_from_csv_path(self):
+        """
+        Test creating a budget from a CSV file on disk.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "expenses.csv")
+            with open(path, "w", encoding="utf-8", newline="") as fp:
+                fp.write(CSV_DATA)
+            budget = Budget.from_csv(path, "Imported", 2000.0, chunk_size=2)
+        self.assertIsInstance(budget.expenses.storage, ColumnarStorage)
+        self.assertEqual(len(budget.expenses), 3)
+        self.assertEqual(budget.get_remaining_amount(), 645.5)
+        self.assertEqual(budget.get_category_total("Food"), 154.5)
+
+    def test_budget_from_csv_rejects_invalid_amount(self):
+        """
+        Test that non-positive amounts are rejected during import.
+        """
+        data = "description,amount,category\nRefund,-10.0,Food\n"
+        with self.assertRaises(ValueError):
+            Budget.from_csv(io.StringIO(data), "Imported", 100.0)
+
+    def test_report_round_trip(self):
+        """
+        Test that CSV and JSON Lines reports load back into an equal budget.
+        """
+        original = Budget("Original", 500.0)
+        original.add_expense(Expense("Groceries", 150.0, "Food"))
+        original.add_expense(Expense("Bus", 2.5, "Transport", datetime.date(2024, 3, 5)))
+        for fmt, loader in (("csv", Budget.from_csv), ("jsonl", Budget.from_jsonl)):
+            buffer = io.StringIO()
+            write_report(original, buffer, fmt=fmt)
+            buffer.seek(0)
+            loaded = loader(buffer, "Loaded", 500.0)
+            self.assertEqual(list(loaded.expenses), list(original.expenses))
+            self.assertEqual(loaded.get_remaining_amount(), original.get_remaining_amount())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# tests/test_pybudget/test_mapped.py
+
+"""
+Unit tests for the memory-mapped ledger format in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import tempfile
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.mapped import MappedStorage, open_ledger, save_ledger
+from pybudget.reports import generate_report
+
+
+class TestMappedLedger(unittest.TestCase):
+    """
+    Test cases for saving and mapping ledger files.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "budget.ledger")
+        self.budget = Budget("Mapped Budget", 2000.0)
+        self.budget.add_expense(Expense("Groceries", 150.0, "Food"))
+        self.budget.add_expense(Expense("Rent", 1200.0, "Housing"))
+        self.budget.add_expense(Expense("Café crème", 4.5, "Food"))
+
+    def tearDown(self):
+        """
+        Clean up test fixtures.
+        """
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """
+        Test that a saved ledger reopens with identical contents.
+        """
+        save_ledger(self.budget, self.path)
+        mapped = open_ledger(self.path)
+        self.assertIsInstance(mapped.expenses.storage, MappedStorage)
+        self.assertEqual(mapped.name, "Mapped Budget")
+        self.assertEqual(mapped.amount, 2000.0)
+        self.assertEqual(list(mapped.expenses), list(self.budget.expenses))
+        self.assertEqual(mapped.expenses[2].description, "Café crème")
+        self.assertEqual(mapped.get_remaining_amount(), self.budget.get_remaining_amount())
+        self.assertEqual(mapped.get_category_totals(), self.budget.get_category_totals())
+        self.assertTrue(mapped.verify_totals())
+        self.assertEqual(generate_report(mapped), generate_report(self.budget))
+        mapped.close()
+
+    def test_columns_are_zero_copy_views(self):
+        """
+        Test that the amount column is a typed view over the mapping.
+        """
+        save_ledger(self.budget, self.path)
+        storage = MappedStorage(self.path)
+        self.assertIsInstance(storage.amounts, memoryview)
+        self.assertEqual(storage.amounts.format, "q")
+        self.assertEqual(list(storage.amounts), [15000, 120000, 450])
+        storage.close()
+
+    def test_empty_budget(self):
+        """
+        Test saving and opening a budget with no expenses.
+        """
+        save_ledger(Budget("Empty", 10.0), self.path)
+        mapped = open_ledger(self.path)
+        self.assertEqual(len(mapped.expenses), 0)
+        self.assertEqual(mapped.get_remaining_amount(), 10.0)
+        mapped.close()
+
+    def test_read_only(self):
+        """
+        Test that mapped ledgers reject new expenses.
+        """
+        save_ledger(self.budget, self.path)
+        mapped = open_ledger(self.path)
+        with self.assertRaises(ValueError):
+            mapped.add_expense(Expense("Extra", 1.0, "Misc"))
+        mapped.close()
+
+    def test_invalid_file(self):
+        """
+        Test that a file that is not a ledger is rejected.
+        """
+        with open(self.path, "wb") as fp:
+            fp.write(b"not a ledger file at all" * 4)
+        with self.assertRaises(ValueError):
+            MappedStorage(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# tests/test_pybudget/test_money.py
+
+"""
+Unit tests for the money module in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import unittest
+from decimal import Decimal
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.money import (
+    Money,
+    format_minor,
+    from_minor,
+    minor_to_str,
+    parse_minor,
+    to_minor,
+)
+
+
+class TestMoneyHelpers(unittest.TestCase):
+    """
+    Test cases for the minor-unit conversion helpers.
+    """
+
+    def test_to_minor(self):
+        """
+        Test converting amounts of different types to minor units.
+        """
+        self.assertEqual(to_minor(12.34), 1234)
+        self.assertEqual(to_minor(0.29), 29)
+        self.assertEqual(to_minor(5), 500)
+        self.assertEqual(to_minor(Decimal("1.005")), 100)
+        self.assertEqual(to_minor("7.5", scale=3), 7500)
+        self.assertEqual(to_minor(Money("2.50")), 250)
+        with self.assertRaises(ValueError):
+            to_minor("abc")
+        with self.assertRaises(ValueError):
+            to_minor(float("nan"))
+        with self.assertRaises(ValueError):
+            to_minor(0.001, exact=True)
+
+    def test_parse_and_format(self):
+        """
+        Test parsing decimal strings and formatting minor units.
+        """
+        self.assertEqual(parse_minor("12.5"), 1250)
+        self.assertEqual(parse_minor("-3"), -300)
+        self.assertEqual(parse_minor(" +0.07 "), 7)
+        self.assertEqual(parse_minor("1.239"), 124)
+        self.assertEqual(parse_minor("1e2"), 10000)
+        with self.assertRaises(ValueError):
+            parse_minor("")
+        self.assertEqual(minor_to_str(-1205), "-12.05")
+        self.assertEqual(minor_to_str(7, scale=0), "7")
+        self.assertEqual(format_minor(123456), "$1234.56")
+        self.assertEqual(format_minor(-10000), "$-100.00")
+        self.assertEqual(from_minor(1234), 12.34)
+
+
+class TestMoney(unittest.TestCase):
+    """
+    Test cases for the Money class.
+    """
+
+    def test_arithmetic_and_comparison(self):
+        """
+        Test exact arithmetic and comparisons with numbers.
+        """
+        total = sum([Money(0.1)] * 10, Money(0))
+        self.assertEqual(total, 1.0)
+        self.assertEqual(total.minor, 100)
+        self.assertEqual(Money("5.00") - 2, Money(3))
+        self.assertEqual(Money(1) * 3, Money(3))
+        self.assertLess(Money("0.99"), 1)
+        self.assertEqual(str(-Money("1.5")), "-1.50")
+        self.assertEqual(repr(Money("1.5")), "Money('1.50')")
+        self.assertEqual(hash(Money("0.5")), hash(0.5))
+        self.assertEqual(Money("1.5").rescale(3).minor, 1500)
+        with self.assertRaises(AttributeError):
+            Money(1).minor = 5
+
+
+class TestMinorUnitBudget(unittest.TestCase):
+    """
+    Test cases for budgets kept in integer minor units.
+    """
+
+    def test_totals_are_exact(self):
+        """
+        Test that many small amounts sum exactly.
+        """
+        budget = Budget("Coffee", 100.0, storage="columnar")
+        budget.add_columns(["Espresso"] * 1000, [0.1] * 1000, ["Food"] * 1000)
+        self.assertEqual(budget.get_total_minor(), 10000)
+        self.assertEqual(budget.get_total_expenses(), 100.0)
+        self.assertEqual(budget.get_remaining_minor(), 0)
+        self.assertTrue(budget.verify_totals())
+
+    def test_currency_scale(self):
+        """
+        Test a budget in a currency with three decimal places.
+        """
+        budget = Budget("Dinar", Decimal("10.000"), scale=3)
+        budget.add_expense(Expense("Tea", Money("0.125", scale=3), "Food"))
+        self.assertEqual(budget.get_remaining_minor(), 9875)
+        self.assertEqual(budget.get_remaining_amount(), 9.875)
+        with self.assertRaises(ValueError):
+            budget.add_expense(Expense("Bread", 1.0, "Food"))
+
+    def test_exact_mode_rejects_fractional_minor_units(self):
+        """
+        Test that exact budgets refuse amounts that would be rounded.
+        """
+        budget = Budget("Exact", 100.0, exact=True)
+        with self.assertRaises(ValueError):
+            budget.add_columns(["Fee"], [0.005], ["Bank"])
+        self.assertEqual(len(budget.expenses), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+# tests/test_pybudget/test_paged.py
+
+"""
+Unit tests for the paged storage backend in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import io
+import subprocess
+import tempfile
+import unittest
+from datetime import date
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.paged import PagedCategoryIndex, PagedStorage
+from pybudget.reports import generate_report, write_report
+
+
+class TestPagedStorage(unittest.TestCase):
+    """
+    Test cases for the PagedStorage class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "budget.paged")
+        self.expenses = [
+            Expense(f"Item {i}", 1 + i % 7, f"Cat {i % 3}", date(2024, 1 + i % 12, 1 + i % 28))
+            for i in range(50)
+        ]
+        self.expenses.append(Expense("Undated", 4.5, "Cat 0"))
+
+    def tearDown(self):
+        """
+        Clean up test fixtures.
+        """
+        self.tmp.cleanup()
+
+    def make_budget(self, **kwargs):
+        """
+        Create a paged budget holding the test expenses, closed to disk.
+        """
+        budget = Budget.open_paged(self.path, "Paged", 1000, page_size=8, **kwargs)
+        budget.add_expenses(self.expenses[:20])
+        for expense in self.expenses[20:]:
+            budget.add_expense(expense)
+        budget.close()
+
+    def test_round_trip(self):
+        """
+        Test that expenses survive closing and reopening, with their metadata.
+        """
+        self.make_budget()
+        budget = Budget.open_paged(self.path)
+        self.assertEqual(budget.name, "Paged")
+        self.assertEqual(budget.amount, 1000)
+        self.assertEqual(_rows(budget.expenses), _rows(self.expenses))
+        self.assertEqual(_rows(budget.expenses[-1:]), _rows(self.expenses[-1:]))
+        self.assertEqual(_rows([budget.expenses[9]]), _rows([self.expenses[9]]))
+        budget.close()
+
+    def test_append_after_reopen(self):
+        """
+        Test that appending to a reopened file continues its partial last page.
+        """
+        self.make_budget()
+        budget = Budget.open_paged(self.path)
+        extra = [Expense(f"Extra {i}", 2, "Cat 9", date(2025, 1, 1)) for i in range(10)]
+        budget.add_expenses(extra)
+        budget.close()
+        budget = Budget.open_paged(self.path)
+        self.assertEqual(_rows(budget.expenses), _rows(self.expenses + extra))
+        self.assertEqual(_rows(budget.get_category_expenses("Cat 9")), _rows(extra))
+        budget.close()
+
+    def test_name_and_amount_changes_persist(self):
+        """
+        Test that renaming a budget or changing its amount survives reopening.
+        """
+        self.make_budget()
+        budget = Budget.open_paged(self.path)
+        budget.amount = 500
+        budget.name = "Ops"
+        budget.close()
+        budget = Budget.open_paged(self.path)
+        self.assertEqual(budget.name, "Ops")
+        self.assertEqual(budget.amount, 500)
+        self.assertEqual(_rows(budget.expenses), _rows(self.expenses))
+        budget.close()
+
+    def test_unflushed_writes_keep_committed_rows(self):
+        """
+        Test that a process dying before its next flush loses only its own rows.
+        """
+        self.make_budget()
+        script = (
+            "import os, sys\n"
+            "from pybudget.budget import Budget\n"
+            "from pybudget.expense import Expense\n"
+            "budget = Budget.open_paged(sys.argv[1])\n"
+            "budget.add_expenses([Expense('Lost', 1, 'Cat 9')] * 3000)\n"
+            "os._exit(0)\n"
+        )
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+        subprocess.run([sys.executable, "-c", script, self.path], cwd=root, check=True)
+        budget = Budget.open_paged(self.path)
+        self.assertEqual(_rows(budget.expenses), _rows(self.expenses))
+        budget.add_expense(Expense("Kept", 3, "Cat 9"))
+        budget.close()
+        budget = Budget.open_paged(self.path)
+        self.assertEqual(len(budget.expenses), len(self.expenses) + 1)
+        self.assertEqual(budget.get_category_totals()["Cat 9"], 3)
+        budget.close()
+
+    def test_totals_from_page_directory(self):
+        """
+        Test that totals and whole-page range sums read no pages.
+        """
+        self.make_budget()
+        budget = Budget.open_paged(self.path)
+        storage = budget._storage
+        self.assertAlmostEqual(budget.get_total_expenses(), sum(e.amount for e in self.expenses))
+        expected = Budget("List", 1000)
+        expected.add_expenses(self.expenses)
+        self.assertEqual(budget.get_category_totals(), expected.get_category_totals())
+        self.assertEqual(budget.get_total_between(), expected.get_total_between())
+        self.assertEqual(budget.get_count_between(), 50)
+        self.assertEqual(storage.misses, 0)
+        budget.close()
+
+    def test_range_queries(self):
+        """
+        Test that date-range queries match an in-memory budget.
+        """
+        self.make_budget()
+        budget = Budget.open_paged(self.path)
+        expected = Budget("List", 1000)
+        expected.add_expenses(self.expenses)
+        for start, end in [
+            (date(2024, 3, 1), date(2024, 6, 30)),
+            (None, date(2024, 2, 10)),
+            (date(2024, 12, 5), None),
+        ]:
+            self.assertEqual(
+                budget.get_total_between(start, end), expected.get_total_between(start, end)
+            )
+            self.assertEqual(
+                budget.get_count_between(start, end),
+                expected.get_count_between(start, end),
+            )
+            self.assertEqual(
+                _rows(budget.get_expenses_between(start, end)),
+                _rows(expected.get_expenses_between(start, end)),
+            )
+        budget.close()
+
+    def test_category_rows_from_pages(self):
+        """
+        Test that category lookups read pages instead of a memory index.
+        """
+        budget = Budget.open_paged(self.path, "Paged", 1000, page_size=8)
+        budget.add_expenses(self.expenses[:20])
+        self.assertIsInstance(budget._category_index, PagedCategoryIndex)
+        expected = Budget("List", 1000)
+        expected.add_expenses(self.expenses[:20])
+        for category in ("Cat 0", "Cat 2", "Unknown"):
+            self.assertEqual(
+                list(budget.get_category_rows(category)),
+                list(expected.get_category_rows(category)),
+            )
+        budget.close()
+
+    def test_bounded_page_cache(self):
+        """
+        Test that iterating and streaming a report keep at most cache_pages pages.
+        """
+        self.make_budget()
+        budget = Budget.open_paged(self.path, cache_pages=2)
+        storage = budget._storage
+        self.assertIsInstance(storage, PagedStorage)
+        fp = io.StringIO()
+        write_report(budget, fp)
+        self.assertEqual(fp.getvalue(), generate_report(budget, cache=None))
+        self.assertLessEqual(len(storage._cache), 2)
+        self.assertGreater(storage.misses, 0)
+        misses = storage.misses
+        storage[0]
+        storage[1]
+        self.assertEqual(storage.misses, misses + 1)
+        self.assertGreater(storage.hits, 0)
+        budget.close()
+
+    def test_new_budget_requires_name(self):
+        """
+        Test that creating a paged budget without a name raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            Budget.open_paged(self.path)
+        with open(self.path, "wb") as fp:
+            fp.write(b"not a ledger")
+        with self.assertRaises(ValueError):
+            PagedStorage(self.path)
+
+
+def _rows(expenses):
+    return [(e.description, e.amount_minor, e.category, e.date) for e in expenses]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# tests/test_pybudget/test_portfolio.py
+
+"""
+Unit tests for the portfolio module in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.portfolio import BudgetPortfolio
+from pybudget.reports import generate_report
+
+
+class TestBudgetPortfolio(unittest.TestCase):
+    """
+    Test cases for the BudgetPortfolio class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.portfolio = BudgetPortfolio()
+        self.portfolio.add_budget("sales/emea", 1000.0)
+        self.portfolio.add_budget("sales/us", 500.0)
+        self.portfolio.add_budget("eng/platform", 2000.0)
+        self.portfolio.add_expense("sales/emea", Expense("Flights", 700.0, "Travel"))
+        self.portfolio.add_columns(
+            ["sales/us", "eng/platform", "sales/us"],
+            ["Dinner", "Servers", "Hotel"],
+            [200.0, 1500.0, 400.0],
+            ["Meals", "Hosting", "Travel"],
+        )
+
+    def test_remaining_and_overspent(self):
+        """
+        Test computing remaining amounts and overspend flags for all budgets.
+        """
+        self.assertEqual(list(self.portfolio.remaining_amounts()), [300.0, -100.0, 500.0])
+        self.assertEqual(self.portfolio.overspent(), ["sales/us"])
+        self.assertEqual(self.portfolio.recompute_spent(), self.portfolio.spent)
+
+    def test_rollup(self):
+        """
+        Test rolling budgets up by group.
+        """
+        rollup = self.portfolio.rollup(lambda name: name.split("/")[0])
+        self.assertEqual(
+            rollup["sales"], {"amount": 1500.0, "spent": 1300.0, "remaining": 200.0, "budgets": 2}
+        )
+        self.assertEqual(rollup["eng"]["remaining"], 500.0)
+        self.assertEqual(self.portfolio.rollup()[None]["spent"], 2800.0)
+
+    def test_budget_views(self):
+        """
+        Test that per-budget views work like budgets in reports.
+        """
+        view = self.portfolio["sales/us"]
+        self.assertEqual(view.name, "sales/us")
+        self.assertEqual(len(view.expenses), 2)
+        self.assertEqual(view.expenses[1].description, "Hotel")
+        self.assertEqual(view.get_remaining_amount(), -100.0)
+
+        budget = Budget("sales/us", 500.0)
+        budget.add_expense(Expense("Dinner", 200.0, "Meals"))
+        budget.add_expense(Expense("Hotel", 400.0, "Travel"))
+        self.assertEqual(generate_report(view), generate_report(budget))
+        self.assertEqual(str(view), str(budget))
+
+        view.amount = 800.0
+        view.add_expense(Expense("Taxi", 50.0, "Travel"))
+        self.assertEqual(self.portfolio.remaining_amounts()[1], 150.0)
+
+    def test_from_budgets(self):
+        """
+        Test building a portfolio from existing budgets.
+        """
+        first = Budget("A", 100.0)
+        first.add_expense(Expense("Lunch", 10.0, "Food"))
+        second = Budget("B", 50.0, storage="columnar")
+        portfolio = BudgetPortfolio.from_budgets([first, second])
+        self.assertEqual(len(portfolio), 2)
+        self.assertIn("B", portfolio)
+        self.assertEqual([b.get_remaining_amount() for b in portfolio], [90.0, 50.0])
+
+    def test_amount_summaries(self):
+        """
+        Test that per-budget summaries merge into portfolio-wide statistics.
+        """
+        self.assertEqual(self.portfolio.quantiles((0.0, 1.0)), {0.0: 200.0, 1.0: 1500.0})
+        self.portfolio.add_expense("sales/us", Expense("Taxi", 50.0, "Travel"))
+        sales = self.portfolio.amount_summary(["sales/emea", "sales/us"])
+        self.assertEqual(sales.count, 4)
+        self.assertEqual(sales.get("min"), 5000)
+        us = self.portfolio["sales/us"].get_amount_summary()
+        self.assertAlmostEqual(us.get("mean"), 65000 / 3)
+        self.assertEqual(self.portfolio.amount_summary().count, 5)
+
+    def test_errors(self):
+        """
+        Test duplicate budgets, unknown budgets, invalid amounts and ragged columns.
+        """
+        with self.assertRaises(ValueError):
+            self.portfolio.add_budget("sales/us", 1.0)
+        with self.assertRaises(KeyError):
+            self.portfolio["unknown"]
+        with self.assertRaises(ValueError):
+            self.portfolio.add_columns(["sales/us"], ["Refund"], [-1.0], ["Travel"])
+        for amount in (0, -1.0):
+            with self.assertRaises(ValueError):
+                self.portfolio.add_expense("sales/us", Expense("Refund", amount, "Travel"))
+        rows = len(self.portfolio.expenses)
+        with self.assertRaises(ValueError):
+            self.portfolio.add_columns(["sales/us"], ["A", "B"], [1.0, 2.0], ["Travel"] * 2)
+        with self.assertRaises(ValueError):
+            self.portfolio.add_columns(["sales/us"], ["A"], [1.0], ["Travel"], dates=[])
+        self.assertEqual(len(self.portfolio.expenses), rows)
+        self.assertEqual(len(self.portfolio.owners), rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+# tests/test_pybudget/test_reconcile.py
+
+"""
+Unit tests for statement reconciliation in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import random
+import unittest
+from datetime import date
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.reconcile import normalize_description, reconcile
+
+
+class TestReconcile(unittest.TestCase):
+    """
+    Test cases for the reconcile function.
+    """
+
+    def test_exact_matches_pair_duplicates(self):
+        """
+        Test that identical rows pair off one to one, in row order.
+        """
+        budget = Budget("Test", 1000, storage="columnar")
+        budget.add_expenses(
+            [
+                Expense("Coffee", 3.5, "Food", date(2024, 5, 1)),
+                Expense("Coffee", 3.5, "Food", date(2024, 5, 1)),
+                Expense("Rent", 800, "Housing", date(2024, 5, 1)),
+                Expense("Cash", 20, "Misc"),
+            ]
+        )
+        statement = [
+            Expense("CARD COFFEE", 3.5, "", date(2024, 5, 1)),
+            Expense("ATM", 20, ""),
+            Expense("CARD COFFEE", 3.5, "", date(2024, 5, 1)),
+            Expense("Fee", 1, "", date(2024, 5, 2)),
+        ]
+        result = reconcile(budget, statement)
+        self.assertEqual(result.matched, [(0, 0), (1, 2), (3, 1)])
+        self.assertEqual(result.unmatched_expenses, [2])
+        self.assertEqual(result.unmatched_statement, [3])
+        self.assertEqual(result.ambiguous, [])
+        self.assertFalse(result.is_reconciled)
+
+    def test_tolerance_and_window(self):
+        """
+        Test that amount tolerances and date windows match nearby rows only.
+        """
+        expenses = [
+            Expense("Groceries", 52.10, "Food", date(2024, 5, 30)),
+            Expense("Fuel", 40, "Car", date(2024, 5, 1)),
+            Expense("Books", 15, "Misc", date(2024, 5, 10)),
+        ]
+        statement = [
+            Expense("Fuel", 40.01, "", date(2024, 5, 3)),
+            Expense("Groceries", 52.12, "", date(2024, 6, 1)),
+            Expense("Books", 15, "", date(2024, 5, 14)),
+        ]
+        self.assertEqual(reconcile(expenses, statement).matched, [])
+        result = reconcile(expenses, statement, amount_tolerance=0.02, date_window=2)
+        self.assertEqual(result.matched, [(0, 1), (1, 0)])
+        self.assertEqual(result.unmatched_expenses, [2])
+        self.assertEqual(result.unmatched_statement, [2])
+
+    def test_ambiguous_candidates(self):
+        """
+        Test that rows with several possible matches are reported, not guessed.
+        """
+        expenses = [
+            Expense("Lunch", 12, "Food", date(2024, 5, 2)),
+            Expense("Taxi", 30, "Travel", date(2024, 5, 2)),
+            Expense("Taxi", 30, "Travel", date(2024, 5, 3)),
+        ]
+        statement = [
+            Expense("Lunch", 12, "", date(2024, 5, 1)),
+            Expense("Lunch", 12, "", date(2024, 5, 3)),
+            Expense("Taxi", 30, "", date(2024, 5, 4)),
+        ]
+        result = reconcile(expenses, statement, date_window=1)
+        self.assertEqual(result.matched, [(2, 2)])
+        self.assertEqual(result.ambiguous, [(0, [0, 1])])
+        self.assertEqual(result.unmatched_expenses, [1])
+        self.assertEqual(result.unmatched_statement, [])
+
+    def test_match_descriptions(self):
+        """
+        Test that descriptions can be required to match after normalization.
+        """
+        self.assertEqual(normalize_description("  ACME,  Corp. "), "acme corp")
+        expenses = [Expense("Acme Corp", 10, "Misc", date(2024, 5, 1))]
+        statement = [
+            Expense("Other", 10, "", date(2024, 5, 1)),
+            Expense("ACME corp.", 10, "", date(2024, 5, 2)),
+        ]
+        result = reconcile(expenses, statement, date_window=1, match_descriptions=True)
+        self.assertEqual(result.matched, [(0, 1)])
+        self.assertEqual(result.unmatched_statement, [0])
+
+    def test_matches_brute_force(self):
+        """
+        Test that bucketed candidates agree with a pairwise comparison.
+        """
+        rng = random.Random(7)
+        expenses = [
+            Expense("x", rng.randint(100, 130) / 100, "", date(2024, 1, rng.randint(1, 20)))
+            for _ in range(60)
+        ]
+        statement = [
+            Expense("y", rng.randint(100, 130) / 100, "", date(2024, 1, rng.randint(1, 20)))
+            for _ in range(60)
+        ]
+        result = reconcile(expenses, statement, amount_tolerance=0.03, date_window=2)
+        matched = dict(result.matched)
+        rows = sorted(
+            list(matched) + [row for row, _ in result.ambiguous] + result.unmatched_expenses
+        )
+        self.assertEqual(rows, list(range(60)))
+
+        def close(row, other):
+            amount = abs(expenses[row].amount_minor - statement[other].amount_minor)
+            return amount <= 3 and abs((expenses[row].date - statement[other].date).days) <= 2
+
+        for row, other in result.matched:
+            self.assertTrue(close(row, other))
+        for row in result.unmatched_expenses:
+            for other in set(range(60)) - set(matched.values()):
+                self.assertFalse(close(row, other))
+
+    def test_invalid_arguments(self):
+        """
+        Test that negative tolerances and mismatched scales raise ValueError.
+        """
+        expenses = [Expense("Coffee", 3.5, "Food")]
+        with self.assertRaises(ValueError):
+            reconcile(expenses, expenses, amount_tolerance=-1)
+        with self.assertRaises(ValueError):
+            reconcile(expenses, expenses, date_window=-1)
+        with self.assertRaises(ValueError):
+            reconcile(expenses, [Expense("Coffee", 3.5, "Food", scale=3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
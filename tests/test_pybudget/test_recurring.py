@@ -0,0 +1,162 @@
+# tests/test_pybudget/test_recurring.py
+
+"""
+Unit tests for recurring expenses in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import pickle
+import random
+import unittest
+from datetime import date, timedelta
+from itertools import islice, takewhile
+
+from pybudget.budget import Budget
+from pybudget.concurrent import ConcurrentBudget
+from pybudget.expense import Expense
+from pybudget.recurring import FREQUENCIES, RecurringExpense
+
+
+class TestRecurringExpense(unittest.TestCase):
+    """
+    Test cases for the RecurringExpense class.
+    """
+
+    def test_month_end_clamping(self):
+        """
+        Test that monthly schedules keep their day, clamped to short months.
+        """
+        rent = RecurringExpense("Rent", 1200, "Housing", date(2024, 1, 31))
+        self.assertEqual(
+            list(islice(rent.dates(), 4)),
+            [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)],
+        )
+        self.assertEqual(rent.count_between(date(2024, 2, 1), date(2024, 3, 30)), 1)
+        self.assertEqual(rent.get_total_between(end=date(2034, 1, 30)), 120 * 1200)
+        with self.assertRaises(ValueError):
+            rent.count_between(date(2024, 1, 1))
+        with self.assertRaises(ValueError):
+            RecurringExpense("Rent", 1200, "Housing", date(2024, 1, 31), frequency="hourly")
+        with self.assertRaises(ValueError):
+            RecurringExpense("Rent", 0, "Housing", date(2024, 1, 31))
+
+    def test_closed_form_matches_enumeration(self):
+        """
+        Test that closed-form counts agree with the generated occurrences.
+        """
+        rng = random.Random(7)
+        origin = date(2023, 1, 1)
+        for _ in range(300):
+            start = origin + timedelta(days=rng.randrange(800))
+            end = start + timedelta(days=rng.randrange(1500)) if rng.random() < 0.5 else None
+            schedule = RecurringExpense(
+                "Sub",
+                9.99,
+                "Media",
+                start,
+                frequency=rng.choice(FREQUENCIES),
+                interval=rng.randint(1, 3),
+                end=end,
+            )
+            lo = origin + timedelta(days=rng.randrange(2000))
+            hi = lo + timedelta(days=rng.randrange(1500))
+            occurrences = list(schedule.dates(lo, hi))
+            self.assertEqual(schedule.count_between(lo, hi), len(occurrences))
+            self.assertTrue(all(lo <= day <= hi for day in occurrences))
+            self.assertTrue(end is None or all(day <= end for day in occurrences))
+            every = takewhile(lambda day: day <= hi, schedule.dates())
+            expected = [day for day in every if day >= lo]
+            self.assertEqual(occurrences, expected)
+
+
+class TestBudgetForecast(unittest.TestCase):
+    """
+    Test cases for recurring expenses in a Budget.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.budget = Budget("Household", 50000)
+        self.budget.add_expense(Expense("Sofa", 800, "Furniture", date(2024, 3, 10)))
+        self.rent = RecurringExpense("Rent", 1500, "Housing", date(2024, 1, 1))
+        self.gym = RecurringExpense(
+            "Gym", 20, "Health", date(2024, 1, 5), frequency="weekly", end=date(2024, 2, 29)
+        )
+        self.budget.add_recurring(self.rent)
+        self.budget.add_recurring(self.gym)
+
+    def test_forecast_totals(self):
+        """
+        Test forecast totals without materializing the schedules.
+        """
+        self.assertEqual(len(self.budget.expenses), 1)
+        first_quarter = (date(2024, 1, 1), date(2024, 3, 31))
+        self.assertEqual(self.budget.get_recurring_total(*first_quarter), 3 * 1500 + 8 * 20)
+        self.assertEqual(self.budget.get_recurring_total(*first_quarter, category="Health"), 160)
+        self.assertEqual(self.budget.get_forecast_total(*first_quarter), 5460)
+        self.assertEqual(
+            self.budget.get_forecast_remaining(date(2025, 12, 31)), 50000 - 800 - 24 * 1500 - 160
+        )
+        self.assertEqual(self.budget.get_remaining_amount(), 49200)
+        with self.assertRaises(ValueError):
+            fee = RecurringExpense("Fee", 1, "Bank", date(2024, 1, 1), scale=3)
+            self.budget.add_recurring(fee)
+
+    def test_iter_forecast(self):
+        """
+        Test that the forecast merges expenses and occurrences in date order.
+        """
+        forecast = list(self.budget.iter_forecast(date(2024, 2, 20), date(2024, 3, 15)))
+        self.assertEqual(
+            [(expense.description, expense.date) for expense in forecast],
+            [
+                ("Gym", date(2024, 2, 23)),
+                ("Rent", date(2024, 3, 1)),
+                ("Sofa", date(2024, 3, 10)),
+            ],
+        )
+        upcoming = islice(self.budget.iter_forecast(date(2030, 1, 1)), 2)
+        self.assertEqual(
+            [expense.date for expense in upcoming], [date(2030, 1, 1), date(2030, 2, 1)]
+        )
+
+    def test_concurrent_budget_merges_first(self):
+        """
+        Test that forecasts on a concurrent budget include buffered rows.
+        """
+        budget = ConcurrentBudget("Shared", 100, merge_every=100)
+        budget.add_recurring(RecurringExpense("Fee", 5, "Bank", date(2024, 1, 1)))
+        budget.add_expense(Expense("Lunch", 10, "Food", date(2024, 1, 2)))
+        self.assertEqual(budget.get_forecast_remaining(date(2024, 1, 31)), 85)
+        budget.add_expense(Expense("Dinner", 20, "Food", date(2024, 1, 3)))
+        self.assertEqual(budget.get_forecast_total(end=date(2024, 1, 31)), 35)
+        budget.add_expense(Expense("Taxi", 15, "Travel", date(2024, 1, 4)))
+        forecast = budget.iter_forecast(end=date(2024, 1, 31))
+        self.assertEqual([e.description for e in forecast], ["Fee", "Lunch", "Dinner", "Taxi"])
+
+    def test_fork_and_pickle(self):
+        """
+        Test that forks and pickles keep the schedules independently.
+        """
+        fork = self.budget.fork()
+        fork.remove_recurring(self.gym)
+        self.assertEqual(self.budget.recurring, (self.rent, self.gym))
+        self.assertEqual(fork.recurring, (self.rent,))
+        with self.assertRaises(ValueError):
+            fork.remove_recurring(self.gym)
+        restored = pickle.loads(pickle.dumps(self.budget))
+        self.assertEqual(len(restored.recurring), 2)
+        self.assertEqual(
+            restored.get_forecast_total(end=date(2024, 12, 31)),
+            self.budget.get_forecast_total(end=date(2024, 12, 31)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
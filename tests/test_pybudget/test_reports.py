@@ -9,11 +9,22 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
+import csv
+import io
+import json
 import unittest
 
 from pybudget.budget import Budget
+from pybudget.concurrent import ConcurrentBudget
 from pybudget.expense import Expense
-from pybudget.reports import generate_report
+from pybudget.reports import (
+    ReportCache,
+    generate_category_report,
+    generate_report,
+    iter_report,
+    report_cache,
+    write_report,
+)
 
 
 class TestReports(unittest.TestCase):
@@ -53,6 +64,153 @@ class TestReports(unittest.TestCase):
         self.assertIn("Remaining Budget: $500.00", report)
         self.assertIn("No expenses recorded.", report)
 
+    def test_iter_report_matches_generate_report(self):
+        """
+        Test that the streamed text report matches generate_report.
+        """
+        for i in range(25):
+            self.budget.add_expense(Expense(f"Item {i}", 1.0, "Misc"))
+        expected = generate_report(self.budget)
+        chunks = list(iter_report(self.budget, chunk_lines=4))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), expected)
+
+    def test_write_report_text(self):
+        """
+        Test writing a text report to a file-like object.
+        """
+        buffer = io.StringIO()
+        write_report(self.budget, buffer)
+        self.assertEqual(buffer.getvalue(), generate_report(self.budget))
+
+    def test_write_report_csv(self):
+        """
+        Test writing a CSV report.
+        """
+        buffer = io.StringIO()
+        write_report(self.budget, buffer, fmt="csv")
+        rows = list(csv.reader(io.StringIO(buffer.getvalue())))
+        self.assertEqual(rows[0], ["description", "amount", "category", "date"])
+        self.assertEqual(rows[1], ["Test Expense 1", "200.00", "Test Category 1", ""])
+        self.assertEqual(len(rows), 3)
+
+    def test_write_report_jsonl(self):
+        """
+        Test writing a JSON Lines report.
+        """
+        buffer = io.StringIO()
+        write_report(self.budget, buffer, fmt="jsonl")
+        records = [json.loads(line) for line in buffer.getvalue().splitlines()]
+        self.assertEqual(records[0]["budget"], "Test Budget")
+        self.assertEqual(records[0]["remaining"], 500.0)
+        self.assertEqual(records[2]["description"], "Test Expense 2")
+        self.assertEqual(len(records), 3)
+
+    def test_generate_category_report(self):
+        """
+        Test generating a category breakdown report.
+        """
+        self.budget.add_expense(Expense("Test Expense 3", 100.0, "Test Category 1"))
+        report = generate_category_report(self.budget)
+        lines = report.splitlines()
+        self.assertEqual(lines[0], "Category Breakdown for 'Test Budget'")
+        self.assertEqual(
+            lines[2],
+            "Test Category 1: $300.00 (2 expenses, avg $150.00, min $100.00, max $200.00)",
+        )
+        self.assertTrue(lines[3].startswith("Test Category 2: $300.00"))
+        self.assertIn("No expenses recorded.", generate_category_report(Budget("Empty", 1.0)))
+
+    def test_unsupported_format(self):
+        """
+        Test that an unknown format raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            iter_report(self.budget, fmt="xml")
+
+
+class TestReportCache(unittest.TestCase):
+    """
+    Test cases for the ReportCache class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.cache = ReportCache(maxsize=2)
+        self.budget = Budget("Cached Budget", 1000.0, storage="columnar")
+        self.budget.add_expense(Expense("Rent", 600.0, "Housing"))
+
+    def test_unchanged_budget_is_served_from_cache(self):
+        """
+        Test that an unchanged budget returns the cached text.
+        """
+        first = self.cache.get(self.budget)
+        self.assertIs(self.cache.get(self.budget), first)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(first, generate_report(self.budget, cache=None))
+
+    def test_appended_expenses_extend_the_report(self):
+        """
+        Test that new expenses and header changes extend the cached report.
+        """
+        cache = ReportCache()
+        for fmt in ("text", "csv", "jsonl"):
+            cache.get(self.budget, fmt)
+        self.budget.add_columns(["Coffee", "Bus"], [4.5, 2.0], ["Food", "Transport"])
+        self.budget.amount = 1200.0
+        for fmt in ("text", "csv", "jsonl"):
+            expected = "".join(iter_report(self.budget, fmt))
+            self.assertEqual(cache.get(self.budget, fmt), expected)
+        self.assertEqual(cache.extensions, 3)
+        self.assertEqual(cache.misses, 3)
+
+    def test_rewritten_rows_rebuild_the_report(self):
+        """
+        Test that a change to existing rows forces a full render.
+        """
+        self.cache.get(self.budget)
+        self.budget.rows_version += 1
+        self.budget.version += 1
+        self.cache.get(self.budget)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(self.cache.extensions, 0)
+
+    def test_concurrent_budget_is_merged_first(self):
+        """
+        Test that buffered rows of a concurrent budget invalidate its report.
+        """
+        budget = ConcurrentBudget("Shared", 100.0)
+        self.cache.get(budget)
+        budget.add_expense(Expense("Lunch", 10.0, "Food"))
+        report = self.cache.get(budget)
+        self.assertIn("Remaining Budget: $90.00", report)
+        self.assertEqual(report, generate_report(budget))
+
+    def test_generate_report_caches_only_on_request(self):
+        """
+        Test that generate_report keeps nothing unless given a cache.
+        """
+        report_cache.clear()
+        generate_report(self.budget)
+        self.assertEqual(len(report_cache), 0)
+        report = generate_report(self.budget, cache=report_cache)
+        self.assertIs(generate_report(self.budget, cache=report_cache), report)
+        self.assertEqual(len(report_cache), 1)
+        report_cache.clear()
+
+    def test_cache_is_bounded(self):
+        """
+        Test that least recently used reports are evicted.
+        """
+        budgets = [Budget(f"Budget {i}", 10.0) for i in range(3)]
+        for budget in budgets:
+            self.cache.get(budget)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.get(budgets[0])
+        self.assertEqual(self.cache.misses, 4)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+# tests/test_pybudget/test_rolling.py
+
+"""
+Unit tests for the rolling-window aggregates in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import random
+import unittest
+from datetime import date, timedelta
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.rolling import RollingSpend, RollingWindow
+
+
+class TestRollingWindow(unittest.TestCase):
+    """
+    Test cases for the RollingWindow class.
+    """
+
+    def test_eviction_and_max(self):
+        """
+        Test that days leaving the window take their sum, count and maximum.
+        """
+        window = RollingWindow(3)
+        window.add(10, 50)
+        window.add(11, 20)
+        window.add(11, 30)
+        self.assertEqual((window.total, window.count, window.max), (100, 3, 50))
+        window.add(13, 5)
+        self.assertEqual((window.total, window.count, window.max), (55, 3, 30))
+        self.assertFalse(window.add(10, 99))
+        window.add(12, 40)
+        self.assertEqual((window.total, window.count, window.max), (95, 4, 40))
+        window.advance(20)
+        self.assertEqual((window.total, window.count, window.max), (0, 0, None))
+        with self.assertRaises(ValueError):
+            RollingWindow(0)
+
+
+class TestRollingSpend(unittest.TestCase):
+    """
+    Test cases for the RollingSpend class.
+    """
+
+    def test_matches_rescan(self):
+        """
+        Test that the windows agree with rescanning, including late expenses.
+        """
+        rng = random.Random(11)
+        rolling = RollingSpend()
+        seen = []
+        start = date(2024, 1, 1)
+        for i in range(3000):
+            late = rng.randint(0, 10) if rng.random() < 0.1 else 0
+            day = start + timedelta(days=i // 20 - late)
+            amount = rng.randint(1, 5000)
+            category = f"Cat {rng.randint(0, 3)}"
+            rolling.add(day, amount, category)
+            seen.append((day, amount, category))
+            if i % 97:
+                continue
+            for days in rolling.windows:
+                for category in (None, "Cat 2"):
+                    amounts = [
+                        a
+                        for d, a, c in seen
+                        if (rolling.now - d).days < days and category in (None, c)
+                    ]
+                    self.assertEqual(rolling.sum(days, category), sum(amounts))
+                    self.assertEqual(rolling.count(days, category), len(amounts))
+                    self.assertEqual(rolling.max(days, category), max(amounts, default=None))
+        rolling.advance(rolling.now + timedelta(days=90))
+        self.assertEqual((rolling.sum(90), rolling.count(7, "Cat 1")), (0, 0))
+        with self.assertRaises(ValueError):
+            rolling.sum(14)
+
+    def test_attached_budget(self):
+        """
+        Test that an attached budget feeds the windows and is followed on changes.
+        """
+        budget = Budget("Test", 1000)
+        budget.add_expenses(
+            [
+                Expense("Old", 100, "Food", date(2024, 1, 1)),
+                Expense("Rent", 500, "Housing", date(2024, 3, 1)),
+                Expense("Undated", 7, "Food"),
+            ]
+        )
+        rolling = RollingSpend((7, 90))
+        rolling.attach(budget)
+        self.assertEqual(rolling.now, date(2024, 3, 1))
+        self.assertEqual((rolling.sum(7), rolling.sum(90)), (50000, 60000))
+        budget.add_expense(Expense("Lunch", 12.5, "Food", date(2024, 3, 4)))
+        self.assertEqual(rolling.sum(7, "Food"), 1250)
+        self.assertEqual(rolling.max(7), 50000)
+        budget.recategorize(1, "Rent")
+        self.assertEqual(rolling.sum(7, "Rent"), 50000)
+        budget.remove_expense(1)
+        self.assertEqual((rolling.sum(7), rolling.count(90), rolling.max(7)), (1250, 2, 1250))
+        rolling.detach()
+        budget.add_expense(Expense("Dinner", 30, "Food", date(2024, 3, 4)))
+        self.assertEqual(rolling.sum(7), 1250)
+
+
+if __name__ == "__main__":
+    unittest.main()
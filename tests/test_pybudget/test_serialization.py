@@ -0,0 +1,163 @@
+# tests/test_pybudget/test_serialization.py
+
+"""
+Unit tests for binary serialization and pickling in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import copy
+import pickle
+import tempfile
+import unittest
+from datetime import date
+
+from pybudget.budget import Budget
+from pybudget.concurrent import ConcurrentBudget
+from pybudget.expense import Expense
+from pybudget.mapped import open_ledger
+from pybudget.storage import ColumnarStorage, ListStorage
+
+
+def _rows(expenses):
+    return [(e.description, e.amount_minor, e.category, e.date) for e in expenses]
+
+
+class TestSerialization(unittest.TestCase):
+    """
+    Test cases for Expense and Budget serialization.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.budget = Budget("Travel", 2500, storage="columnar")
+        self.budget.add_expenses(
+            [
+                Expense("Café crème", 4.2, "Food", date(2024, 6, 1)),
+                Expense("Train", 89.9, "Transport", date(2024, 6, 2)),
+                Expense("Hotel", 320, "Lodging"),
+                Expense("Café crème", 4.2, "Food", date(2024, 6, 3)),
+            ]
+        )
+
+    def assertSameBudget(self, restored, original):
+        """
+        Assert that two budgets hold the same figures and expenses.
+        """
+        self.assertEqual(restored.name, original.name)
+        self.assertEqual(restored.amount_minor, original.amount_minor)
+        self.assertEqual(restored.scale, original.scale)
+        self.assertEqual(_rows(restored.expenses), _rows(original.expenses))
+        self.assertEqual(restored.get_category_totals(), original.get_category_totals())
+        self.assertTrue(restored.verify_totals())
+
+    def test_expense_round_trip(self):
+        """
+        Test that an expense survives to_bytes and from_bytes.
+        """
+        for expense in (
+            Expense("Café", 3.5, "Food", date(2024, 1, 2)),
+            Expense("Fee", 0.125, "Bank", scale=3),
+        ):
+            restored = Expense.from_bytes(expense.to_bytes())
+            self.assertEqual(str(restored), str(expense))
+            self.assertEqual(restored.amount_minor, expense.amount_minor)
+            self.assertEqual(restored.scale, expense.scale)
+        with self.assertRaises(ValueError):
+            Expense.from_bytes(Expense("Café", 3.5, "Food").to_bytes()[:-1])
+
+    def test_budget_round_trip(self):
+        """
+        Test that to_bytes output decodes with from_bytes and opens as a ledger.
+        """
+        data = self.budget.to_bytes()
+        restored = Budget.from_bytes(data)
+        self.assertIsInstance(restored.expenses.storage, ColumnarStorage)
+        self.assertSameBudget(restored, self.budget)
+        restored.add_expense(Expense("Taxi", 25, "Transport"))
+        self.assertEqual(len(self.budget.expenses), 4)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "budget.ledger")
+            with open(path, "wb") as fp:
+                fp.write(data)
+            mapped = open_ledger(path)
+            self.assertSameBudget(mapped, self.budget)
+            mapped.close()
+        with self.assertRaises(ValueError):
+            Budget.from_bytes(b"not a ledger")
+
+    def test_truncated_budget_bytes(self):
+        """
+        Test that a budget cut short at any point raises a ValueError.
+        """
+        data = self.budget.to_bytes()
+        for size in range(len(data)):
+            with self.assertRaises(ValueError):
+                Budget.from_bytes(data[:size])
+        with self.assertRaisesRegex(ValueError, "truncated"):
+            Budget.from_bytes(data[:-5])
+
+    def test_pickle_protocols(self):
+        """
+        Test pickling across protocols, with out-of-band column buffers.
+        """
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            self.assertSameBudget(pickle.loads(pickle.dumps(self.budget, protocol)), self.budget)
+        buffers = []
+        data = pickle.dumps(self.budget, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 4)
+        self.assertNotIn(bytes(buffers[0].raw()), data)
+        restored = pickle.loads(data, buffers=buffers)
+        self.assertSameBudget(restored, self.budget)
+        listed = Budget("Listed", 100)
+        listed.add_expense(Expense("Book", 12, "Misc", date(2024, 1, 1)))
+        self.assertSameBudget(pickle.loads(pickle.dumps(listed, 5)), listed)
+
+    def test_pickle_keeps_storage_kind(self):
+        """
+        Test that copies of list budgets keep list storage and their counters.
+        """
+        listed = Budget("Listed", 100)
+        listed.add_expense(Expense("Book", 12, "Misc", date(2024, 1, 1)))
+        listed.amount = 120
+        listed.add_listener(lambda budget, event, data: None)
+        for restored in (copy.deepcopy(listed), pickle.loads(pickle.dumps(listed))):
+            self.assertIsInstance(restored.expenses.storage, ListStorage)
+            self.assertIsInstance(restored.expenses[0], Expense)
+            self.assertEqual(restored.versions, listed.versions)
+            self.assertEqual(restored._listeners, [])
+            self.assertSameBudget(restored, listed)
+        fork = listed.fork()
+        self.assertIsInstance(pickle.loads(pickle.dumps(fork)).expenses.storage, ListStorage)
+        restored = copy.deepcopy(self.budget)
+        self.assertIsInstance(restored.expenses.storage, ColumnarStorage)
+
+    def test_concurrent_budget_includes_buffered_rows(self):
+        """
+        Test that encoding a concurrent budget merges its buffered rows first.
+        """
+        budget = ConcurrentBudget("Shared", 100, merge_every=100)
+        budget.add_expense(Expense("Lunch", 10, "Food"))
+        self.assertEqual(len(Budget.from_bytes(budget.to_bytes()).expenses), 1)
+        budget.add_expense(Expense("Dinner", 20, "Food"))
+        self.assertEqual(pickle.loads(pickle.dumps(budget)).get_total_expenses(), 30)
+
+    def test_copy_is_independent(self):
+        """
+        Test that a shallow copy does not share later changes.
+        """
+        copied = copy.copy(self.budget)
+        self.assertFalse(self.budget._shared)
+        self.assertIsInstance(copied.expenses.storage, ColumnarStorage)
+        copied.add_expense(Expense("Taxi", 25, "Transport"))
+        self.assertEqual(len(self.budget.expenses), 4)
+        self.assertEqual(len(copied.expenses), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+# tests/test_pybudget/test_sketches.py
+
+"""
+Unit tests for the streaming amount summaries in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import random
+import statistics
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.sketches import AmountSummary, TDigest, Welford, merge_summaries
+
+
+class TestSketches(unittest.TestCase):
+    """
+    Test cases for the Welford, TDigest and AmountSummary classes.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        rng = random.Random(7)
+        self.values = [int(rng.lognormvariate(8, 1.2)) for _ in range(50000)]
+        self.ordered = sorted(self.values)
+
+    def test_welford_matches_statistics(self):
+        """
+        Test that streamed, batched and merged moments agree with statistics.
+        """
+        streamed = Welford()
+        for value in self.values[:1000]:
+            streamed.add(value)
+        batched = Welford()
+        batched.extend(self.values[1000:])
+        streamed.merge(batched)
+        self.assertEqual(streamed.count, len(self.values))
+        self.assertAlmostEqual(streamed.mean, statistics.mean(self.values), places=6)
+        self.assertAlmostEqual(streamed.stdev / statistics.stdev(self.values), 1.0, places=9)
+        self.assertIsNone(Welford().variance)
+
+    def test_tdigest_quantiles(self):
+        """
+        Test that digest quantiles are within a small rank error and stay bounded.
+        """
+        digest = TDigest()
+        for value in self.values:
+            digest.add(value)
+        self.assertLess(digest.centroids, digest.compression)
+        self.assertEqual(digest.quantile(0), self.ordered[0])
+        self.assertEqual(digest.quantile(1), self.ordered[-1])
+        for q in (0.01, 0.5, 0.9, 0.99):
+            estimate = digest.quantile(q)
+            rank = sum(1 for value in self.ordered if value <= estimate) / len(self.ordered)
+            self.assertAlmostEqual(rank, q, delta=0.005)
+        small = TDigest()
+        small.extend(list(range(1, 101)))
+        self.assertEqual(small.quantile(0.5), 50.5)
+        self.assertIsNone(TDigest().quantile(0.5))
+        with self.assertRaises(ValueError):
+            small.quantile(1.5)
+
+    def test_tdigest_extend_is_bounded(self):
+        """
+        Test that a bulk extend keeps the buffer bounded and matches adding one by one.
+        """
+        digest = TDigest(compression=50)
+        digest.extend(self.values)
+        self.assertLess(len(digest._buffer), 5 * digest.compression)
+        self.assertEqual(digest.count, len(self.values))
+        self.assertEqual((digest.minimum, digest.maximum), (self.ordered[0], self.ordered[-1]))
+        for q in (0.01, 0.5, 0.99):
+            estimate = digest.quantile(q)
+            rank = sum(1 for value in self.ordered if value <= estimate) / len(self.ordered)
+            self.assertAlmostEqual(rank, q, delta=0.01)
+
+    def test_merged_summaries_match_single_summary(self):
+        """
+        Test that summaries of shards merge to the figures of the whole stream.
+        """
+        whole = AmountSummary()
+        whole.extend(self.values)
+        shards = [AmountSummary() for _ in range(5)]
+        for i, value in enumerate(self.values):
+            shards[i % 5].add(value)
+        merged = merge_summaries(shards)
+        self.assertEqual(merged.count, whole.count)
+        self.assertEqual(merged.get("max"), whole.get("max"))
+        self.assertAlmostEqual(merged.get("mean"), whole.get("mean"), places=6)
+        for statistic in ("median", "p90", "p99"):
+            self.assertAlmostEqual(merged.get(statistic) / whole.get(statistic), 1.0, delta=0.02)
+        with self.assertRaises(ValueError):
+            merged.get("p50")
+
+
+class TestBudgetSummaries(unittest.TestCase):
+    """
+    Test cases for the quantile summaries maintained by Budget.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.budget = Budget("Team", 10000.0, storage="columnar")
+        self.budget.add_columns(
+            [f"Item {i}" for i in range(1, 101)],
+            [float(i) for i in range(1, 101)],
+            ["Small" if i <= 50 else "Large" for i in range(1, 101)],
+        )
+
+    def test_quantiles(self):
+        """
+        Test budget and per-category quantiles, kept up to date as expenses are added.
+        """
+        self.assertEqual(self.budget.get_quantiles((0.5,)), {0.5: 50.5})
+        self.assertEqual(self.budget.get_quantiles((0.5,), category="Small"), {0.5: 25.5})
+        self.budget.add_columns(["Extra"], [101.0], ["Large"])
+        self.assertEqual(self.budget.get_quantiles((0.5, 1.0)), {0.5: 51.0, 1.0: 101.0})
+        self.assertEqual(self.budget.get_category_quantiles((1.0,))["Large"], {1.0: 101.0})
+        self.assertEqual(self.budget.get_quantiles((0.5,), category="Missing"), {0.5: None})
+        self.assertEqual(self.budget.get_amount_summary("Small").get("count"), 50)
+
+    def test_removal_rebuilds_summaries(self):
+        """
+        Test that summaries reflect removals and recategorizations.
+        """
+        self.budget.get_quantiles()
+        self.budget.remove_expense(99)
+        self.budget.recategorize(0, "Large")
+        self.assertEqual(self.budget.get_amount_summary().get("max"), 9900)
+        self.assertEqual(self.budget.get_amount_summary("Large").get("min"), 100)
+        fork = self.budget.fork()
+        fork.add_columns(["Big"], [500.0], ["Large"])
+        self.assertEqual(fork.get_quantiles((1.0,)), {1.0: 500.0})
+        self.assertEqual(self.budget.get_quantiles((1.0,)), {1.0: 99.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
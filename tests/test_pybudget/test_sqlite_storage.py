@@ -0,0 +1,179 @@
+# tests/test_pybudget/test_sqlite_storage.py
+
+"""
+Unit tests for the SQLite storage backend in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import sqlite3
+import tempfile
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.reports import generate_report
+from pybudget.sqlite_storage import SQLiteCategoryIndex, SQLiteStorage
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """
+    Test cases for the SQLiteStorage class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "budget.db")
+
+    def tearDown(self):
+        """
+        Clean up test fixtures.
+        """
+        self.tmp.cleanup()
+
+    def test_batched_writes(self):
+        """
+        Test that expenses are buffered until the batch size is reached.
+        """
+        storage = SQLiteStorage(self.path, batch_size=3)
+        storage.append(Expense("Lunch", 20.0, "Food"))
+        storage.append(Expense("Bus", 5.0, "Transport"))
+        count = sqlite3.connect(self.path).execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+        self.assertEqual(count, 0)
+        storage.append(Expense("Dinner", 30.0, "Food"))
+        count = sqlite3.connect(self.path).execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+        self.assertEqual(count, 3)
+        storage.close()
+
+    def test_wal_mode_and_indexes(self):
+        """
+        Test that the database uses WAL mode and indexes categories.
+        """
+        storage = SQLiteStorage(self.path)
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        indexes = [row[1] for row in conn.execute("PRAGMA index_list(expenses)")]
+        self.assertIn("idx_expenses_category", indexes)
+        storage.close()
+
+    def test_sequence_access(self):
+        """
+        Test indexing, slicing and iterating over stored expenses.
+        """
+        storage = SQLiteStorage(self.path, batch_size=2)
+        for i in range(5):
+            storage.append(Expense(f"Item {i}", float(i + 1), "Food" if i % 2 else "Other"))
+        self.assertEqual(len(storage), 5)
+        self.assertEqual(storage[0].description, "Item 0")
+        self.assertEqual(storage[-1].amount, 5.0)
+        self.assertEqual([e.amount for e in storage[1:3]], [2.0, 3.0])
+        food = storage.category_rows("Food")
+        self.assertEqual([e.description for e in food], ["Item 1", "Item 3"])
+        self.assertEqual(storage.category_totals(), {"Other": 900, "Food": 600})
+        with self.assertRaises(IndexError):
+            storage[5]
+        storage.close()
+
+    def test_budget_persists_across_reopen(self):
+        """
+        Test that a budget can be reopened with its expenses and totals.
+        """
+        budget = Budget.open_sqlite(self.path, "Persistent", 1000.0, batch_size=10)
+        budget.add_expense(Expense("Groceries", 150.0, "Food"))
+        budget.add_columns(["Rent", "Coffee"], [600.0, 4.0], ["Housing", "Food"])
+        report = generate_report(budget)
+        budget.close()
+
+        reopened = Budget.open_sqlite(self.path)
+        self.assertEqual(reopened.name, "Persistent")
+        self.assertEqual(reopened.amount, 1000.0)
+        self.assertEqual(len(reopened.expenses), 3)
+        self.assertEqual(reopened.get_remaining_amount(), 246.0)
+        self.assertEqual(reopened.get_category_total("Food"), 154.0)
+        self.assertTrue(reopened.verify_totals())
+        self.assertEqual(generate_report(reopened), report)
+        reopened.close()
+
+    def test_category_rows_from_database(self):
+        """
+        Test that category lookups query the database instead of a memory index.
+        """
+        budget = Budget.open_sqlite(self.path, "Persistent", 1000.0, batch_size=2)
+        budget.add_columns(
+            ["Rent", "Coffee", "Tea"], [600.0, 4.0, 3.0], ["Housing", "Food", "Food"]
+        )
+        budget.add_expense(Expense("Cake", 5.0, "Food"))
+        self.assertIsInstance(budget._category_index, SQLiteCategoryIndex)
+        self.assertEqual(list(budget.get_category_rows("Food")), [1, 2, 3])
+        budget.recategorize(2, "Drinks")
+        self.assertIsInstance(budget._category_index, SQLiteCategoryIndex)
+        self.assertEqual(list(budget.get_category_rows("Food")), [1, 3])
+        self.assertEqual([e.description for e in budget.get_category_expenses("Drinks")], ["Tea"])
+        budget.close()
+
+    def test_recategorize_persists(self):
+        """
+        Test that recategorizing an expense updates the stored category totals.
+        """
+        budget = Budget.open_sqlite(self.path, "Persistent", 1000.0)
+        budget.add_columns(["Rent", "Coffee"], [600.0, 4.0], ["Housing", "Food"])
+        budget.recategorize(1, "Treats")
+        budget.close()
+
+        reopened = Budget.open_sqlite(self.path)
+        self.assertEqual(reopened.expenses[1].category, "Treats")
+        self.assertEqual(reopened.get_category_totals(), {"Housing": 600.0, "Treats": 4.0})
+        self.assertTrue(reopened.verify_totals())
+        reopened.close()
+
+    def test_name_and_amount_changes_persist(self):
+        """
+        Test that renaming a budget or changing its amount survives reopening.
+        """
+        budget = Budget.open_sqlite(self.path, "Persistent", 100.0)
+        budget.amount = 500.0
+        budget.name = "Ops"
+        fork = budget.fork()
+        fork.name = "What-if"
+        fork.amount = 50.0
+        budget.close()
+
+        reopened = Budget.open_sqlite(self.path)
+        self.assertEqual(reopened.name, "Ops")
+        self.assertEqual(reopened.amount, 500.0)
+        reopened.close()
+
+    def test_changes_after_fork_persist(self):
+        """
+        Test that a forked budget keeps writing its changes to the database.
+        """
+        budget = Budget.open_sqlite(self.path, "Persistent", 1000.0)
+        budget.add_columns(["Rent"], [600.0], ["Housing"])
+        budget.flush()
+        fork = budget.fork()
+        budget.recategorize(0, "Home")
+        budget.add_columns(["Coffee"], [4.0], ["Food"])
+        budget.close()
+        self.assertEqual(fork.expenses[0].category, "Housing")
+
+        reopened = Budget.open_sqlite(self.path)
+        self.assertEqual(len(reopened.expenses), 2)
+        self.assertEqual(reopened.get_category_totals(), {"Home": 600.0, "Food": 4.0})
+        reopened.close()
+
+    def test_open_new_budget_requires_name_and_amount(self):
+        """
+        Test that creating a budget without a name and amount fails.
+        """
+        with self.assertRaises(ValueError):
+            Budget.open_sqlite(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+# tests/test_pybudget/test_storage.py
+
+"""
+Unit tests for the storage module in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import unittest
+
+from pybudget.budget import Budget
+from pybudget.expense import Expense
+from pybudget.reports import generate_report
+from pybudget.storage import (
+    ColumnarStorage,
+    ExpenseView,
+    ForkStorage,
+    ListStorage,
+    make_storage,
+)
+
+
+class TestColumnarStorage(unittest.TestCase):
+    """
+    Test cases for the ColumnarStorage class.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.storage = ColumnarStorage()
+        self.storage.append(Expense("Groceries", 150.0, "Food"))
+        self.storage.append(Expense("Rent", 1200.0, "Housing"))
+        self.storage.append(Expense("Groceries", 50.0, "Food"))
+
+    def test_columns_are_encoded(self):
+        """
+        Test that categories and descriptions are dictionary-encoded.
+        """
+        self.assertEqual(len(self.storage), 3)
+        self.assertEqual(list(self.storage.amounts), [15000, 120000, 5000])
+        self.assertEqual(self.storage.categories, ["Food", "Housing"])
+        self.assertEqual(list(self.storage.category_codes), [0, 1, 0])
+        self.assertEqual(self.storage.descriptions, ["Groceries", "Rent"])
+
+    def test_row_views(self):
+        """
+        Test that indexing returns views matching the added expenses.
+        """
+        view = self.storage[1]
+        self.assertIsInstance(view, ExpenseView)
+        self.assertEqual(view.description, "Rent")
+        self.assertEqual(view.amount, 1200.0)
+        self.assertEqual(view.category, "Housing")
+        self.assertEqual(view, Expense("Rent", 1200.0, "Housing"))
+        self.assertEqual(self.storage[-1].amount, 50.0)
+        self.assertEqual(
+            str(view),
+            "Expense(description='Rent', amount=1200.0, category='Housing')",
+        )
+        with self.assertRaises(IndexError):
+            self.storage[3]
+
+    def test_slice_and_iteration(self):
+        """
+        Test slicing and iterating over the storage.
+        """
+        self.assertEqual([e.amount for e in self.storage[1:]], [1200.0, 50.0])
+        self.assertEqual([e.description for e in self.storage], ["Groceries", "Rent", "Groceries"])
+
+    def test_aggregates(self):
+        """
+        Test the total and per-category aggregates in minor units.
+        """
+        self.assertEqual(self.storage.total(), 140000)
+        self.assertEqual(self.storage.category_totals(), {"Food": 20000, "Housing": 120000})
+
+
+class TestForkStorage(unittest.TestCase):
+    """
+    Test cases for the ForkStorage class.
+    """
+
+    def test_fork_shares_base_and_records_changes(self):
+        """
+        Test that a fork layers its own rows and tombstones over a shared base.
+        """
+        base = ColumnarStorage()
+        base.extend_columns(["a", "b", "c", "d"], [100, 200, 300, 400], ["x", "y", "x", "y"])
+        fork = ForkStorage(base)
+        fork.append(Expense("e", 5.0, "z"))
+        removed = fork.remove(1)
+        fork.remove(1)
+        base.append(Expense("late", 9.0, "x"))
+        self.assertEqual(removed.description, "b")
+        self.assertEqual([e.description for e in fork], ["a", "d", "e"])
+        self.assertEqual([e.description for e in fork[::-1]], ["e", "d", "a"])
+        self.assertEqual(list(fork.iter_columns()), [("x", 0, 100), ("y", 0, 400), ("z", 0, 500)])
+        self.assertEqual(fork.total(), 1000)
+        self.assertEqual(len(base), 5)
+        self.assertEqual(list(fork.removed), [1, 2])
+        with self.assertRaises(IndexError):
+            fork.remove(3)
+
+
+class TestBudgetStorage(unittest.TestCase):
+    """
+    Test cases for Budget with different storage backends.
+    """
+
+    def test_make_storage(self):
+        """
+        Test resolving storage specifications.
+        """
+        self.assertIsInstance(make_storage(), ListStorage)
+        self.assertIsInstance(make_storage("columnar"), ColumnarStorage)
+        storage = ColumnarStorage()
+        self.assertIs(make_storage(storage), storage)
+        with self.assertRaises(ValueError):
+            make_storage("unknown")
+
+    def test_columnar_budget_matches_list_budget(self):
+        """
+        Test that a columnar budget behaves like a list-backed budget.
+        """
+        list_budget = Budget("Monthly", 1000.0)
+        columnar_budget = Budget("Monthly", 1000.0, storage="columnar")
+        for budget in (list_budget, columnar_budget):
+            budget.add_expense(Expense("Groceries", 150.0, "Food"))
+            budget.add_expense(Expense("Rent", 600.0, "Housing"))
+
+        self.assertEqual(columnar_budget.get_remaining_amount(), 250.0)
+        self.assertEqual(str(columnar_budget), str(list_budget))
+        self.assertEqual(generate_report(columnar_budget), generate_report(list_budget))
+
+
+if __name__ == "__main__":
+    unittest.main()
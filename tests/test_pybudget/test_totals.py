@@ -0,0 +1,100 @@
+# tests/test_pybudget/test_totals.py
+
+"""
+Unit tests for the totals module in the pybudget module.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+import random
+import unittest
+
+from pybudget.totals import GroupStats, RunningTotal, group_stats
+
+
+class TestRunningTotal(unittest.TestCase):
+    """
+    Test cases for the RunningTotal class.
+    """
+
+    def test_integer_sum_is_exact(self):
+        """
+        Test that totals of minor units are exact and order independent.
+        """
+        amounts = [random.randint(1, 100000) for _ in range(1000)] + [10**17, 1, -(10**17)]
+        total = RunningTotal()
+        for amount in amounts:
+            total.add(amount)
+        self.assertEqual(total.value, sum(amounts))
+        self.assertEqual(total.count, 1003)
+        reverse = RunningTotal()
+        reverse.extend(amounts[::-1])
+        self.assertEqual(reverse.value, total.value)
+
+    def test_merge(self):
+        """
+        Test adding a pre-aggregated sum.
+        """
+        total = RunningTotal()
+        total.add(5)
+        total.merge(100, 4)
+        self.assertEqual(total.value, 105)
+        self.assertEqual(total.count, 5)
+
+    def test_empty_total(self):
+        """
+        Test the value of an empty total.
+        """
+        self.assertEqual(RunningTotal().value, 0)
+
+
+class TestGroupStats(unittest.TestCase):
+    """
+    Test cases for the GroupStats class.
+    """
+
+    def test_incremental_aggregates(self):
+        """
+        Test aggregates maintained one amount at a time and in batches.
+        """
+        stats = GroupStats()
+        stats.add(1000)
+        stats.extend([400, 3000])
+        self.assertEqual(stats.get("sum"), 4400)
+        self.assertEqual(stats.get("count"), 3)
+        self.assertAlmostEqual(stats.get("mean"), 4400 / 3)
+        self.assertEqual(stats.get("min"), 400)
+        self.assertEqual(stats.get("max"), 3000)
+        self.assertIsNone(GroupStats().get("mean"))
+        with self.assertRaises(ValueError):
+            stats.get("median")
+
+    def test_merged_stats_have_unknown_bounds(self):
+        """
+        Test that seeding from a pre-aggregated sum leaves the extremes unknown.
+        """
+        stats = GroupStats()
+        stats.merge(10000, 4)
+        self.assertFalse(stats.bounded)
+        stats.add(100)
+        self.assertIsNone(stats.get("min"))
+        stats.set_bounds(100, 6000)
+        self.assertTrue(stats.bounded)
+        self.assertEqual(stats.get("count"), 5)
+
+    def test_group_stats(self):
+        """
+        Test grouping (key, amount) pairs.
+        """
+        groups = group_stats([("a", 100), ("b", 200), ("a", 300)])
+        self.assertEqual(groups["a"].get("sum"), 400)
+        self.assertEqual(groups["b"].get("count"), 1)
+        group_stats([("b", 500)], groups=groups)
+        self.assertEqual(groups["b"].get("max"), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,7 +11,12 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 import unittest
 
-from pybudget.utils import format_currency, validate_amount
+from pybudget.utils import (
+    first_invalid_amount,
+    format_currency,
+    validate_amount,
+    validate_amounts,
+)
 
 
 class TestUtils(unittest.TestCase):
@@ -38,6 +43,16 @@ class TestUtils(unittest.TestCase):
         """
         self.assertFalse(validate_amount(-100.0))
 
+    def test_validate_amounts(self):
+        """
+        Test validating a batch of amounts.
+        """
+        self.assertTrue(validate_amounts([1.0, 0.5, 100.0]))
+        self.assertTrue(validate_amounts([]))
+        self.assertFalse(validate_amounts([1.0, 0.0, 2.0]))
+        self.assertEqual(first_invalid_amount([1.0, 2.0, -3.0, 0.0]), 2)
+        self.assertEqual(first_invalid_amount([1.0]), -1)
+
     def test_format_currency(self):
         """
         Test formatting a number as a currency string.